@@ -5,12 +5,13 @@ Flask Application Factory
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
-from flask_cors import CORS
 from flask_migrate import Migrate
 
+from app.utils.db_routing import RoutingSession
+
 
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 jwt = JWTManager()
 migrate = Migrate()
 
@@ -29,11 +30,31 @@ def create_app(config_class):
 
 
     # Initialize extensions
+    from app.utils.database import build_engine_options
+    from app.utils.db_routing import init_replica_routing
+    from app.utils.jwt_utils import init_user_loader
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = build_engine_options(app.config)
+    init_replica_routing(app)
     db.init_app(app)
     jwt.init_app(app)
+    init_user_loader(jwt)
     migrate.init_app(app, db)
     app.logger.info("✅ Database extensions initialized")
 
+    # Fast JSON encoding and response compression
+    from app.utils.json_provider import init_json_provider
+    from app.utils.compression import init_compression
+    init_json_provider(app)
+    init_compression(app)
+
+    # Per-request SQL profiling (Server-Timing header, N+1 warnings)
+    from app.utils.query_profiler import init_query_profiler
+    init_query_profiler(app)
+
+    # Prometheus metrics (/metrics)
+    from app.utils.metrics import init_metrics
+    init_metrics(app, db)
+
     # ✅ ADD CACHE INITIALIZATION
     # Initialize caching
     from app.utils.cache_utils import init_cache
@@ -50,32 +71,30 @@ def create_app(config_class):
     #         "allow_headers": ["Content-Type", "Authorization"]
     #     }
     # })
+    from flask_cors import CORS
     CORS(
     app,
     resources={r"/api/*": {"origins": "http://localhost:4200"}},  # Angular dev server
     supports_credentials=True
     )
     
-    # Initialize Socket.IO if enabled
-    # NEW - Import from utils instead of services
-    from app.utils.socket_utils import init_socketio
-    socketio = init_socketio(app)
-    app.socketio = socketio
-    app.logger.info("✅ Socket.IO initialized")
+    # Initialize Socket.IO if enabled (CLI and worker-only processes can skip it)
+    if app.config.get('SOCKETIO_ENABLED', True):
+        from app.utils.socket_utils import init_socketio
+        socketio = init_socketio(app)
+        app.socketio = socketio
+        app.logger.info("✅ Socket.IO initialized")
     # Import and register models
     from app import models
+    from app.utils.change_feed import init_change_feed
+    init_change_feed(app)
     
     # Register blueprints
     from app.routes import register_blueprints
     register_blueprints(app)
     app.logger.info("✅ Blueprints registered")
-    # print("\n🔍 Registered Routes:")
-    for rule in app.url_map.iter_rules():
-        if rule.endpoint != 'static':
-            methods = ', '.join(sorted(rule.methods - {'HEAD', 'OPTIONS'}))
-            app.logger.debug(f"  {methods:15} {rule.rule}")
-            # print(f"  {methods:15} {rule.rule}")
-    print()
+    if app.config.get('LOG_ROUTES'):
+        log_routes(app)
     
     
     # Register basic error handlers inline (temporary)
@@ -83,6 +102,14 @@ def create_app(config_class):
     
     return app
 
+def log_routes(app):
+    """Log every registered route (opt-in via LOG_ROUTES; slow with many rules)."""
+    app.logger.info("🔍 Registered Routes:")
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint != 'static':
+            methods = ', '.join(sorted(rule.methods - {'HEAD', 'OPTIONS'}))
+            app.logger.info(f"  {methods:15} {rule.rule}")
+
 def register_basic_error_handlers(app):
     """Register basic error handlers inline"""
     
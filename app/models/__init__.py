@@ -14,11 +14,13 @@ from .enums import (
     ProjectStatus, SprintStatus
 )
 from .task_attachment import TaskAttachment
+from .change_log import ChangeLog
 from .task import Task
 
 
 __all__ = [
     'User', 'Task', 'Project', 'Sprint',
     'TaskComment', 'Notification', 'UserRole', 'TaskStatus',
-    'TaskPriority', 'TaskType', 'ProjectStatus', 'SprintStatus', 'TaskAttachment', 'Task'
+    'TaskPriority', 'TaskType', 'ProjectStatus', 'SprintStatus', 'TaskAttachment', 'Task',
+    'ChangeLog'
 ]
\ No newline at end of file
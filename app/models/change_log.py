@@ -0,0 +1,33 @@
+# app/models/change_log.py
+from app import db
+from datetime import datetime
+
+
+class ChangeLog(db.Model):
+    """One row per create/update/delete of a synced entity (see app.utils.change_feed).
+
+    The autoincrement ``id`` is the sync token: clients ask for everything
+    after the last id they saw. Deletes are kept as tombstones until pruned.
+    """
+    __tablename__ = 'change_log'
+    __table_args__ = (
+        db.Index('ix_change_log_project_id_id', 'project_id', 'id'),
+        db.Index('ix_change_log_user_id_id', 'user_id', 'id'),
+    )
+
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+
+    id = db.Column(db.Integer, primary_key=True)
+    entity_type = db.Column(db.String(20), nullable=False)  # task, comment, sprint, notification
+    entity_id = db.Column(db.Integer, nullable=False)
+    action = db.Column(db.String(10), nullable=False)
+
+    # Audience: members of the project, or a single user for project-less rows
+    project_id = db.Column(db.Integer, nullable=True)
+    user_id = db.Column(db.Integer, nullable=True)
+
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<ChangeLog {self.id} {self.action} {self.entity_type}:{self.entity_id}>'
@@ -1,5 +1,6 @@
 # app/models/enums.py
 from enum import Enum
+from types import MappingProxyType
 
 class UserRole(Enum):
     ADMIN = "ADMIN"
@@ -206,4 +207,26 @@ def get_all_enums():
             ESTIMATION_UNIT_CONFIG, 
             {'icon': 'fa-ruler', 'color': '#6c757d', 'conversion_factor': 1.0, 'default_value': 1}
         )
-    }
\ No newline at end of file
+    }
+
+
+def freeze(value):
+    """Recursively convert dicts and lists to read-only mappings and tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+# Computed once at import: enum metadata only changes on deploy, so callers
+# share these frozen structures instead of rebuilding them per request.
+ENUM_METADATA = freeze(get_all_enums())
+ENUM_VALUES = freeze({
+    'user_roles': enum_to_dict(UserRole),
+    'task_statuses': enum_to_dict(TaskStatus),
+    'task_priorities': enum_to_dict(TaskPriority),
+    'task_types': enum_to_dict(TaskType),
+    'project_statuses': enum_to_dict(ProjectStatus),
+    'sprint_statuses': enum_to_dict(SprintStatus),
+})
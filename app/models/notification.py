@@ -32,6 +32,14 @@ class Notification(db.Model):
     project = db.relationship('Project')
     sprint = db.relationship('Sprint')
 
+    # Sparse fieldsets (see app.utils.fieldsets)
+    SPARSE_FIELDS = (
+        'user_id', 'task_id', 'type', 'title', 'message', 'related_user_id', 'project_id',
+        'sprint_id', 'read', 'read_at', 'created_at'
+    )
+    SPARSE_RELATIONS = {'task': 'task', 'related_user': 'related_user', 'project': 'project', 'sprint': 'sprint'}
+    SPARSE_SUMMARY = ('type', 'title', 'read')
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -4,6 +4,7 @@ from datetime import datetime
 
 from app.models.project_member import ProjectMember
 from .enums import ProjectStatus
+from app.utils.fieldsets import json_list
 
 class Project(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -20,6 +21,7 @@ class Project(db.Model):
     start_date = db.Column(db.DateTime)
     end_date = db.Column(db.DateTime)
     estimated_hours = db.Column(db.Float)
+    actual_hours = db.Column(db.Float, default=0, server_default='0')  # Maintained by Task.add_logged_hours
     
     # Ownership
     owner_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
@@ -38,6 +40,21 @@ class Project(db.Model):
     sprints = db.relationship('Sprint', back_populates='project', cascade='all, delete-orphan')
     team_members = db.relationship('ProjectMember', back_populates='project', cascade='all, delete-orphan')
 
+    # Sparse fieldsets (see app.utils.fieldsets)
+    SPARSE_FIELDS = (
+        'name', 'description', 'status', 'repository_url', 'documentation_url', 'technology_stack',
+        'start_date', 'end_date', 'estimated_hours', 'actual_hours', 'owner_id', 'client_name',
+        'client_email', 'created_at', 'updated_at', 'tasks_count', 'sprints_count', 'team_members_count'
+    )
+    SPARSE_COMPUTED = {
+        'technology_stack': (('technology_stack',), lambda project: json_list(project.technology_stack)),
+        'tasks_count': (('tasks',), lambda project: len(project.tasks)),
+        'sprints_count': (('sprints',), lambda project: len(project.sprints)),
+        'team_members_count': (('team_members',), lambda project: len(project.team_members)),
+    }
+    SPARSE_RELATIONS = {'owner': 'owner', 'sprints': 'sprints'}
+    SPARSE_SUMMARY = ('name', 'status')
+
     def to_dict(self, include_tasks=False, include_sprints=False):
         import json
         
@@ -60,6 +77,7 @@ class Project(db.Model):
             'start_date': self.start_date.isoformat() if self.start_date else None,
             'end_date': self.end_date.isoformat() if self.end_date else None,
             'estimated_hours': self.estimated_hours,
+            'actual_hours': self.actual_hours,
             'client_name': self.client_name,
             'client_email': self.client_email,
             'created_at': self.created_at.isoformat(),
@@ -106,6 +124,9 @@ class Project(db.Model):
             db.session.add(member)
             db.session.commit()
 
+            from app.utils.socket_rooms import membership_changed
+            membership_changed(user_id, self.id, joined=True)
+
     def remove_team_member(self, user_id):
         """Remove a team member from the project."""
         member = ProjectMember.query.filter_by(
@@ -117,6 +138,10 @@ class Project(db.Model):
             db.session.delete(member)
             db.session.commit()
 
+            if user_id != self.owner_id:
+                from app.utils.socket_rooms import membership_changed
+                membership_changed(user_id, self.id, joined=False)
+
     def get_active_sprint(self):
         """Get the currently active sprint for this project."""
         from .sprint import Sprint
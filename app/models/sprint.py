@@ -20,15 +20,31 @@ class Sprint(db.Model):
     goal = db.Column(db.Text)
     capacity_hours = db.Column(db.Float)
     velocity_points = db.Column(db.Integer)
+    actual_hours = db.Column(db.Float, default=0, server_default='0')  # Maintained by Task.add_logged_hours
     
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # Bumped on every ORM update
 
     # Relationships
     project = db.relationship('Project', back_populates='sprints')
     tasks = db.relationship('Task', back_populates='sprint')
 
+    # Optimistic concurrency (see Task)
+    __mapper_args__ = {'version_id_col': version}
+
+    # Sparse fieldsets (see app.utils.fieldsets)
+    SPARSE_FIELDS = (
+        'name', 'description', 'status', 'project_id', 'start_date', 'end_date', 'goal',
+        'capacity_hours', 'velocity_points', 'actual_hours', 'created_at', 'updated_at', 'version', 'tasks_count'
+    )
+    SPARSE_COMPUTED = {
+        'tasks_count': (('tasks',), lambda sprint: len(sprint.tasks)),
+    }
+    SPARSE_RELATIONS = {'project': 'project', 'tasks': 'tasks'}
+    SPARSE_SUMMARY = ('name', 'status')
+
     def to_dict(self, include_tasks=False):
         result = {
             'id': self.id,
@@ -41,8 +57,10 @@ class Sprint(db.Model):
             'goal': self.goal,
             'capacity_hours': self.capacity_hours,
             'velocity_points': self.velocity_points,
+            'actual_hours': self.actual_hours,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
+            'version': self.version,
             'project': self.project.to_dict() if self.project else None,
             'tasks_count': len(self.tasks)
         }
@@ -1,14 +1,29 @@
 # app/models/task.py
 from app import db
 from datetime import datetime
+from sqlalchemy import bindparam, func, case, literal
+from sqlalchemy.orm import selectinload, validates
 from .enums import TaskStatus, TaskPriority, TaskType, EstimationUnit
 from app.utils.logger import get_logger
+from app.utils.fieldsets import json_list
 
 logger = get_logger('task')
 
+# Safety bound for walking parent chains when maintaining rollups
+MAX_HIERARCHY_DEPTH = 100
+
+# Relationships to eager-load for each serialization of hierarchy rows
+TREE_NODE_RELATIONSHIPS = ('assignee',)  # to_tree_node
+TASK_DICT_RELATIONSHIPS = ('assignee', 'creator', 'project', 'sprint', 'comments', 'attachments', 'time_logs')  # to_dict
+
 
 class Task(db.Model):
     __tablename__ = 'task'
+    __table_args__ = (
+        db.Index('ix_task_project_status', 'project_id', 'status'),  # Board columns and project task counts
+        db.Index('ix_task_due_date', 'due_date'),  # Overdue listings and the overdue scanner
+        db.Index('ix_task_overdue_since', 'overdue_since'),  # Escalation and clearing passes
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -34,6 +49,7 @@ class Task(db.Model):
     # Estimation and tracking
     estimated_hours = db.Column(db.Float)
     actual_hours = db.Column(db.Float, default=0)
+    subtree_actual_hours = db.Column(db.Float, default=0, server_default='0')  # This task plus all descendants
     story_points = db.Column(db.Integer)
     estimation_unit = db.Column(db.Enum(EstimationUnit), default=EstimationUnit.HOURS)
     
@@ -47,6 +63,11 @@ class Task(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')  # Bumped on every ORM update
+
+    # Overdue scanner's notification dedup (app.services.overdue_service); cleared when the due date changes
+    overdue_since = db.Column(db.DateTime, nullable=True)  # When the overdue notification went out
+    escalated_at = db.Column(db.DateTime, nullable=True)  # When the escalation notification went out
 
     # Relationships
     assignee = db.relationship('User', foreign_keys=[assigned_to_id], back_populates='assigned_tasks')
@@ -63,6 +84,29 @@ class Task(db.Model):
     attachments = db.relationship('TaskAttachment', back_populates='task', cascade='all, delete-orphan')
     time_logs = db.relationship('TimeLog', back_populates='task', cascade='all, delete-orphan')
 
+    # Optimistic concurrency: UPDATE ... WHERE version = <loaded version>, StaleDataError on a lost race
+    __mapper_args__ = {'version_id_col': version}
+
+    # Sparse fieldsets (see app.utils.fieldsets)
+    SPARSE_FIELDS = (
+        'title', 'description', 'status', 'priority', 'task_type', 'assigned_to_id', 'created_by_id',
+        'project_id', 'sprint_id', 'due_date', 'start_date', 'completion_date', 'estimated_hours',
+        'actual_hours', 'subtree_actual_hours', 'story_points', 'estimation_unit', 'labels',
+        'acceptance_criteria', 'parent_task_id', 'created_at', 'updated_at', 'version', 'overdue_since', 'escalated_at',
+        'comments_count', 'attachments_count', 'time_logs_count'
+    )
+    SPARSE_COMPUTED = {
+        'labels': (('labels',), lambda task: json_list(task.labels)),
+        'comments_count': (('comments',), lambda task: len(task.comments)),
+        'attachments_count': (('attachments',), lambda task: len(task.attachments)),
+        'time_logs_count': (('time_logs',), lambda task: len(task.time_logs)),
+    }
+    SPARSE_RELATIONS = {
+        'assigned_to': 'assignee', 'created_by': 'creator', 'project': 'project',
+        'sprint': 'sprint', 'parent_task': 'parent_task', 'comments': 'comments'
+    }
+    SPARSE_SUMMARY = ('title', 'status', 'priority')
+
     def to_dict(self, include_subtasks=False):
         import json
         
@@ -90,6 +134,7 @@ class Task(db.Model):
             'completion_date': self.completion_date.isoformat() if self.completion_date else None,
             'estimated_hours': self.estimated_hours,
             'actual_hours': self.actual_hours,
+            'subtree_actual_hours': self.subtree_actual_hours,
             'story_points': self.story_points,
             'estimation_unit': self.estimation_unit.value if self.estimation_unit else None,
             'labels': labels_list,
@@ -97,22 +142,57 @@ class Task(db.Model):
             'parent_task_id': self.parent_task_id,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
+            'version': self.version,
+            'overdue_since': self.overdue_since.isoformat() if self.overdue_since else None,
+            'escalated_at': self.escalated_at.isoformat() if self.escalated_at else None,
             'comments_count': len(self.comments),
             'attachments_count': len(self.attachments),
             'time_logs_count': len(self.time_logs)
         }
         
         if include_subtasks:
-            result['subtasks'] = [subtask.to_dict() for subtask in self.subtasks]
+            # Direct children come from one batched query with their relationships
+            # eager-loaded, instead of a lazy load per subtask.
+            subtree = Task.get_subtree(self.id, max_depth=1, load=TASK_DICT_RELATIONSHIPS)
+            result['subtasks'] = [subtask.to_dict() for subtask, depth in subtree if depth == 1]
             
         return result
 
-    def get_progress_percentage(self):
-        """Calculate task progress based on subtasks or time logged."""
+    def to_tree_node(self):
+        """Compact representation used when serializing task hierarchies."""
+        return {
+            'id': self.id,
+            'title': self.title,
+            'status': self.status.value,
+            'priority': self.priority.value,
+            'task_type': self.task_type.value,
+            'parent_task_id': self.parent_task_id,
+            'assigned_to': {'id': self.assignee.id, 'name': self.assignee.name} if self.assignee else None,
+            'due_date': self.due_date.isoformat() if self.due_date else None,
+            'estimated_hours': self.estimated_hours,
+            'actual_hours': self.actual_hours,
+            'story_points': self.story_points,
+            'version': self.version
+        }
+
+    def get_progress_percentage(self, subtasks=None):
+        """Calculate task progress based on subtasks or time logged.
+
+        Pass already-loaded ``subtasks`` to avoid a query; otherwise the subtask
+        counts are aggregated in SQL rather than loading every child row.
+        """
         try:
-            if self.subtasks:
-                completed_subtasks = sum(1 for subtask in self.subtasks if subtask.status == TaskStatus.DONE)
-                progress = (completed_subtasks / len(self.subtasks)) * 100
+            if subtasks is not None:
+                total_subtasks = len(subtasks)
+                completed_subtasks = sum(1 for subtask in subtasks if subtask.status == TaskStatus.DONE)
+            else:
+                total_subtasks, completed_subtasks = db.session.query(
+                    func.count(Task.id),
+                    func.coalesce(func.sum(case((Task.status == TaskStatus.DONE, 1), else_=0)), 0)
+                ).filter(Task.parent_task_id == self.id).one()
+
+            if total_subtasks:
+                progress = (completed_subtasks / total_subtasks) * 100
             elif self.estimated_hours and self.actual_hours:
                 progress = min((self.actual_hours / self.estimated_hours) * 100, 100)
             else:
@@ -122,6 +202,240 @@ class Task(db.Model):
             logger.error(f"Error calculating progress for task {self.id}: {str(e)}")
             return 0
 
+    @classmethod
+    def get_subtree(cls, root_id, max_depth=None, load=TREE_NODE_RELATIONSHIPS):
+        """Fetch a task and all of its descendants with one recursive CTE.
+
+        Returns a list of ``(task, depth)`` tuples ordered by depth, where the
+        root has depth 0. ``max_depth`` limits how many levels are followed.
+        ``load`` names the relationships to eager-load: only what the caller
+        serializes (``TASK_DICT_RELATIONSHIPS`` for ``to_dict``).
+        """
+        tree = db.session.query(
+            cls.id.label('id'),
+            literal(0).label('depth')
+        ).filter(cls.id == root_id).cte(name='task_tree', recursive=True)
+
+        children = db.session.query(cls.id, tree.c.depth + 1).join(tree, cls.parent_task_id == tree.c.id)
+        if max_depth is not None:
+            children = children.filter(tree.c.depth < max_depth)
+        tree = tree.union_all(children)
+
+        return db.session.query(cls, tree.c.depth)\
+            .join(tree, cls.id == tree.c.id)\
+            .options(*[selectinload(getattr(cls, name)) for name in load])\
+            .order_by(tree.c.depth, cls.id)\
+            .all()
+
+    @classmethod
+    def _ancestor_chain(cls, task_id, max_depth=None):
+        """Recursive CTE of ``(id, parent_task_id, depth)`` from a task up to its root."""
+        chain = db.session.query(
+            cls.id.label('id'),
+            cls.parent_task_id.label('parent_task_id'),
+            literal(0).label('depth')
+        ).filter(cls.id == task_id).cte(name='task_ancestors', recursive=True)
+
+        parents = db.session.query(cls.id, cls.parent_task_id, chain.c.depth + 1).join(chain, cls.id == chain.c.parent_task_id)
+        if max_depth is not None:
+            parents = parents.filter(chain.c.depth < max_depth)
+        return chain.union_all(parents)
+
+    @classmethod
+    def get_ancestors(cls, task_id, max_depth=None, load=TREE_NODE_RELATIONSHIPS):
+        """Fetch the parent chain of a task with one recursive CTE, root first."""
+        chain = cls._ancestor_chain(task_id, max_depth)
+
+        return db.session.query(cls)\
+            .join(chain, cls.id == chain.c.id)\
+            .filter(chain.c.depth > 0)\
+            .options(*[selectinload(getattr(cls, name)) for name in load])\
+            .order_by(chain.c.depth.desc())\
+            .all()
+
+    @classmethod
+    def add_logged_hours(cls, task_id, hours):
+        """Atomically add logged hours to a task and every rollup containing it.
+
+        Uses ``SET col = col + :hours`` updates so parallel time logging never
+        loses increments. The task's own ``actual_hours``, ``subtree_actual_hours``
+        on the task and all its ancestors, and the sprint and project totals are
+        updated in the current transaction; the caller commits.
+        """
+        from .sprint import Sprint
+        from .project import Project
+
+        chain = cls._ancestor_chain(task_id, MAX_HIERARCHY_DEPTH)
+
+        db.session.query(cls).filter(cls.id == task_id).update(
+            {cls.actual_hours: func.coalesce(cls.actual_hours, 0) + hours},
+            synchronize_session=False
+        )
+        db.session.query(cls).filter(cls.id.in_(db.select(chain.c.id))).update(
+            {cls.subtree_actual_hours: func.coalesce(cls.subtree_actual_hours, 0) + hours},
+            synchronize_session=False
+        )
+
+        sprint_id, project_id = db.session.query(cls.sprint_id, cls.project_id).filter(cls.id == task_id).one()
+        if sprint_id:
+            db.session.query(Sprint).filter(Sprint.id == sprint_id).update(
+                {Sprint.actual_hours: func.coalesce(Sprint.actual_hours, 0) + hours},
+                synchronize_session=False
+            )
+        if project_id:
+            db.session.query(Project).filter(Project.id == project_id).update(
+                {Project.actual_hours: func.coalesce(Project.actual_hours, 0) + hours},
+                synchronize_session=False
+            )
+
+    @staticmethod
+    def move_hours_rollup(hours, old_sprint_id=None, new_sprint_id=None, old_project_id=None, new_project_id=None):
+        """Move a task's own hours between sprint/project totals when it changes container."""
+        from .sprint import Sprint
+        from .project import Project
+
+        if not hours:
+            return
+
+        for model, old_id, new_id in ((Sprint, old_sprint_id, new_sprint_id), (Project, old_project_id, new_project_id)):
+            if old_id == new_id:
+                continue
+            if old_id:
+                db.session.query(model).filter(model.id == old_id).update(
+                    {model.actual_hours: func.coalesce(model.actual_hours, 0) - hours},
+                    synchronize_session=False
+                )
+            if new_id:
+                db.session.query(model).filter(model.id == new_id).update(
+                    {model.actual_hours: func.coalesce(model.actual_hours, 0) + hours},
+                    synchronize_session=False
+                )
+
+    def detach_hours_rollup(self):
+        """Remove this task's hours from ancestor, sprint and project totals before deletion.
+
+        Subtasks survive a delete (their parent link is set to NULL), so ancestors
+        lose the whole subtree total while sprint and project totals only lose the
+        task's own hours.
+        """
+        if self.parent_task_id and self.subtree_actual_hours:
+            chain = Task._ancestor_chain(self.parent_task_id, MAX_HIERARCHY_DEPTH)
+            db.session.query(Task).filter(Task.id.in_(db.select(chain.c.id))).update(
+                {Task.subtree_actual_hours: func.coalesce(Task.subtree_actual_hours, 0) - self.subtree_actual_hours},
+                synchronize_session=False
+            )
+        Task.move_hours_rollup(self.actual_hours, old_sprint_id=self.sprint_id, old_project_id=self.project_id)
+
+    @classmethod
+    def recompute_hour_rollups(cls):
+        """Rebuild subtree, sprint and project hour totals from task ``actual_hours``.
+
+        Maintenance path for backfills and repairs; normal writes keep the totals
+        current incrementally.
+        """
+        from .sprint import Sprint
+        from .project import Project
+
+        rows = db.session.query(cls.id, cls.parent_task_id, cls.actual_hours).all()
+        parents = {task_id: parent_id for task_id, parent_id, _ in rows}
+        totals = {task_id: 0.0 for task_id, _, _ in rows}
+
+        for task_id, parent_id, hours in rows:
+            hours = hours or 0
+            current, seen = task_id, 0
+            while current is not None and current in totals and seen <= MAX_HIERARCHY_DEPTH:
+                totals[current] += hours
+                current = parents.get(current)
+                seen += 1
+
+        if totals:
+            # Core executemany: the ORM bulk update by primary key would also
+            # require (and bump) each row's version, and a repair is not an edit
+            table = cls.__table__
+            db.session.execute(
+                table.update().where(table.c.id == bindparam('task_id')).values(subtree_actual_hours=bindparam('total')),
+                [{'task_id': task_id, 'total': total} for task_id, total in totals.items()]
+            )
+
+        for model, fk in ((Sprint, cls.sprint_id), (Project, cls.project_id)):
+            total = db.select(func.coalesce(func.sum(cls.actual_hours), 0))\
+                .where(fk == model.id)\
+                .scalar_subquery()
+            db.session.query(model).update({model.actual_hours: total}, synchronize_session=False)
+
+        db.session.commit()
+        logger.info(f"Recomputed hour rollups for {len(totals)} tasks")
+        return len(totals)
+
+    @staticmethod
+    def build_tree(rows, root_id):
+        """Assemble ``get_subtree`` rows into a nested dict with rolled-up totals.
+
+        Every node gets a ``rollup`` covering itself and the descendants that were
+        loaded: task counts, estimated and actual hours, and progress measured as
+        the share of descendant tasks that are done.
+        """
+        nodes = {}
+        for task, depth in rows:
+            node = task.to_tree_node()
+            node['depth'] = depth
+            node['subtasks'] = []
+            node['rollup'] = {
+                'subtask_count': 0,
+                'completed_subtask_count': 0,
+                'estimated_hours': task.estimated_hours or 0,
+                'actual_hours': task.actual_hours or 0
+            }
+            nodes[task.id] = node
+
+        # Rows are ordered by depth, so walking them backwards folds every child
+        # into its parent before the parent itself is folded upwards.
+        for task, depth in reversed(rows):
+            if task.id == root_id or task.parent_task_id not in nodes:
+                continue
+            node = nodes[task.id]
+            parent_rollup = nodes[task.parent_task_id]['rollup']
+            parent_rollup['subtask_count'] += node['rollup']['subtask_count'] + 1
+            parent_rollup['completed_subtask_count'] += node['rollup']['completed_subtask_count'] + (1 if task.status == TaskStatus.DONE else 0)
+            parent_rollup['estimated_hours'] += node['rollup']['estimated_hours']
+            parent_rollup['actual_hours'] += node['rollup']['actual_hours']
+
+        for task, depth in rows:
+            node = nodes[task.id]
+            rollup = node['rollup']
+            if rollup['subtask_count']:
+                progress = (rollup['completed_subtask_count'] / rollup['subtask_count']) * 100
+            elif task.estimated_hours and task.actual_hours:
+                progress = min((task.actual_hours / task.estimated_hours) * 100, 100)
+            else:
+                progress = 0 if task.status != TaskStatus.DONE else 100
+            rollup['progress_percentage'] = round(progress, 2)
+            if task.id != root_id and task.parent_task_id in nodes:
+                nodes[task.parent_task_id]['subtasks'].append(node)
+
+        return nodes.get(root_id)
+
+    @staticmethod
+    def overdue_criteria():
+        """Filter for overdue tasks (open, due date passed), served by ``ix_task_due_date``.
+
+        Computed at read time, so listings never wait for the overdue
+        scanner; its ``overdue_since``/``escalated_at`` flags only
+        deduplicate notifications.
+        """
+        return (
+            Task.due_date < datetime.utcnow(),
+            Task.status.notin_((TaskStatus.DONE, TaskStatus.CANCELLED))
+        )
+
+    @validates('due_date')
+    def _rearm_overdue(self, key, due_date):
+        # A new due date gets its own overdue and escalation notifications
+        if due_date != self.due_date:
+            self.overdue_since = None
+            self.escalated_at = None
+        return due_date
+
     def is_overdue(self):
         """Check if task is overdue."""
         if not self.due_date:
@@ -129,12 +443,12 @@ class Task(db.Model):
         return datetime.utcnow() > self.due_date and self.status not in [TaskStatus.DONE, TaskStatus.CANCELLED]
 
     def get_time_spent(self):
-        """Get total time spent on this task from time logs."""
-        try:
-            return sum(log.hours for log in self.time_logs)
-        except Exception as e:
-            logger.error(f"Error calculating time spent for task {self.id}: {str(e)}")
-            return 0
+        """Get total time spent on this task (maintained by ``add_logged_hours``)."""
+        return self.actual_hours or 0
+
+    def get_rolled_up_hours(self):
+        """Get total time spent on this task and all of its subtasks."""
+        return self.subtree_actual_hours or 0
 
     def add_label(self, label):
         """Add a label to the task."""
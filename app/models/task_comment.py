@@ -14,6 +14,11 @@ class TaskComment(db.Model):
     task = db.relationship('Task', back_populates='comments')
     user = db.relationship('User', back_populates='task_comments')
 
+    # Sparse fieldsets (see app.utils.fieldsets)
+    SPARSE_FIELDS = ('task_id', 'user_id', 'comment', 'created_at', 'updated_at')
+    SPARSE_RELATIONS = {'user': 'user'}
+    SPARSE_SUMMARY = ('comment', 'user_id', 'created_at')
+
     def to_dict(self):
         return {
             'id': self.id,
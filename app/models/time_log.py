@@ -1,6 +1,7 @@
 # app/models/time_log.py
 from app import db
 from datetime import datetime
+from sqlalchemy import cast, func
 from app.utils.logger import get_logger
 
 logger = get_logger('time_log')
@@ -28,8 +29,19 @@ class TimeLog(db.Model):
     task = db.relationship('Task', back_populates='time_logs')
     user = db.relationship('User', backref='time_logs')
 
-    def to_dict(self):
-        """Return a dictionary representation of the time log."""
+    def to_dict(self, include_details=False):
+        """Return a dictionary representation of the time log.
+
+        Task and user are embedded as small references; pass ``include_details``
+        for their full representations.
+        """
+        if include_details:
+            task = self.task.to_dict() if self.task else None
+            user = self.user.to_dict() if self.user else None
+        else:
+            task = {'id': self.task.id, 'title': self.task.title, 'project_id': self.task.project_id} if self.task else None
+            user = {'id': self.user.id, 'name': self.user.name} if self.user else None
+
         return {
             'id': self.id,
             'task_id': self.task_id,
@@ -39,8 +51,8 @@ class TimeLog(db.Model):
             'work_date': self.work_date.isoformat(),
             'logged_at': self.logged_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
-            'task': self.task.to_dict() if self.task else None,
-            'user': self.user.to_dict() if self.user else None,
+            'task': task,
+            'user': user,
             'hours_formatted': self.get_formatted_hours()
         }
 
@@ -80,9 +92,10 @@ class TimeLog(db.Model):
     def get_user_daily_hours(cls, user_id, date):
         """Get total hours logged by a user on a specific date."""
         try:
-            logs = cls.query.filter_by(user_id=user_id, work_date=date).all()
-            total = sum(log.hours for log in logs)
-            logger.info(f"User {user_id} logged {total} hours on {date}")
+            total = db.session.query(func.coalesce(func.sum(cls.hours), 0))\
+                .filter(cls.user_id == user_id, cls.work_date == date)\
+                .scalar()
+            logger.debug(f"User {user_id} logged {total} hours on {date}")
             return total
         except Exception as e:
             logger.error(f"Error fetching daily hours for user {user_id} on {date}: {str(e)}")
@@ -90,11 +103,11 @@ class TimeLog(db.Model):
 
     @classmethod
     def get_task_total_hours(cls, task_id):
-        """Get total hours logged for a specific task."""
+        """Get total hours logged for a specific task from the maintained task total."""
         try:
-            logs = cls.query.filter_by(task_id=task_id).all()
-            total = sum(log.hours for log in logs)
-            logger.info(f"Task {task_id} total logged hours: {total}")
+            from .task import Task
+            total = db.session.query(Task.actual_hours).filter(Task.id == task_id).scalar() or 0
+            logger.debug(f"Task {task_id} total logged hours: {total}")
             return total
         except Exception as e:
             logger.error(f"Error fetching total hours for task {task_id}: {str(e)}")
@@ -104,14 +117,108 @@ class TimeLog(db.Model):
     def get_user_weekly_hours(cls, user_id, start_date, end_date):
         """Get total hours logged by a user in a date range."""
         try:
-            logs = cls.query.filter(
+            total = db.session.query(func.coalesce(func.sum(cls.hours), 0)).filter(
                 cls.user_id == user_id,
                 cls.work_date >= start_date,
                 cls.work_date <= end_date
-            ).all()
-            total = sum(log.hours for log in logs)
-            logger.info(f"User {user_id} total hours from {start_date} to {end_date}: {total}")
+            ).scalar()
+            logger.debug(f"User {user_id} total hours from {start_date} to {end_date}: {total}")
             return total
         except Exception as e:
             logger.error(f"Error fetching weekly hours for user {user_id}: {str(e)}")
             return 0
+
+    # Supported groupings for get_report
+    REPORT_GROUPS = ('day', 'week', 'project', 'task', 'user')
+
+    @classmethod
+    def week_start(cls):
+        """SQL expression for the Monday of ``work_date``'s ISO week, as a date."""
+        if db.session.get_bind().dialect.name == 'sqlite':
+            # 'weekday 0' moves forward to Sunday (or stays on it); Monday is 6 days before
+            return func.date(cls.work_date, 'weekday 0', '-6 days', type_=db.Date)
+        return cast(func.date_trunc('week', cls.work_date), db.Date)
+
+    @classmethod
+    def get_report(cls, group_by='day', user_id=None, project_id=None, task_id=None,
+                   start_date=None, end_date=None, page=1, per_page=50):
+        """Aggregate logged hours in SQL, grouped by day, week, project, task or user.
+
+        Returns ``(groups, total_groups, total_hours)`` where ``groups`` is the
+        requested page of ``{'key', 'label', 'total_hours', 'entries',
+        'first_date', 'last_date'}`` dicts.
+        """
+        from .task import Task
+        from .project import Project
+        from .user import User
+
+        if group_by not in cls.REPORT_GROUPS:
+            raise ValueError(f"Invalid group_by '{group_by}'. Choose one of: {', '.join(cls.REPORT_GROUPS)}")
+
+        query = db.session.query(cls)
+        if project_id or group_by in ('project', 'task'):
+            query = query.join(Task, Task.id == cls.task_id)
+
+        if user_id:
+            query = query.filter(cls.user_id == user_id)
+        if project_id:
+            query = query.filter(Task.project_id == project_id)
+        if task_id:
+            query = query.filter(cls.task_id == task_id)
+        if start_date:
+            query = query.filter(cls.work_date >= start_date)
+        if end_date:
+            query = query.filter(cls.work_date <= end_date)
+
+        if group_by == 'day':
+            key = cls.work_date
+            label = cls.work_date
+        elif group_by == 'week':
+            key = cls.week_start()
+            label = key
+        elif group_by == 'project':
+            query = query.outerjoin(Project, Project.id == Task.project_id)
+            key = Task.project_id
+            label = Project.name
+        elif group_by == 'task':
+            key = cls.task_id
+            label = Task.title
+        else:
+            query = query.join(User, User.id == cls.user_id)
+            key = cls.user_id
+            label = User.name
+
+        total_hours = query.with_entities(func.coalesce(func.sum(cls.hours), 0)).scalar()
+
+        grouped = query.with_entities(
+            key.label('key'),
+            label.label('label'),
+            func.sum(cls.hours).label('total_hours'),
+            func.count(cls.id).label('entries'),
+            func.min(cls.work_date).label('first_date'),
+            func.max(cls.work_date).label('last_date')
+        ).group_by(key, label)
+
+        total_groups = db.session.query(func.count()).select_from(grouped.subquery()).scalar()
+
+        if group_by in ('day', 'week'):
+            grouped = grouped.order_by(key.desc())
+        else:
+            grouped = grouped.order_by(func.sum(cls.hours).desc(), key)
+
+        rows = grouped.offset((page - 1) * per_page).limit(per_page).all()
+
+        def _iso(value):
+            return value.isoformat() if hasattr(value, 'isoformat') else value
+
+        groups = [{
+            'key': _iso(row.key),
+            'label': _iso(row.label),
+            'total_hours': row.total_hours,
+            'entries': row.entries,
+            'first_date': _iso(row.first_date),
+            'last_date': _iso(row.last_date)
+        } for row in rows]
+
+        logger.debug(f"Time report by {group_by}: {len(groups)} of {total_groups} groups, {total_hours} hours")
+        return groups, total_groups, total_hours
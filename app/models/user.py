@@ -1,12 +1,13 @@
 # app/models/user.py
 from app import db
 from datetime import datetime
-from werkzeug.security import generate_password_hash, check_password_hash
 from .enums import UserRole
 
 # Import logging and caching utilities
 from app.utils.logger import get_logger, log_auth_event, log_db_query
 from app.utils.cache_utils import cache, cached_per_user, invalidate_user_cache, CacheKeys
+from app.utils.fieldsets import json_list
+from app.utils.passwords import hash_password, verify_password, needs_rehash
 
 # Initialize logger for this module
 logger = get_logger('users')
@@ -51,15 +52,32 @@ class User(db.Model):
     notifications = db.relationship('Notification', back_populates='user', foreign_keys='Notification.user_id')
     task_comments = db.relationship('TaskComment', back_populates='user', cascade='all, delete-orphan')
 
+    # Sparse fieldsets (see app.utils.fieldsets); password hash, phone and rate are never exposed
+    SPARSE_FIELDS = (
+        'name', 'email', 'role', 'avatar_url', 'bio', 'skills', 'github_username', 'linkedin_url',
+        'timezone', 'daily_work_hours', 'is_active', 'last_login', 'created_at', 'updated_at'
+    )
+    SPARSE_COMPUTED = {
+        'skills': (('skills',), lambda user: json_list(user.skills)),
+    }
+    SPARSE_SUMMARY = ('name', 'avatar_url')
+
     def set_password(self, password):
-        """Set user password with logging."""
+        """Set user password with logging (hashed in the password pool)."""
         logger.debug(f"Setting password for user {self.id}")
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        """Check user password with logging."""
-        result = check_password_hash(self.password_hash, password)
+        """Check user password with logging.
+
+        A correct password whose hash was made with other cost parameters than
+        ``PASSWORD_HASH_METHOD`` is re-hashed; the caller commits it.
+        """
+        result = verify_password(self.password_hash, password)
         logger.debug(f"Password check for user {self.email}: {'SUCCESS' if result else 'FAILED'}")
+        if result and needs_rehash(self.password_hash):
+            logger.info(f"Upgrading password hash parameters for user {self.id}")
+            self.set_password(password)
         return result
 
     @classmethod
@@ -222,13 +240,14 @@ class User(db.Model):
 
     def has_project_permission(self, project_id, permission):
         """Check if user has specific permission in a project."""
-        # Project owner has all permissions
-        if any(p.id == project_id for p in self.owned_projects):
-            return True
-        
-        # Check project membership permissions
+        # Memberships are eager-loaded with the request's current user, so check
+        # them before lazy-loading owned projects
         membership = next((m for m in self.project_memberships if m.project_id == project_id), None)
-        return membership.has_permission(permission) if membership else False
+        if membership and membership.has_permission(permission):
+            return True
+
+        # Project owner has all permissions
+        return any(p.id == project_id for p in self.owned_projects)
 
     @cached_per_user(timeout=300, key_prefix="user_workload")
     def get_workload(self):
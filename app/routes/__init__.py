@@ -10,6 +10,8 @@ from app.routes.notification_routes import notification_bp
 from app.routes.analytics_routes import analytics_bp
 from app.routes.sprint_routes import sprint_bp
 from app.routes.enum_routes import enum_bp
+from app.routes.sync_routes import sync_bp
+from app.routes.dashboard_routes import dashboard_bp
 
 def register_blueprints(app: Flask):
     """Register all blueprints with the Flask app"""
@@ -22,6 +24,8 @@ def register_blueprints(app: Flask):
         (notification_bp, '/api/notifications'),
         (analytics_bp, '/api/analytics'),
         (enum_bp, '/api/enums'),
+        (sync_bp, '/api/sync'),
+        (dashboard_bp, '/api/dashboard'),
     ]
     
     for blueprint, prefix in blueprints:
@@ -29,8 +33,6 @@ def register_blueprints(app: Flask):
     
     # Register health check routes
     register_health_routes(app)
-    
-    print("✅ All blueprints registered successfully")
 
 def register_health_routes(app: Flask):
     """Register health check endpoints"""
@@ -41,9 +43,10 @@ def register_health_routes(app: Flask):
     
     @app.route('/health/db')
     def db_health_check():
-        from app.utils.database import test_connection
+        from app.utils.database import test_connection, pool_status
         try:
-            test_connection()
-            return {'status': 'healthy', 'database': 'connected'}, 200
+            if not test_connection():
+                return {'status': 'unhealthy', 'database': 'disconnected', 'pool': pool_status()}, 503
+            return {'status': 'healthy', 'database': 'connected', 'pool': pool_status()}, 200
         except Exception as e:
             return {'status': 'unhealthy', 'database': 'disconnected', 'error': str(e)}, 500
\ No newline at end of file
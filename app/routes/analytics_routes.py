@@ -7,6 +7,7 @@ from app.utils.response import (
 )
 from app.utils.cache_utils import cache
 from app.utils.logger import get_logger, log_request, log_cache_operation
+from app.utils.etag import conditional_get, versioned_key
 
 analytics_bp = Blueprint('analytics', __name__, url_prefix='/api/analytics')
 logger = get_logger('analytics')
@@ -14,6 +15,7 @@ logger = get_logger('analytics')
 
 @analytics_bp.route('/task-completion', methods=['GET'])
 @jwt_required()
+@conditional_get(lambda: AnalyticsService.get_tasks_version(request.args.get('user_id') or get_jwt_identity()))
 @log_request
 def task_completion():
     user_id = request.args.get('user_id', None)
@@ -21,7 +23,7 @@ def task_completion():
         user_id = get_jwt_identity()
 
     period = request.args.get('period', 'month')
-    cache_key = f"task_completion:{user_id}:{period}"
+    cache_key = versioned_key(f"task_completion:{user_id}:{period}")
     cached_result = cache.get(cache_key)
     log_cache_operation("GET", cache_key, hit=bool(cached_result))
     
@@ -51,13 +53,14 @@ def task_completion():
 
 @analytics_bp.route('/user-productivity', methods=['GET'])
 @jwt_required()
+@conditional_get(lambda: AnalyticsService.get_tasks_version(request.args.get('user_id') or get_jwt_identity()))
 @log_request
 def user_productivity():
     user_id = request.args.get('user_id', None)
     if not user_id:
         user_id = get_jwt_identity()
     
-    cache_key = f"user_productivity:{user_id}"
+    cache_key = versioned_key(f"user_productivity:{user_id}")
     cached_result = cache.get(cache_key)
     log_cache_operation("GET", cache_key, hit=bool(cached_result))
     
@@ -87,9 +90,10 @@ def user_productivity():
 
 @analytics_bp.route('/task-status-distribution', methods=['GET'])
 @jwt_required()
+@conditional_get(lambda: AnalyticsService.get_tasks_version())
 @log_request
 def task_status_distribution():
-    cache_key = "task_status_distribution"
+    cache_key = versioned_key("task_status_distribution")
     cached_result = cache.get(cache_key)
     log_cache_operation("GET", cache_key, hit=bool(cached_result))
     
@@ -119,9 +123,10 @@ def task_status_distribution():
 
 @analytics_bp.route('/task-priority-distribution', methods=['GET'])
 @jwt_required()
+@conditional_get(lambda: AnalyticsService.get_tasks_version())
 @log_request
 def task_priority_distribution():
-    cache_key = "task_priority_distribution"
+    cache_key = versioned_key("task_priority_distribution")
     cached_result = cache.get(cache_key)
     log_cache_operation("GET", cache_key, hit=bool(cached_result))
     
@@ -1,15 +1,14 @@
 # app/routes/auth_routes.py
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from app.services.auth_service import AuthService
 from app.utils.response import (
     success_response, error_response, created_response, 
     not_found_response, validation_error_response, server_error_response,
     unauthorized_response
 )
-from app.utils.cache_utils import cache, user_cache_key
-from app.utils.logger import get_logger, log_auth_event, log_cache_operation
-import json
+from app.utils.cache_utils import user_cache_key
+from app.utils.logger import get_logger, log_auth_event
 from app.utils.logger import log_request
 
 
@@ -50,30 +49,21 @@ def login():
     email = data.get('email')
     password = data.get('password')
 
-    # Check cache first
-    cache_key = f"login:{email}"
-    cached_result = cache.get(cache_key)
-    log_cache_operation("GET", cache_key, hit=bool(cached_result))
-
-    if cached_result:
-        logger.info(f"Login fetched from cache | Email: {email}")
-        log_auth_event("Login", email=email, success=True)
-        return success_response("Login successful (from cache)", json.loads(cached_result))
-
-    # Authenticate user
+    # Never cached: a cached result would skip the password check. Hashing
+    # runs in the password pool (app.utils.passwords), not on this worker.
     result = AuthService.login_user(email, password)
-    logger.info(f"Authentication result for {email}: {result}")
-    if not result["success"]:
-        logger.warning(f"Login failed for {email}: {result['error']}")
+    if isinstance(result, tuple):
+        error, status_code = result
+        logger.warning(f"Login failed for {email}: {error['error']}")
         log_auth_event("Login", email=email, success=False)
-        return unauthorized_response(result["error"])
-
-    # Cache login result for 5 minutes
-    cache.set(cache_key, json.dumps(result), timeout=300)
-    log_cache_operation("SET", cache_key)
-
-    logger.info(f"Login successful and cached | Email: {email}")
-    log_auth_event("Login", user_id=result.get("user_id"), email=email, success=True)
+        if status_code == 503:
+            return error_response(error['error'], status_code=503)
+        if status_code >= 500:
+            return server_error_response(error['error'])
+        return unauthorized_response(error['error'])
+
+    logger.info(f"Login successful | Email: {email}")
+    log_auth_event("Login", user_id=result["user"]["id"], email=email, success=True)
     return success_response("Login successful", result)
 
 
@@ -99,7 +89,7 @@ def update_profile():
         logger.warning(f"Profile update failed: No fields to update | User: {user_id}")
         return validation_error_response('No fields to update')
 
-    result = AuthService.update_profile(user_id, data)
+    result = AuthService.update_profile(current_user, data)
 
     if result:
         logger.info(f"Profile updated successfully | User: {user_id}")
@@ -121,7 +111,7 @@ def update_password():
         logger.warning(f"Change password failed: Missing fields | User: {user_id}")
         return validation_error_response('Missing required fields')
 
-    result = AuthService.change_password(user_id, new_password)
+    result = AuthService.change_password(current_user, new_password)
 
     if 'error' in result:
         logger.error(f"Change password failed | User: {user_id}: {result['error']}")
@@ -0,0 +1,29 @@
+# app/routes/dashboard_routes.py
+from flask import Blueprint, request
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
+from app.services.dashboard_service import DashboardService
+from app.utils.response import success_response, error_response, server_error_response
+from app.utils.logger import get_logger, log_api_request
+
+dashboard_bp = Blueprint('dashboard', __name__, url_prefix='/api/dashboard')
+logger = get_logger('api')
+
+
+@dashboard_bp.route('', methods=['GET'])
+@jwt_required()
+def get_dashboard():
+    """Tasks, overdue tasks, notifications, analytics, recent projects and
+    project permissions in one response."""
+    user_id = get_jwt_identity()
+    log_api_request('/api/dashboard', 'GET', user_id, request.remote_addr)
+
+    try:
+        result, status_code = DashboardService.get_dashboard(current_user, limit=request.args.get('limit', type=int))
+        if status_code != 200:
+            logger.warning(f"Dashboard failed for user {user_id}: {result.get('error')}")
+            return error_response(result.get('error', 'Error building dashboard'), status_code=status_code)
+
+        return success_response("Dashboard retrieved successfully", result)
+    except Exception as e:
+        logger.error(f"Dashboard error for user {user_id}: {e}", exc_info=True)
+        return server_error_response(f'Error building dashboard: {str(e)}')
@@ -3,10 +3,13 @@ from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services.notification_service import NotificationService
 from app.utils.response import (
-    success_response, error_response, not_found_response, server_error_response
+    success_response, error_response, not_found_response, server_error_response, validation_error_response
 )
 from app.utils.logger import get_logger, log_cache_operation
 from app.utils.cache_utils import cache
+from app.utils.etag import conditional_get, versioned_key
+from app.utils.fieldsets import fieldset_from_request
+from app.models.notification import Notification
 
 notification_bp = Blueprint('notification', __name__, url_prefix='/api/notifications')
 logger = get_logger('api')  # You can also use 'notification' for a separate logger
@@ -14,6 +17,7 @@ logger = get_logger('api')  # You can also use 'notification' for a separate log
 
 def cache_notifications(key, fetch_func, timeout=300):
     """Helper to fetch notifications from cache or load fresh"""
+    key = versioned_key(key)
     cached_data = cache.get(key)
     log_cache_operation("GET", key, hit=bool(cached_data))
     if cached_data:
@@ -28,6 +32,7 @@ def cache_notifications(key, fetch_func, timeout=300):
 
 @notification_bp.route('/summary', methods=['GET'])
 @jwt_required()
+@conditional_get(lambda: NotificationService.get_notifications_version(get_jwt_identity()))
 def get_notification_summary():
     """Get notification summary for dashboard."""
     user_id = get_jwt_identity()
@@ -44,16 +49,27 @@ def get_notification_summary():
 
 @notification_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional_get(lambda: NotificationService.get_notifications_version(get_jwt_identity()))
 def get_notifications():
     user_id = get_jwt_identity()
     unread_only = request.args.get('unread_only', 'false').lower() == 'true'
     cache_key = f"notifications:{user_id}:unread={unread_only}"
 
     try:
-        result = cache_notifications(
-            cache_key,
-            lambda: NotificationService.get_user_notifications(user_id, unread_only)
-        )
+        fieldset = fieldset_from_request(Notification)
+    except ValueError as e:
+        return validation_error_response(str(e))
+
+    try:
+        if fieldset:
+            result = NotificationService.get_user_notifications(
+                user_id=user_id, unread_only=unread_only, fieldset=fieldset
+            )
+        else:
+            result = cache_notifications(
+                cache_key,
+                lambda: NotificationService.get_user_notifications(user_id, unread_only)
+            )
         message = "Unread notifications retrieved successfully" if unread_only else "Notifications retrieved successfully"
         logger.info(f"{message} | User: {user_id}")
         return success_response(message, result)
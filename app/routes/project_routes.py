@@ -1,13 +1,18 @@
 # app/routes/project_routes.py
 from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from app.services.project_service import ProjectService
+from app.services.task_service import TaskService
 from app.utils.response import (
     success_response, error_response, created_response, 
     not_found_response, validation_error_response, server_error_response
 )
 from app.utils.logger import get_logger, log_cache_operation
 from app.utils.cache_utils import cache
+from app.utils.etag import conditional_get, versioned_key
+from app.utils.fieldsets import fieldset_from_request
+from app.models.project import Project
+from app.models.task import Task
 import json
 
 project_bp = Blueprint('project', __name__, url_prefix='/api/projects')
@@ -16,6 +21,7 @@ logger = get_logger('project')
 
 def cache_result(key, fetch_func, timeout=300):
     """Helper to get data from cache or fetch fresh"""
+    key = versioned_key(key)
     cached_data = cache.get(key)
     log_cache_operation("GET", key, hit=bool(cached_data))
     if cached_data:
@@ -38,7 +44,7 @@ def create():
         logger.warning(f"Project creation failed: Missing name | User: {user_id}")
         return validation_error_response('Project name is required')
 
-    result = ProjectService.create_project(data, user_id)
+    result = ProjectService.create_project(data, current_user)
     logger.info(f"Project created successfully | Project: {result.get('id')} | User: {user_id}")
     cache.clear()  # Clear cache after creating new project
     return created_response("Project created successfully", result)
@@ -46,9 +52,18 @@ def create():
 
 @project_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional_get(lambda: ProjectService.get_projects_version())
 def get_all():
     try:
-        result = cache_result("projects:all", ProjectService.get_all_projects)
+        fieldset = fieldset_from_request(Project)
+    except ValueError as e:
+        return validation_error_response(str(e))
+
+    try:
+        if fieldset:
+            result = ProjectService.get_all_projects(fieldset=fieldset)
+        else:
+            result = cache_result("projects:all", ProjectService.get_all_projects)
         logger.info("All projects retrieved successfully")
         return success_response("Projects retrieved successfully", result)
     except Exception as e:
@@ -58,10 +73,19 @@ def get_all():
 
 @project_bp.route('/<int:project_id>', methods=['GET'])
 @jwt_required()
+@conditional_get(lambda project_id: ProjectService.get_projects_version(project_id))
 def get_one(project_id):
     try:
-        key = f"projects:{project_id}"
-        result = cache_result(key, lambda: ProjectService.get_project_by_id(project_id))
+        fieldset = fieldset_from_request(Project)
+    except ValueError as e:
+        return validation_error_response(str(e))
+
+    try:
+        if fieldset:
+            result = ProjectService.get_project_by_id(project_id=project_id, fieldset=fieldset)
+        else:
+            key = f"projects:{project_id}"
+            result = cache_result(key, lambda: ProjectService.get_project_by_id(project_id))
         logger.info(f"Project retrieved | Project: {project_id}")
         return success_response("Project retrieved successfully", result)
     except Exception as e:
@@ -100,11 +124,50 @@ def delete(project_id):
 
 @project_bp.route('/recent', methods=['GET'])
 @jwt_required()
+@conditional_get(lambda: ProjectService.get_projects_version())
 def get_recent():
     try:
-        result = cache_result("projects:recent", ProjectService.get_recent_projects)
+        fieldset = fieldset_from_request(Project)
+    except ValueError as e:
+        return validation_error_response(str(e))
+
+    try:
+        if fieldset:
+            result = ProjectService.get_recent_projects(fieldset=fieldset)
+        else:
+            result = cache_result("projects:recent", ProjectService.get_recent_projects)
         logger.info("Recent projects retrieved successfully")
         return success_response("Recent projects retrieved successfully", result)
     except Exception as e:
         logger.error(f"Error fetching recent projects: {e}", exc_info=True)
         return server_error_response(f"Error fetching recent projects: {str(e)}")
+
+
+@project_bp.route('/<int:project_id>/board', methods=['GET'])
+@jwt_required()
+@conditional_get(lambda project_id: TaskService.get_tasks_version(None, {'project_id': project_id}))
+def get_board(project_id):
+    """Kanban board: top tasks per status column, with totals and per-column cursors."""
+    try:
+        fieldset = fieldset_from_request(Task)
+    except ValueError as e:
+        return validation_error_response(str(e))
+
+    try:
+        result, status_code = ProjectService.get_project_board(
+            project_id,
+            current_user,
+            limit=request.args.get('limit', type=int),
+            status=request.args.get('status'),
+            cursor=request.args.get('cursor'),
+            sprint_id=request.args.get('sprint_id', type=int),
+            fieldset=fieldset
+        )
+        if status_code != 200:
+            return error_response(result.get('error', 'Error fetching board'), status_code=status_code)
+
+        logger.info(f"Board retrieved | Project: {project_id}")
+        return success_response("Board retrieved successfully", result)
+    except Exception as e:
+        logger.error(f"Error fetching board for project {project_id}: {e}", exc_info=True)
+        return server_error_response(f"Error fetching board: {str(e)}")
@@ -1,6 +1,6 @@
 # app/routes/sprint_routes.py
 from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from app.services.sprint_service import SprintService
 from app.utils.response import (
     success_response, error_response, created_response, 
@@ -8,6 +8,9 @@ from app.utils.response import (
 )
 from app.utils.logger import get_logger, log_api_request, log_cache_operation
 from app.utils.cache_utils import cache, cached_per_user, CacheKeys, invalidate_user_cache, invalidate_project_cache
+from app.utils.fieldsets import fieldset_from_request
+from app.utils.etag import if_match_version, version_etag
+from app.models.sprint import Sprint
 import json
 
 sprint_bp = Blueprint('sprint', __name__, url_prefix='/api/sprints')
@@ -45,7 +48,7 @@ def create_sprint():
             logger.warning(f"Sprint creation failed: missing field {field} | User: {user_id}")
             return validation_error_response(f'Missing required field: {field}')
 
-    result, status_code = SprintService.create_sprint(data, user_id)
+    result, status_code = SprintService.create_sprint(data, current_user)
     if status_code != 201:
         logger.warning(f"Sprint creation failed | User: {user_id}: {result.get('error')}")
         return error_response(result.get('error', 'Error creating sprint'), status_code=status_code)
@@ -65,16 +68,24 @@ def get_sprint(sprint_id):
 
     include_tasks = request.args.get('include_tasks', 'false').lower() == 'true'
 
+    try:
+        fieldset = fieldset_from_request(Sprint)
+    except ValueError as e:
+        return validation_error_response(str(e))
+
     def fetch():
-        result, status_code = SprintService.get_sprint_by_id(sprint_id, include_tasks)
+        if fieldset:
+            result, status_code = SprintService.get_sprint_by_id(sprint_id=sprint_id, fieldset=fieldset)
+        else:
+            result, status_code = SprintService.get_sprint_by_id(sprint_id, include_tasks)
         if status_code != 200:
             raise Exception(result.get('error', 'Error fetching sprint'))
         return result
 
     try:
-        result = cache_result(f"sprint:{sprint_id}", fetch)
+        result = fetch() if fieldset else cache_result(f"sprint:{sprint_id}", fetch)
         logger.info(f"Sprint retrieved | Sprint: {sprint_id} | User: {user_id}")
-        return success_response("Sprint retrieved successfully", result)
+        return version_etag(success_response("Sprint retrieved successfully", result), result.get('version'))
     except Exception as e:
         logger.error(f"Sprint fetch error | Sprint: {sprint_id} | User: {user_id} | {str(e)}")
         return server_error_response(f'Error fetching sprint: {str(e)}')
@@ -91,7 +102,15 @@ def update_sprint(sprint_id):
         logger.warning(f"Sprint update failed: no data provided | Sprint: {sprint_id} | User: {user_id}")
         return validation_error_response('No data provided')
 
-    result, status_code = SprintService.update_sprint(sprint_id, data, user_id)
+    try:
+        expected_version = if_match_version()
+    except ValueError as e:
+        return validation_error_response(str(e))
+
+    result, status_code = SprintService.update_sprint(sprint_id, data, current_user, expected_version)
+    if status_code == 409:
+        logger.info(f"Sprint update conflict | Sprint: {sprint_id} | User: {user_id}")
+        return error_response(result['error'], data=result['current'], status_code=409)
     if status_code != 200:
         logger.warning(f"Sprint update failed | Sprint: {sprint_id} | User: {user_id} | {result.get('error')}")
         return error_response(result.get('error', 'Error updating sprint'), status_code=status_code)
@@ -100,7 +119,7 @@ def update_sprint(sprint_id):
     if result.get('project_id'):
         invalidate_project_cache(result['project_id'])
     cache.delete(f"sprint:{sprint_id}")
-    return success_response("Sprint updated successfully", result)
+    return version_etag(success_response("Sprint updated successfully", result), result.get('version'))
 
 
 @sprint_bp.route('/<int:sprint_id>', methods=['DELETE'])
@@ -109,7 +128,7 @@ def delete_sprint(sprint_id):
     user_id = get_jwt_identity()
     log_api_request(f'/api/sprints/{sprint_id}', 'DELETE', user_id, request.remote_addr)
 
-    result, status_code = SprintService.delete_sprint(sprint_id, user_id)
+    result, status_code = SprintService.delete_sprint(sprint_id, current_user)
     if status_code != 200:
         logger.warning(f"Sprint deletion failed | Sprint: {sprint_id} | User: {user_id} | {result.get('error')}")
         return error_response(result.get('error', 'Error deleting sprint'), status_code=status_code)
@@ -128,7 +147,7 @@ def get_project_sprints(project_id):
     user_id = get_jwt_identity()
     log_api_request(f'/api/sprints/project/{project_id}', 'GET', user_id, request.remote_addr)
 
-    result, status_code = SprintService.get_project_sprints(project_id, user_id)
+    result, status_code = SprintService.get_project_sprints(project_id, current_user)
     if status_code != 200:
         logger.warning(f"Project sprints fetch failed | Project: {project_id} | User: {user_id} | {result.get('error')}")
         return error_response(result.get('error', 'Error fetching project sprints'), status_code=status_code)
@@ -144,7 +163,7 @@ def get_sprint_burndown(sprint_id):
     user_id = get_jwt_identity()
     log_api_request(f'/api/sprints/{sprint_id}/burndown', 'GET', user_id, request.remote_addr)
 
-    result, status_code = SprintService.get_sprint_burndown(sprint_id, user_id)
+    result, status_code = SprintService.get_sprint_burndown(sprint_id, current_user)
     if status_code != 200:
         logger.warning(f"Sprint burndown fetch failed | Sprint: {sprint_id} | User: {user_id} | {result.get('error')}")
         return error_response(result.get('error', 'Error fetching burndown data'), status_code=status_code)
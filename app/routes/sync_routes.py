@@ -0,0 +1,36 @@
+# app/routes/sync_routes.py
+from flask import Blueprint, request
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
+from app.services.sync_service import SyncService
+from app.utils.response import success_response, error_response, server_error_response, validation_error_response
+from app.utils.logger import get_logger, log_api_request
+
+sync_bp = Blueprint('sync', __name__, url_prefix='/api/sync')
+logger = get_logger('api')
+
+
+@sync_bp.route('', methods=['GET'])
+@jwt_required()
+def get_changes():
+    """Incremental sync: everything changed since ``?since=<token>``."""
+    user_id = get_jwt_identity()
+    log_api_request('/api/sync', 'GET', user_id, request.remote_addr)
+
+    since = request.args.get('since')
+    if since is not None and not since.isdigit():
+        return validation_error_response('since must be a sync token returned by this endpoint')
+
+    try:
+        result, status_code = SyncService.get_changes(
+            current_user,
+            since=int(since) if since is not None else None,
+            limit=request.args.get('limit', type=int)
+        )
+        if status_code != 200:
+            logger.warning(f"Sync failed for user {user_id}: {result.get('error')}")
+            return error_response(result.get('error', 'Error fetching changes'), status_code=status_code)
+
+        return success_response("Changes retrieved successfully", result)
+    except Exception as e:
+        logger.error(f"Sync error for user {user_id}: {e}", exc_info=True)
+        return server_error_response(f'Error fetching changes: {str(e)}')
@@ -1,8 +1,9 @@
 # app/routes/task_routes.py
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required, get_jwt_identity, current_user
 from datetime import datetime
 
+from app.models.task import Task
 from app.models.task_comment import TaskComment
 from app.models.user import User
 from app.models.time_log import TimeLog
@@ -15,6 +16,9 @@ from app.utils.response import (
 # Import logging and caching utilities
 from app.utils.logger import get_logger, log_api_request
 from app.utils.cache_utils import cache, cached_per_user, CacheKeys, invalidate_user_cache
+from app.utils.etag import conditional_get, if_match_version, version_etag
+from app.utils.fieldsets import fieldset_from_request
+from app.utils.socket_utils import broadcast_task_update
 
 # Initialize logger for this module
 logger = get_logger('api.tasks')
@@ -35,7 +39,7 @@ def create():
     try:
         # Override user_id from JWT token for security
         data['user_id'] = user_id
-        result = TaskService.create_task(data, user_id)
+        result = TaskService.create_task(data, current_user)
 
         if isinstance(result, tuple) and len(result) == 2 and 'error' in result[0]:
             logger.warning(f"Task creation failed for user {user_id}: {result[0]['error']}")
@@ -49,8 +53,42 @@ def create():
         return server_error_response(f'Error creating task: {str(e)}')
 
 
+def _task_filters_from_request():
+    """Build task listing filters from query parameters."""
+    filters = {}
+
+    # Project and sprint filters
+    if request.args.get('project_id'):
+        filters['project_id'] = int(request.args.get('project_id'))
+    if request.args.get('sprint_id'):
+        filters['sprint_id'] = int(request.args.get('sprint_id'))
+
+    # User filters
+    if request.args.get('assigned_to_id'):
+        filters['assigned_to_id'] = int(request.args.get('assigned_to_id'))
+    if request.args.get('created_by_id'):
+        filters['created_by_id'] = int(request.args.get('created_by_id'))
+
+    # Status and priority filters
+    if request.args.get('status'):
+        filters['status'] = request.args.get('status')
+    if request.args.get('priority'):
+        filters['priority'] = request.args.get('priority')
+    if request.args.get('task_type'):
+        filters['task_type'] = request.args.get('task_type')
+
+    # Special filters
+    if request.args.get('overdue') == 'true':
+        filters['overdue'] = True
+    if request.args.get('parent_task_id'):
+        filters['parent_task_id'] = int(request.args.get('parent_task_id'))
+
+    return filters
+
+
 @task_bp.route('', methods=['GET'])
 @jwt_required()
+@conditional_get(lambda: TaskService.get_tasks_version(get_jwt_identity(), _task_filters_from_request()))
 def get_tasks():
     """Get tasks with advanced filtering and pagination."""
     user_id = get_jwt_identity()
@@ -67,37 +105,18 @@ def get_tasks():
         sort_order = request.args.get('sort_order', 'desc')
         
         # Build filters from query parameters
-        filters = {}
-        
-        # Project and sprint filters
-        if request.args.get('project_id'):
-            filters['project_id'] = int(request.args.get('project_id'))
+        filters = _task_filters_from_request()
+        if filters.get('project_id'):
             logger.debug(f"Filtering by project_id: {filters['project_id']}")
-        if request.args.get('sprint_id'):
-            filters['sprint_id'] = int(request.args.get('sprint_id'))
-            
-        # User filters
-        if request.args.get('assigned_to_id'):
-            filters['assigned_to_id'] = int(request.args.get('assigned_to_id'))
-        if request.args.get('created_by_id'):
-            filters['created_by_id'] = int(request.args.get('created_by_id'))
-            
-        # Status and priority filters
-        if request.args.get('status'):
-            filters['status'] = request.args.get('status')
-        if request.args.get('priority'):
-            filters['priority'] = request.args.get('priority')
-        if request.args.get('task_type'):
-            filters['task_type'] = request.args.get('task_type')
-            
-        # Special filters
-        if request.args.get('overdue') == 'true':
-            filters['overdue'] = True
-        if request.args.get('parent_task_id'):
-            filters['parent_task_id'] = int(request.args.get('parent_task_id'))
+
+        # Sparse fieldset (?fields=...&include=...)
+        try:
+            fieldset = fieldset_from_request(Task)
+        except ValueError as e:
+            return validation_error_response(str(e))
         
         # Call service method
-        result, status_code = TaskService.get_tasks_by_filters(user_id, filters)
+        result, status_code = TaskService.get_tasks_by_filters(current_user, filters, fieldset)
         
         if status_code != 200:
             logger.warning(f"Task fetching failed for user {user_id}: {result.get('error', 'Unknown error')}")
@@ -138,12 +157,22 @@ def get_one(task_id):
     logger.debug(f"Fetching task {task_id} for user {user_id}")
     
     try:
-        result, status_code = TaskService.get_task_by_id(task_id, user_id)
+        try:
+            fieldset = fieldset_from_request(Task)
+        except ValueError as e:
+            return validation_error_response(str(e))
+
+        result, status_code = TaskService.get_task_by_id(task_id, current_user, fieldset)
 
         if status_code != 200 or 'error' in result:
             logger.warning(f"Task {task_id} fetch failed for user {user_id}: {result.get('error', 'Not found')}")
             return not_found_response(result.get('error', 'Task not found'))
 
+        # Sparse payloads carry comments only when requested via include=comments
+        if fieldset:
+            logger.debug(f"Task {task_id} retrieved with fieldset {fieldset}")
+            return version_etag(success_response("Task retrieved successfully", result), result.get('version'))
+
         # Fetch all comments for the given task
         comments = TaskComment.query.filter_by(task_id=task_id).all()
 
@@ -163,13 +192,39 @@ def get_one(task_id):
         ]
 
         logger.debug(f"Task {task_id} retrieved successfully with {len(comments)} comments")
-        return success_response("Task retrieved successfully", result)
+        return version_etag(success_response("Task retrieved successfully", result), result.get('version'))
 
     except Exception as e:
         logger.error(f"Task {task_id} fetch error for user {user_id}: {str(e)}")
         return server_error_response(f'Error fetching task: {str(e)}')
 
 
+@task_bp.route('/<int:task_id>/hierarchy', methods=['GET'])
+@jwt_required()
+def get_hierarchy(task_id):
+    """Get the ancestor chain and subtask tree for a task."""
+    user_id = get_jwt_identity()
+
+    # Log API request
+    log_api_request(f'/api/tasks/{task_id}/hierarchy', 'GET', user_id, request.remote_addr)
+    logger.debug(f"Fetching hierarchy for task {task_id} for user {user_id}")
+
+    try:
+        max_depth = request.args.get('max_depth', type=int)
+        result, status_code = TaskService.get_task_hierarchy(task_id, current_user, max_depth)
+
+        if status_code != 200:
+            logger.warning(f"Task {task_id} hierarchy fetch failed for user {user_id}: {result.get('error', 'Unknown error')}")
+            return error_response(result.get('error', 'Error fetching task hierarchy'), status_code=status_code)
+
+        logger.debug(f"Task {task_id} hierarchy retrieved with {result['total_nodes']} nodes")
+        return success_response("Task hierarchy retrieved successfully", result)
+
+    except Exception as e:
+        logger.error(f"Task {task_id} hierarchy fetch error for user {user_id}: {str(e)}")
+        return server_error_response(f'Error fetching task hierarchy: {str(e)}')
+
+
 @task_bp.route('/<int:task_id>', methods=['PUT'])
 @jwt_required()
 def update(task_id):
@@ -181,14 +236,28 @@ def update(task_id):
     logger.info(f"Updating task {task_id} by user {user_id}")
     
     try:
-        result, status_code = TaskService.update_task(task_id, data, user_id)
+        expected_version = if_match_version()
+    except ValueError as e:
+        return validation_error_response(str(e))
+
+    try:
+        result, status_code = TaskService.update_task(task_id, data, current_user, expected_version)
+
+        if status_code == 409:
+            logger.info(f"Task {task_id} update conflict for user {user_id}")
+            return error_response(result['error'], data=result['current'], status_code=409)
 
         if status_code != 200 or 'error' in result:
             logger.warning(f"Task {task_id} update failed for user {user_id}: {result.get('error', 'Unknown error')}")
             return error_response(result.get('error', 'Error updating task'), status_code=status_code)
 
         logger.info(f"Task {task_id} updated successfully by user {user_id}")
-        return success_response("Task updated successfully", result)
+        broadcast_task_update(
+            result,
+            project_id=(result.get('project') or {}).get('id'),
+            assignee_id=(result.get('assigned_to') or {}).get('id')
+        )
+        return version_etag(success_response("Task updated successfully", result), result.get('version'))
 
     except Exception as e:
         logger.error(f"Task {task_id} update error for user {user_id}: {str(e)}")
@@ -205,7 +274,7 @@ def delete(task_id):
     logger.info(f"Deleting task {task_id} by user {user_id}")
     
     try:
-        result, status_code = TaskService.delete_task(task_id, user_id)
+        result, status_code = TaskService.delete_task(task_id, current_user)
         
         if status_code != 200 or 'error' in result:
             logger.warning(f"Task {task_id} deletion failed for user {user_id}: {result.get('error', 'Unknown error')}")
@@ -235,14 +304,14 @@ def assign(task_id):
             logger.warning(f"Task {task_id} assignment failed: missing user_id")
             return validation_error_response('Missing user_id')
 
-        result, status_code = TaskService.assign_task(task_id, user_id, assigner_id)
+        result, status_code = TaskService.assign_task(task_id, user_id, current_user)
 
         if status_code != 200 or 'error' in result:
             logger.warning(f"Task {task_id} assignment failed: {result.get('error', 'Unknown error')}")
             return error_response(result.get('error', 'Error assigning task'), status_code=status_code)
 
         # Fetch updated task details
-        task_result, task_status = TaskService.get_task_by_id(task_id, assigner_id)
+        task_result, task_status = TaskService.get_task_by_id(task_id, current_user)
         if task_status == 200:
             comments = TaskComment.query.filter_by(task_id=task_id).all()
             task_result['comments'] = [comment.to_dict() for comment in comments]
@@ -278,7 +347,7 @@ def add_comment(task_id):
             logger.warning(f"Comment addition failed for task {task_id}: empty comment text")
             return validation_error_response('Comment text is required')
 
-        result, status_code = TaskService.add_comment(task_id, user_id, comment_text)
+        result, status_code = TaskService.add_comment(task_id, current_user, comment_text)
 
         if status_code != 201 or 'error' in result:
             logger.warning(f"Comment addition failed for task {task_id}: {result.get('error', 'Unknown error')}")
@@ -304,7 +373,7 @@ def get_overdue_tasks():
     logger.debug(f"Fetching overdue tasks for user {user_id}")
     
     try:
-        result, status_code = TaskService.get_overdue_tasks(user_id)
+        result, status_code = TaskService.get_overdue_tasks(current_user)
         
         if status_code != 200:
             logger.warning(f"Overdue tasks fetch failed for user {user_id}: {result.get('error', 'Unknown error')}")
@@ -335,7 +404,7 @@ def get_user_time_logs():
         end_date = request.args.get('end_date')
         limit = request.args.get('limit', 50, type=int)
         
-        result, status_code = TaskService.get_user_time_logs(user_id, start_date, end_date, limit)
+        result, status_code = TaskService.get_user_time_logs(current_user, start_date, end_date, limit)
         
         if status_code != 200:
             logger.warning(f"Time logs fetch failed for user {user_id}: {result.get('error', 'Unknown error')}")
@@ -373,7 +442,7 @@ def log_time_for_task(task_id):
             logger.warning(f"Time logging failed for task {task_id}: invalid hours value")
             return validation_error_response('Valid hours (> 0) are required')
             
-        result, status_code = TaskService.log_time(task_id, user_id, hours, description, work_date)
+        result, status_code = TaskService.log_time(task_id, current_user, hours, description, work_date)
         
         if status_code != 201:
             logger.warning(f"Time logging failed for task {task_id}: {result.get('error', 'Unknown error')}")
@@ -401,7 +470,7 @@ def get_task_time_logs(task_id):
     logger.debug(f"Fetching time logs for task {task_id} by user {user_id}")
     
     try:
-        result, status_code = TaskService.get_task_time_logs(task_id, user_id)
+        result, status_code = TaskService.get_task_time_logs(task_id, current_user)
         
         if status_code != 200:
             logger.warning(f"Task time logs fetch failed for task {task_id}: {result.get('error', 'Unknown error')}")
@@ -448,6 +517,40 @@ def get_daily_time_summary():
         return server_error_response(f'Error fetching daily summary: {str(e)}')
     
 
+@task_bp.route('/time/report', methods=['GET'])
+@jwt_required()
+def get_time_report():
+    """Get a timesheet report grouped by day, week, project, task or user."""
+    user_id = get_jwt_identity()
+
+    # Log API request
+    log_api_request('/api/tasks/time/report', 'GET', user_id, request.remote_addr)
+    logger.debug(f"Building time report for user {user_id}")
+
+    try:
+        result, status_code = TaskService.get_time_report(
+            current_user,
+            group_by=request.args.get('group_by', 'day'),
+            start_date=request.args.get('start_date'),
+            end_date=request.args.get('end_date'),
+            project_id=request.args.get('project_id', type=int),
+            task_id=request.args.get('task_id', type=int),
+            page=request.args.get('page', 1, type=int),
+            per_page=request.args.get('per_page', 50, type=int)
+        )
+
+        if status_code != 200:
+            logger.warning(f"Time report failed for user {user_id}: {result.get('error', 'Unknown error')}")
+            return error_response(result.get('error', 'Error building time report'), status_code=status_code)
+
+        logger.debug(f"Time report for user {user_id}: {len(result['groups'])} groups by {result['group_by']}")
+        return success_response("Time report retrieved successfully", result)
+
+    except Exception as e:
+        logger.error(f"Time report error for user {user_id}: {str(e)}")
+        return server_error_response(f'Error building time report: {str(e)}')
+
+
 @task_bp.route('/test-response', methods=['GET'])
 def test_response():
     logger.debug("Testing response utilities")
@@ -7,18 +7,35 @@ from datetime import datetime, timedelta
 from sqlalchemy import func
 from app.utils.cache_utils import cache, cached_per_user, CacheKeys, invalidate_user_cache, invalidate_project_cache
 from app.utils.logger import get_logger, log_db_query
+from app.utils.db_routing import replica_reads
+from app.utils.fieldsets import Fieldset
+from app.utils.jwt_utils import resolve_user
 
 logger = get_logger('analytics')
 
+# Overdue listing rows: task columns plus the assignee's summary, nothing lazy
+OVERDUE_TASK = Fieldset(fields=['title', 'status', 'priority', 'due_date', 'project_id', 'assigned_to'])
+
 
 class AnalyticsService:
 
+    @staticmethod
+    @replica_reads
+    def get_tasks_version(user_id=None):
+        """Cheap version token for task-derived analytics, used for ETags."""
+        query = db.session.query(func.count(Task.id), func.max(Task.updated_at))
+        if user_id:
+            query = query.filter(Task.assigned_to_id == user_id)
+        count, latest = query.one()
+        return f"{count}:{latest.isoformat() if latest else ''}"
+
     @staticmethod
     @cached_per_user(timeout=300, key_prefix=CacheKeys.USER_ANALYTICS)
+    @replica_reads
     def get_user_performance(user_id):
         """Returns task completion statistics for a specific user."""
         try:
-            user = User.query.get_or_404(user_id)
+            user = resolve_user(user_id)
             total_tasks = Task.query.filter_by(assigned_to_id=user.id).count()
             completed_tasks = Task.query.filter_by(
                 assigned_to_id=user.id,
@@ -37,6 +54,7 @@ class AnalyticsService:
             return {'error': f'Error fetching user performance: {str(e)}'}, 500
 
     @staticmethod
+    @replica_reads
     def get_team_productivity():
         """Returns productivity stats for all users."""
         try:
@@ -55,21 +73,39 @@ class AnalyticsService:
             return {'error': f'Error fetching team productivity: {str(e)}'}, 500
 
     @staticmethod
-    def get_overdue_tasks():
-        """Retrieves all tasks that are overdue but not yet completed."""
+    @replica_reads
+    def get_overdue_tasks(page=1, per_page=50, fieldset=None):
+        """Retrieves one page of the tasks that are overdue but not yet completed.
+
+        Rows use ``fieldset`` (the compact ``OVERDUE_TASK`` by default), so only
+        the selected columns and relations are loaded.
+        """
         try:
-            tasks = Task.query.filter(
-                Task.due_date.isnot(None),
-                Task.due_date < datetime.utcnow(),
-                Task.status != TaskStatus.DONE.value
-            ).all()
-            logger.info(f"Fetched {len(tasks)} overdue tasks")
-            return [task.to_dict() for task in tasks]
+            page = max(page, 1)
+            per_page = min(max(per_page, 1), 200)
+            fieldset = fieldset or OVERDUE_TASK
+
+            query = Task.query.filter(*Task.overdue_criteria())
+            total = query.count()
+            tasks = query.order_by(Task.due_date.asc(), Task.id)\
+                .options(*fieldset.loader_options(Task))\
+                .offset((page - 1) * per_page).limit(per_page).all()
+            logger.info(f"Fetched {len(tasks)} of {total} overdue tasks (page {page})")
+            return {
+                'data': [fieldset.serialize(task) for task in tasks],
+                'total': total,
+                'page': page,
+                'per_page': per_page,
+                'total_pages': (total + per_page - 1) // per_page,
+                'has_next': page * per_page < total,
+                'has_prev': page > 1
+            }
         except Exception as e:
             logger.error(f"Error fetching overdue tasks: {str(e)}")
             return {'error': f'Error fetching overdue tasks: {str(e)}'}, 500
 
     @staticmethod
+    @replica_reads
     def get_task_completion_rate(user_id, time_period='month'):
         """Returns task completion rate for a specific time period."""
         try:
@@ -110,6 +146,7 @@ class AnalyticsService:
             return {'error': f'Error fetching task completion rate: {str(e)}'}, 500
 
     @staticmethod
+    @replica_reads
     def get_task_distribution_by_status():
         """Returns distribution of tasks by their status."""
         try:
@@ -122,6 +159,7 @@ class AnalyticsService:
             return {'error': f'Error fetching task distribution by status: {str(e)}'}, 500
 
     @staticmethod
+    @replica_reads
     def get_task_distribution_by_priority():
         """Returns distribution of tasks by their priority."""
         try:
@@ -4,13 +4,14 @@ from flask_jwt_extended import (
     create_access_token,
     create_refresh_token,
     jwt_required,
-    get_jwt_identity
+    current_user
 )
 from app import db
-from werkzeug.security import generate_password_hash
 from app.models.enums import UserRole
 from app.utils.cache_utils import cache, cached_per_user, CacheKeys, invalidate_user_cache, invalidate_project_cache
 from app.utils.logger import get_logger, log_db_query
+from app.utils.jwt_utils import resolve_user
+from app.utils.passwords import PasswordHashBusy
 
 logger = get_logger('auth')
 
@@ -26,13 +27,13 @@ class AuthService:
                 logger.warning(f"Attempt to register existing email: {email}")
                 return {"error": "User with this email already exists"}, 400
 
-            hashed_password = generate_password_hash(password)
             try:
                 user_role = UserRole[role.upper()]
             except KeyError:
                 return {"error": "Invalid role"}, 400
 
-            user = User(name=username, email=email, role=user_role, password_hash=hashed_password)
+            user = User(name=username, email=email, role=user_role)
+            user.set_password(password)
             db.session.add(user)
             db.session.commit()
             log_db_query("INSERT", "users")
@@ -43,6 +44,8 @@ class AuthService:
 
             return {"message": "User registered successfully", "user": user.to_dict()}, 201
 
+        except PasswordHashBusy as e:
+            return {"error": str(e)}, 503
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error registering user {email}: {str(e)}")
@@ -62,6 +65,11 @@ class AuthService:
                 logger.warning(f"Login attempt failed. Invalid password for user: {email}")
                 return {"success": False, "error": "Invalid credentials"}, 401
 
+            if user in db.session.dirty:
+                # check_password upgraded an outdated hash
+                db.session.commit()
+                log_db_query("UPDATE", "users")
+
             access_token = create_access_token(identity=str(user.id))
             refresh_token = create_refresh_token(identity=str(user.id))
 
@@ -73,7 +81,11 @@ class AuthService:
                 "user": user.to_dict()
             }
 
+        except PasswordHashBusy as e:
+            logger.warning(f"Login for {email} rejected: {str(e)}")
+            return {"success": False, "error": str(e)}, 503
         except Exception as e:
+            db.session.rollback()
             logger.error(f"Error logging in user {email}: {str(e)}")
             return {"error": f"Error logging in user: {str(e)}"}, 500
 
@@ -82,8 +94,7 @@ class AuthService:
     def validate_token():
         """Validates the JWT access token and returns the user details."""
         try:
-            current_user_id = get_jwt_identity()
-            user = User.query.get_or_404(current_user_id)
+            user = current_user
             logger.info(f"Token validated for user {user.id}")
             return user.to_dict()
         except Exception as e:
@@ -91,10 +102,11 @@ class AuthService:
             return {"error": f"Token validation failed: {str(e)}"}, 401
 
     @staticmethod
-    def change_password(user_id, new_password):
+    def change_password(user, new_password):
         """Changes the user's password."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
-            user = User.query.get_or_404(user_id)
             user.set_password(new_password)
             db.session.commit()
             log_db_query("UPDATE", "users")
@@ -114,8 +126,7 @@ class AuthService:
     def refresh_token():
         """Generates a new access token using a valid refresh token."""
         try:
-            current_user_id = get_jwt_identity()
-            user = User.query.get_or_404(current_user_id)
+            user = current_user
             logger.info(f"Access token refreshed for user {user.id}")
             return {
                 "access_token": create_access_token(identity=str(user.id)),
@@ -127,13 +138,14 @@ class AuthService:
 
     @staticmethod
     @jwt_required()
-    def update_profile(user_id, data):
+    def update_profile(user, data):
         """Updates the user's profile."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
-            user = User.query.get_or_404(user_id)
 
             if 'password' in data:
-                user.password_hash = generate_password_hash(data['password'])
+                user.set_password(data['password'])
 
             if 'email' in data:
                 user.email = data['email']
@@ -0,0 +1,195 @@
+# app/services/dashboard_service.py
+from app.models.notification import Notification
+from app.models.project import Project
+from app.models.task import Task
+from app.models.enums import TaskStatus
+from app import db
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from datetime import datetime, timedelta
+import os
+import threading
+from flask import current_app
+from sqlalchemy import func
+from app.utils.cache_utils import cache, CacheKeys, tag_versions, user_cache_key
+from app.utils.database import release_connection
+from app.utils.db_routing import replica_reads_context, use_replica
+from app.utils.fieldsets import Fieldset
+from app.utils.logger import get_logger, log_cache_operation
+from app.utils.jwt_utils import resolve_user
+
+logger = get_logger('dashboard')
+
+TASK_CARD = Fieldset(fields=['title', 'status', 'priority', 'due_date', 'project_id', 'assigned_to_id'])
+PROJECT_CARD = Fieldset(fields=['name', 'status', 'updated_at'])
+CLOSED_STATUSES = (TaskStatus.DONE, TaskStatus.CANCELLED)
+
+# One executor per process, shared by all requests: DASHBOARD_WORKERS bounds
+# the connections dashboards hold at once, however many are in flight
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(workers):
+    global _executor, _executor_pid
+    with _executor_lock:
+        # Threads don't survive fork (gunicorn --preload): each worker makes its own
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dashboard')
+            _executor_pid = os.getpid()
+        return _executor
+
+
+class DashboardService:
+    """Everything the dashboard shows, in one cached payload.
+
+    Sections are independent reads, so they run in parallel on a shared,
+    bounded executor (each in its own app context and session). The payload is cached per user under the
+    ``user_<id>`` and ``project_<id>`` cache tags, which commits touching
+    those rows bump (see ``app.utils.change_feed``).
+    """
+
+    @staticmethod
+    def get_permission_map(user):
+        """Project id -> the user's role and permissions there, owners included."""
+        permissions = {
+            membership.project_id: {
+                'role': membership.role,
+                'create_tasks': membership.can_create_tasks,
+                'edit_tasks': membership.can_edit_tasks,
+                'delete_tasks': membership.can_delete_tasks,
+                'manage_sprints': membership.can_manage_sprints,
+                'manage_members': membership.can_manage_members
+            }
+            for membership in user.project_memberships
+        }
+        owned = db.session.query(Project.id).filter(Project.owner_id == user.id)
+        for row in owned:
+            permissions[row.id] = {
+                'role': 'owner', 'create_tasks': True, 'edit_tasks': True, 'delete_tasks': True,
+                'manage_sprints': True, 'manage_members': True
+            }
+        return permissions
+
+    @staticmethod
+    def _my_tasks(user_id, project_ids, limit):
+        base = Task.query.filter(Task.assigned_to_id == user_id)
+        counts = base.with_entities(Task.status, func.count(Task.id)).group_by(Task.status).all()
+        upcoming = base.filter(Task.status.notin_(CLOSED_STATUSES))\
+            .order_by(Task.due_date.is_(None), Task.due_date.asc(), Task.id)\
+            .options(*TASK_CARD.loader_options(Task)).limit(limit).all()
+        return {
+            'status_counts': {status.value: count for status, count in counts},
+            'upcoming': [TASK_CARD.serialize(task) for task in upcoming]
+        }
+
+    @staticmethod
+    def _overdue(user_id, project_ids, limit):
+        query = Task.query.filter(
+            *Task.overdue_criteria(),
+            db.or_(Task.assigned_to_id == user_id, Task.created_by_id == user_id)
+        )
+        tasks = query.order_by(Task.due_date.asc()).options(*TASK_CARD.loader_options(Task)).limit(limit).all()
+        return {'count': query.count(), 'tasks': [TASK_CARD.serialize(task) for task in tasks]}
+
+    @staticmethod
+    def _notifications(user_id, project_ids, limit):
+        total, unread = db.session.query(
+            func.count(Notification.id),
+            func.count(Notification.id).filter(Notification.read == False)
+        ).filter(Notification.user_id == user_id).one()
+        type_counts = db.session.query(Notification.type, func.count(Notification.id))\
+            .filter(Notification.user_id == user_id, Notification.read == False)\
+            .group_by(Notification.type).all()
+        recent = Notification.query.filter_by(user_id=user_id)\
+            .order_by(Notification.created_at.desc()).limit(5).all()
+        return {
+            'unread_count': unread,
+            'total_notifications': total,
+            'type_summary': {notification_type.value: count for notification_type, count in type_counts},
+            'recent_notifications': [notification.to_dict() for notification in recent]
+        }
+
+    @staticmethod
+    def _analytics(user_id, project_ids, limit):
+        since = datetime.utcnow() - timedelta(days=30)
+        total, completed = db.session.query(
+            func.count(Task.id),
+            func.count(Task.id).filter(Task.status == TaskStatus.DONE)
+        ).filter(Task.assigned_to_id == user_id, Task.created_at >= since).one()
+        return {
+            'time_period': 'month',
+            'total_tasks': total,
+            'completed_tasks': completed,
+            'completion_rate': (completed / total) if total else 0
+        }
+
+    @staticmethod
+    def _recent_projects(user_id, project_ids, limit):
+        if not project_ids:
+            return []
+        projects = Project.query.filter(Project.id.in_(sorted(project_ids)))\
+            .order_by(Project.updated_at.desc())\
+            .options(*PROJECT_CARD.loader_options(Project)).limit(5).all()
+        return [PROJECT_CARD.serialize(project) for project in projects]
+
+    SECTIONS = ('my_tasks', 'overdue', 'notifications', 'analytics', 'recent_projects')
+
+    @staticmethod
+    def _run_section(app, name, user_id, project_ids, limit, replica):
+        with app.app_context(), (replica_reads_context() if replica else nullcontext()):
+            return getattr(DashboardService, f"_{name}")(user_id, project_ids, limit)
+
+    @staticmethod
+    def _build(user_id, project_ids, limit):
+        app = current_app._get_current_object()
+        # Decided here, where the request and the user's sticky-primary pin are known
+        replica = use_replica()
+        workers = app.config.get('DASHBOARD_WORKERS', 4)
+
+        if workers <= 1:
+            results = {name: DashboardService._run_section(app, name, user_id, project_ids, limit, replica)
+                       for name in DashboardService.SECTIONS}
+        else:
+            # Hand the request's connection back first, so waiting on the
+            # sections never holds one connection while they need others;
+            # the request session itself (current_user included) stays usable
+            release_connection(db.session())
+            pool = _get_executor(workers)
+            futures = {
+                name: pool.submit(DashboardService._run_section, app, name, user_id, project_ids, limit, replica)
+                for name in DashboardService.SECTIONS
+            }
+            results = {name: future.result() for name, future in futures.items()}
+        results['generated_at'] = datetime.utcnow().isoformat()
+        return results
+
+    @staticmethod
+    def get_dashboard(user, limit=None):
+        """Tasks, overdue tasks, notifications, analytics and recent projects for a user."""
+        user = resolve_user(user)
+        user_id = user.id
+        try:
+            limit = min(limit or current_app.config.get('DASHBOARD_TASK_LIMIT', 10), 50)
+            permissions = DashboardService.get_permission_map(user)
+            project_ids = set(permissions)
+
+            versions = tag_versions([f"user_{user_id}"] + [f"project_{project_id}" for project_id in project_ids])
+            cache_key = user_cache_key(CacheKeys.DASHBOARD_DATA, user_id=user_id, limit=limit, tags=versions) \
+                if versions else None
+
+            payload = cache.get(cache_key) if cache_key else None
+            log_cache_operation("GET", cache_key, hit=payload is not None)
+            if payload is None:
+                payload = DashboardService._build(user_id, project_ids, limit)
+                if cache_key:
+                    cache.set(cache_key, payload, timeout=current_app.config.get('DASHBOARD_CACHE_TTL', 60))
+                    log_cache_operation("SET", cache_key)
+
+            logger.info(f"Dashboard built for user {user_id} ({len(project_ids)} projects)")
+            return {**payload, 'permissions': {str(project_id): perms for project_id, perms in permissions.items()}}, 200
+
+        except Exception as e:
+            logger.error(f"Error building dashboard for user {user_id}: {str(e)}")
+            return {'error': f'Error building dashboard: {str(e)}'}, 500
@@ -12,6 +12,17 @@ logger = get_logger('notifications')
 
 class NotificationService:
 
+    @staticmethod
+    def get_notifications_version(user_id):
+        """Cheap version token for a user's notifications, used for ETags."""
+        count, latest_id, unread, latest_read = db.session.query(
+            func.count(Notification.id),
+            func.max(Notification.id),
+            func.count(Notification.id).filter(Notification.read == False),
+            func.max(Notification.read_at)
+        ).filter(Notification.user_id == user_id).one()
+        return f"{count}:{latest_id}:{unread}:{latest_read.isoformat() if latest_read else ''}"
+
     @staticmethod
     @cached_per_user(timeout=300, key_prefix=CacheKeys.USER_NOTIFICATIONS)
     def get_notification_summary(user_id):
@@ -50,13 +61,20 @@ class NotificationService:
 
     @staticmethod
     @cached_per_user(timeout=300, key_prefix=CacheKeys.USER_NOTIFICATIONS)
-    def get_user_notifications(user_id, unread_only=False):
+    def get_user_notifications(user_id, unread_only=False, fieldset=None):
         """Get all notifications for a user, optionally unread only."""
         try:
             query = Notification.query.filter_by(user_id=user_id)
             if unread_only:
                 query = query.filter_by(read=False)
-            notifications = query.order_by(Notification.created_at.desc()).all()
+            query = query.order_by(Notification.created_at.desc())
+
+            if fieldset:
+                notifications = query.options(*fieldset.loader_options(Notification)).all()
+                logger.info(f"Fetched {len(notifications)} notifications for user {user_id} ({fieldset})")
+                return [fieldset.serialize(n) for n in notifications]
+
+            notifications = query.all()
             logger.info(f"Fetched {len(notifications)} notifications for user {user_id}")
             return [n.to_dict() for n in notifications]
         except Exception as e:
@@ -0,0 +1,184 @@
+# app/services/overdue_service.py
+from app.models.notification import Notification
+from app.models.project import Project
+from app.models.task import Task
+from app.models.enums import NotificationType, TaskPriority, TaskStatus, TASK_PRIORITY_CONFIG
+from app import db
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import or_
+from app.utils.cache_utils import cache, invalidate_tags
+from app.utils.logger import get_logger
+
+logger = get_logger('tasks')
+
+CLOSED_STATUSES = (TaskStatus.DONE, TaskStatus.CANCELLED)
+SCAN_LOCK_KEY = "overdue_scan:lock"
+
+# Columns the scanner needs; rows, not entities, so flagging never bumps task versions
+SCAN_COLUMNS = (Task.id, Task.title, Task.priority, Task.due_date, Task.assigned_to_id, Task.created_by_id, Task.project_id)
+
+
+class OverdueService:
+    """Periodic scan that maintains ``Task.overdue_since`` / ``Task.escalated_at``.
+
+    Each pass:
+
+    1. clears the flags of tasks that were completed or rescheduled
+    2. flags unflagged open tasks whose due date passed (an indexed
+       ``due_date`` range) and notifies their assignee
+    3. escalates flagged tasks overdue by more than their priority's
+       ``escalation_hours`` and notifies the assignee and project owner
+
+    The flag columns are only the deduplication: a task is notified once per
+    due date (changing ``due_date`` re-arms it). Overdue listings use
+    ``Task.overdue_criteria`` and do not depend on the scanner having run.
+    Flags are written with bulk UPDATEs in batches, each committed with its
+    notifications. Migration 5f27c0b9e4a1 backfilled the flags of tasks
+    already overdue, so deploying does not notify the whole backlog.
+    """
+
+    @staticmethod
+    def escalation_hours():
+        return {TaskPriority[name]: config['escalation_hours'] for name, config in TASK_PRIORITY_CONFIG.items()}
+
+    @staticmethod
+    def _tags(rows):
+        tags = set()
+        for row in rows:
+            if row.project_id is not None:
+                tags.add(f"project_{row.project_id}")
+            tags |= {f"user_{user_id}" for user_id in (row.assigned_to_id, row.created_by_id) if user_id is not None}
+        return tags
+
+    @staticmethod
+    def _mark(ids, column, now):
+        # updated_at is kept: a flag is not an edit, and list ETags should not churn
+        return Task.query.filter(Task.id.in_(ids), column.is_(None))\
+            .update({column: now, Task.updated_at: Task.updated_at}, synchronize_session=False)
+
+    @staticmethod
+    def _notify(rows, escalate=False):
+        """One TASK_OVERDUE notification per recipient per task."""
+        owners = {}
+        if escalate:
+            project_ids = sorted({row.project_id for row in rows if row.project_id is not None})
+            if project_ids:
+                owners = dict(db.session.query(Project.id, Project.owner_id).filter(Project.id.in_(project_ids)).all())
+        hours = OverdueService.escalation_hours()
+
+        count = 0
+        for row in rows:
+            recipients = {row.assigned_to_id or row.created_by_id}
+            if escalate:
+                recipients.add(owners.get(row.project_id) or row.created_by_id)
+                title = f"Task escalated: {row.title}"
+                message = f"'{row.title}' ({row.priority.value}) is more than {hours[row.priority]} hours overdue"
+            else:
+                title = f"Task overdue: {row.title}"
+                message = f"'{row.title}' was due {row.due_date:%Y-%m-%d %H:%M} UTC"
+            for user_id in recipients - {None}:
+                db.session.add(Notification(
+                    user_id=user_id, task_id=row.id, type=NotificationType.TASK_OVERDUE,
+                    title=title[:200], message=message, project_id=row.project_id
+                ))
+                count += 1
+        return count
+
+    @staticmethod
+    def clear_resolved(now):
+        """Unflag tasks that were completed, cancelled or moved to a later due date."""
+        rows = Task.query.with_entities(*SCAN_COLUMNS).filter(
+            Task.overdue_since.isnot(None),
+            or_(Task.status.in_(CLOSED_STATUSES), Task.due_date.is_(None), Task.due_date >= now)
+        ).all()
+        if not rows:
+            return 0, set()
+        Task.query.filter(Task.id.in_([row.id for row in rows])).update(
+            {Task.overdue_since: None, Task.escalated_at: None, Task.updated_at: Task.updated_at},
+            synchronize_session=False
+        )
+        db.session.commit()
+        return len(rows), OverdueService._tags(rows)
+
+    @staticmethod
+    def flag_overdue(now, batch_size):
+        """Flag and notify tasks that became overdue; returns (tasks, notifications, tags)."""
+        flagged = notified = 0
+        tags = set()
+        while True:
+            rows = Task.query.with_entities(*SCAN_COLUMNS).filter(
+                Task.due_date < now,
+                Task.overdue_since.is_(None),
+                Task.status.notin_(CLOSED_STATUSES)
+            ).order_by(Task.due_date, Task.id).limit(batch_size).all()
+            if not rows:
+                break
+            OverdueService._mark([row.id for row in rows], Task.overdue_since, now)
+            notified += OverdueService._notify(rows)
+            db.session.commit()
+            flagged += len(rows)
+            tags |= OverdueService._tags(rows)
+        return flagged, notified, tags
+
+    @staticmethod
+    def escalate(now, batch_size):
+        """Escalate flagged tasks past their priority's escalation_hours; returns (tasks, notifications, tags)."""
+        escalated = notified = 0
+        tags = set()
+        for priority, hours in OverdueService.escalation_hours().items():
+            while True:
+                rows = Task.query.with_entities(*SCAN_COLUMNS).filter(
+                    Task.overdue_since.isnot(None),
+                    Task.escalated_at.is_(None),
+                    Task.priority == priority,
+                    Task.due_date < now - timedelta(hours=hours),
+                    Task.status.notin_(CLOSED_STATUSES)
+                ).order_by(Task.id).limit(batch_size).all()
+                if not rows:
+                    break
+                OverdueService._mark([row.id for row in rows], Task.escalated_at, now)
+                notified += OverdueService._notify(rows, escalate=True)
+                db.session.commit()
+                escalated += len(rows)
+                tags |= OverdueService._tags(rows)
+        return escalated, notified, tags
+
+    @staticmethod
+    def scan(now=None, batch_size=None):
+        """Run one scanner pass; returns counts, or None if another scanner holds the lock."""
+        now = now or datetime.utcnow()
+        batch_size = batch_size or current_app.config.get('OVERDUE_SCAN_BATCH_SIZE', 500)
+
+        try:
+            locked = cache.add(SCAN_LOCK_KEY, now.isoformat(), timeout=current_app.config.get('OVERDUE_SCAN_LOCK_TIMEOUT', 300))
+        except Exception as e:
+            logger.warning(f"Overdue scan lock unavailable, scanning anyway: {e}")
+            locked = True
+        if not locked:
+            logger.info("Overdue scan skipped: another scanner is running")
+            return None
+
+        try:
+            cleared, cleared_tags = OverdueService.clear_resolved(now)
+            flagged, overdue_notified, flagged_tags = OverdueService.flag_overdue(now, batch_size)
+            escalated, escalation_notified, escalated_tags = OverdueService.escalate(now, batch_size)
+            # Bulk UPDATEs bypass the session hooks that bump cache tags
+            invalidate_tags(*(cleared_tags | flagged_tags | escalated_tags))
+
+            result = {
+                'cleared': cleared,
+                'flagged': flagged,
+                'escalated': escalated,
+                'notifications': overdue_notified + escalation_notified
+            }
+            logger.info(f"Overdue scan: {result}")
+            return result
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            try:
+                cache.delete(SCAN_LOCK_KEY)
+            except Exception:
+                pass
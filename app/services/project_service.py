@@ -1,20 +1,72 @@
 # app/services/project_service.py
 from app.models.project import Project
-from app.models.user import User
+from app.models.project_member import ProjectMember
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.enums import TaskStatus, TaskPriority
 from app import db
+from flask import current_app
+from sqlalchemy import func, case, and_, or_
+from sqlalchemy.orm import joinedload
+import base64
 from app.utils.cache_utils import cache, cached_per_user, CacheKeys, invalidate_user_cache, invalidate_project_cache
 from app.utils.logger import get_logger, log_db_query
+from app.utils.jwt_utils import resolve_user
+from app.utils.socket_rooms import membership_changed
 
 logger = get_logger('projects')
 
+# Board card order within a column: most urgent first, then oldest first
+PRIORITY_RANK = case(*[(Task.priority == priority, rank) for rank, priority in enumerate(TaskPriority)])
+
+
+def encode_board_cursor(rank, task_id):
+    """Opaque cursor pointing just after a card: its priority rank and id."""
+    return base64.urlsafe_b64encode(f"{rank}:{task_id}".encode()).decode()
+
+
+def decode_board_cursor(cursor):
+    try:
+        rank, task_id = base64.urlsafe_b64decode(cursor.encode()).decode().split(':')
+        return int(rank), int(task_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError('Invalid cursor')
+
 
 class ProjectService:
 
     @staticmethod
-    def create_project(data, user_id):
+    def get_projects_version(project_id=None):
+        """Cheap version token for project payloads, used for ETags.
+
+        Covers the project rows plus the task, sprint and member counts that
+        ``Project.to_dict`` embeds.
+        """
+        def scoped(model, column):
+            query = db.session.query(func.count(model.id))
+            if project_id:
+                query = query.filter(column == project_id)
+            return query.scalar_subquery()
+
+        latest = db.session.query(func.max(Project.updated_at))
+        if project_id:
+            latest = latest.filter(Project.id == project_id)
+
+        row = db.session.query(
+            scoped(Project, Project.id),
+            latest.scalar_subquery(),
+            scoped(Task, Task.project_id),
+            scoped(Sprint, Sprint.project_id),
+            scoped(ProjectMember, ProjectMember.project_id)
+        ).one()
+        return ":".join(value.isoformat() if hasattr(value, 'isoformat') else str(value) for value in row)
+
+    @staticmethod
+    def create_project(data, owner):
         """Creates a new project."""
+        owner = resolve_user(owner)
+        user_id = owner.id
         try:
-            owner = User.query.get_or_404(user_id)
 
             project = Project(
                 name=data.get('name'),
@@ -30,6 +82,7 @@ class ProjectService:
 
             # Invalidate user's project cache
             invalidate_user_cache(user_id)
+            membership_changed(user_id, project.id, joined=True)
 
             return project.to_dict()
 
@@ -40,9 +93,14 @@ class ProjectService:
 
     @staticmethod
     @cached_per_user(timeout=300, key_prefix=CacheKeys.USER_PROJECTS)
-    def get_all_projects():
+    def get_all_projects(fieldset=None):
         """Gets all projects."""
         try:
+            if fieldset:
+                projects = Project.query.options(*fieldset.loader_options(Project)).all()
+                logger.info(f"Fetched all projects: {len(projects)} ({fieldset})")
+                return [fieldset.serialize(project) for project in projects]
+
             projects = Project.query.all()
             logger.info(f"Fetched all projects: {len(projects)}")
             return [project.to_dict() for project in projects]
@@ -52,9 +110,15 @@ class ProjectService:
 
     @staticmethod
     @cached_per_user(timeout=300, key_prefix=CacheKeys.USER_PROJECTS)
-    def get_project_by_id(project_id):
+    def get_project_by_id(project_id, fieldset=None):
         """Gets a specific project by ID."""
         try:
+            if fieldset:
+                project = Project.query.options(*fieldset.loader_options(Project))\
+                    .filter(Project.id == project_id).first_or_404()
+                logger.info(f"Fetched project {project_id} ({fieldset})")
+                return fieldset.serialize(project)
+
             project = Project.query.get_or_404(project_id)
             logger.info(f"Fetched project {project_id}")
             return project.to_dict()
@@ -90,6 +154,7 @@ class ProjectService:
         """Deletes a project."""
         try:
             project = Project.query.get_or_404(project_id)
+            user_ids = {project.owner_id} | {member.user_id for member in project.team_members}
             db.session.delete(project)
             db.session.commit()
             log_db_query("DELETE", "projects")
@@ -97,6 +162,8 @@ class ProjectService:
 
             # Invalidate project cache
             invalidate_project_cache(project_id)
+            for member_id in user_ids:
+                membership_changed(member_id, project_id, joined=False)
 
             return {'message': 'Project deleted successfully'}
         except Exception as e:
@@ -106,12 +173,118 @@ class ProjectService:
 
     @staticmethod
     @cached_per_user(timeout=300, key_prefix=CacheKeys.USER_PROJECTS)
-    def get_recent_projects():
+    def get_recent_projects(fieldset=None):
         """Gets the most recently updated projects."""
         try:
-            projects = Project.query.order_by(Project.updated_at.desc()).limit(5).all()
+            query = Project.query.order_by(Project.updated_at.desc()).limit(5)
+            if fieldset:
+                projects = query.options(*fieldset.loader_options(Project)).all()
+                logger.info(f"Fetched {len(projects)} recent projects ({fieldset})")
+                return [fieldset.serialize(project) for project in projects]
+
+            projects = query.all()
             logger.info(f"Fetched {len(projects)} recent projects")
             return [project.to_dict() for project in projects]
         except Exception as e:
             logger.error(f"Error fetching recent projects: {str(e)}")
             return {'error': f'Error fetching recent projects: {str(e)}'}, 500
+
+    @staticmethod
+    def get_project_board(project_id, user, limit=None, status=None, cursor=None, sprint_id=None, fieldset=None):
+        """Kanban board: the first ``limit`` cards of every status column.
+
+        All columns come from one query: ``ROW_NUMBER() OVER (PARTITION BY
+        status ...)`` numbers the cards in each column and only the top
+        ``limit + 1`` per column are returned, the extra row telling whether
+        the column has more. ``COUNT(*) OVER (PARTITION BY status)`` gives the
+        column totals. Pass ``status`` and a column's ``next_cursor`` to load
+        that column's next page (infinite scroll).
+        """
+        user = resolve_user(user)
+        user_id = user.id
+        try:
+            project = Project.query.get(project_id)
+            if not project:
+                return {'error': 'Project not found'}, 404
+            if not user.has_project_permission(project_id, 'create_tasks') and project.owner_id != user_id:
+                return {'error': 'Insufficient permissions to view this board'}, 403
+
+            limit = min(limit or current_app.config.get('BOARD_COLUMN_LIMIT', 20),
+                        current_app.config.get('BOARD_MAX_COLUMN_LIMIT', 100))
+            if limit < 1:
+                return {'error': 'limit must be at least 1'}, 400
+
+            if status:
+                try:
+                    columns = [TaskStatus[status.upper()]]
+                except KeyError:
+                    return {'error': 'Invalid status'}, 400
+            elif cursor:
+                return {'error': 'cursor requires a status column'}, 400
+            else:
+                columns = list(TaskStatus)
+
+            # Totals are counted over the whole column, before the cursor applies
+            scoped = db.session.query(
+                Task.id.label('id'),
+                Task.status.label('status'),
+                PRIORITY_RANK.label('rank'),
+                func.count().over(partition_by=Task.status).label('total')
+            ).filter(Task.project_id == project_id)
+            if sprint_id:
+                scoped = scoped.filter(Task.sprint_id == sprint_id)
+            if status:
+                scoped = scoped.filter(Task.status == columns[0])
+            scoped = scoped.subquery()
+
+            ranked = db.session.query(
+                scoped.c.id,
+                scoped.c.rank,
+                scoped.c.total,
+                func.row_number().over(partition_by=scoped.c.status, order_by=(scoped.c.rank, scoped.c.id)).label('position')
+            )
+            if cursor:
+                after_rank, after_id = decode_board_cursor(cursor)
+                ranked = ranked.filter(or_(
+                    scoped.c.rank > after_rank,
+                    and_(scoped.c.rank == after_rank, scoped.c.id > after_id)
+                ))
+            ranked = ranked.subquery()
+
+            loader_options = fieldset.loader_options(Task) if fieldset else [joinedload(Task.assignee)]
+            rows = db.session.query(Task, ranked.c.rank, ranked.c.total)\
+                .join(ranked, Task.id == ranked.c.id)\
+                .filter(ranked.c.position <= limit + 1)\
+                .options(*loader_options)\
+                .order_by(Task.status, ranked.c.position)\
+                .all()
+            log_db_query("SELECT", "task board")
+
+            grouped = {column: [] for column in columns}
+            totals = {}
+            for task, rank, total in rows:
+                grouped[task.status].append((task, rank))
+                totals[task.status] = total
+
+            board = []
+            for column in columns:
+                cards = grouped[column]
+                has_more = len(cards) > limit
+                cards = cards[:limit]
+                # A cursor past the last card leaves no row to read the total from
+                board.append({
+                    'status': column.value,
+                    'total': totals.get(column, 0 if not cursor else None),
+                    'tasks': [fieldset.serialize(task) if fieldset else task.to_tree_node() for task, _ in cards],
+                    'has_more': has_more,
+                    'next_cursor': encode_board_cursor(cards[-1][1], cards[-1][0].id) if has_more else None
+                })
+
+            logger.info(f"Board for project {project_id}: {len(rows)} cards in {len(columns)} columns")
+            return {'project_id': project_id, 'limit': limit, 'columns': board}, 200
+
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            logger.error(f"Error fetching board for project {project_id}: {str(e)}")
+            return {'error': f'Error fetching board: {str(e)}'}, 500
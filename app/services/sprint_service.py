@@ -2,13 +2,15 @@
 from app.models.sprint import Sprint
 from app.models.project import Project
 from app.models.task import Task
-from app.models.user import User
 from app.models.notification import Notification
 from app.models.enums import SprintStatus, NotificationType, TaskStatus
 from app import db
 from datetime import datetime
+from sqlalchemy.orm.exc import StaleDataError
 from app.utils.cache_utils import cache, cached_per_user, CacheKeys, invalidate_user_cache, invalidate_project_cache
 from app.utils.logger import get_logger, log_db_query
+from app.utils.metrics import record_notification_fanout
+from app.utils.jwt_utils import resolve_user
 
 logger = get_logger('sprints')
 
@@ -16,11 +18,12 @@ logger = get_logger('sprints')
 class SprintService:
 
     @staticmethod
-    def create_sprint(data, user_id):
+    def create_sprint(data, user):
         """Create a new sprint with notifications and caching."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
             project = Project.query.get_or_404(data.get('project_id'))
-            user = User.query.get_or_404(user_id)
 
             if not user.has_project_permission(project.id, 'manage_sprints') and project.owner_id != user_id:
                 logger.warning(f"User {user_id} tried to create sprint without permission for project {project.id}")
@@ -61,6 +64,7 @@ class SprintService:
                         project_id=project.id,
                         sprint_id=sprint.id
                     )
+            record_notification_fanout('sprint_created', sum(1 for member in team_members if member.id != user_id))
 
             invalidate_project_cache(project.id)
             return sprint.to_dict(), 201
@@ -72,9 +76,15 @@ class SprintService:
 
     @staticmethod
     @cached_per_user(timeout=300, key_prefix=CacheKeys.USER_SPRINTS)
-    def get_sprint_by_id(sprint_id, include_tasks=False):
-        """Get sprint by ID, optionally include tasks."""
+    def get_sprint_by_id(sprint_id, include_tasks=False, fieldset=None):
+        """Get sprint by ID, optionally include tasks or restrict to a sparse fieldset."""
         try:
+            if fieldset:
+                sprint = Sprint.query.options(*fieldset.loader_options(Sprint))\
+                    .filter(Sprint.id == sprint_id).first_or_404()
+                logger.info(f"Fetched sprint {sprint_id} ({fieldset})")
+                return fieldset.serialize(sprint), 200
+
             sprint = Sprint.query.get_or_404(sprint_id)
             logger.info(f"Fetched sprint {sprint_id}")
             return sprint.to_dict(include_tasks=include_tasks), 200
@@ -83,16 +93,25 @@ class SprintService:
             return {'error': f'Sprint not found: {str(e)}'}, 404
 
     @staticmethod
-    def update_sprint(sprint_id, data, user_id):
-        """Update sprint details with logging and notifications."""
+    def update_sprint(sprint_id, data, user, expected_version=None):
+        """Update sprint details with logging and notifications.
+
+        ``expected_version`` (If-Match) makes the update conditional; a stale
+        version gets 409 with the current sprint.
+        """
+        user = resolve_user(user)
+        user_id = user.id
         try:
             sprint = Sprint.query.get_or_404(sprint_id)
-            user = User.query.get_or_404(user_id)
 
             if not user.has_project_permission(sprint.project_id, 'manage_sprints') and sprint.project.owner_id != user_id:
                 logger.warning(f"User {user_id} tried to update sprint {sprint_id} without permission")
                 return {'error': 'Insufficient permissions to update sprint'}, 403
 
+            if expected_version is not None and sprint.version != expected_version:
+                logger.info(f"Sprint {sprint_id} update rejected: version {expected_version} is stale (now {sprint.version})")
+                return {'error': 'Sprint was modified by someone else', 'current': sprint.to_dict()}, 409
+
             # Update fields
             for field in ['name', 'description', 'goal', 'capacity_hours', 'velocity_points']:
                 if field in data:
@@ -104,7 +123,7 @@ class SprintService:
                     old_status = sprint.status
                     sprint.status = new_status
                     if old_status != new_status:
-                        SprintService._handle_status_change(sprint, old_status, new_status, user_id)
+                        SprintService._handle_status_change(sprint, old_status, new_status, user)
                 except KeyError:
                     return {'error': 'Invalid sprint status'}, 400
 
@@ -123,17 +142,25 @@ class SprintService:
             invalidate_project_cache(sprint.project_id)
             return sprint.to_dict(), 200
 
+        except StaleDataError:
+            db.session.rollback()
+            logger.info(f"Sprint {sprint_id} update lost a concurrent write race")
+            current = Sprint.query.get(sprint_id)
+            if not current:
+                return {'error': 'Sprint not found'}, 404
+            return {'error': 'Sprint was modified by someone else', 'current': current.to_dict()}, 409
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error updating sprint {sprint_id}: {str(e)}")
             return {'error': f'Error updating sprint: {str(e)}'}, 500
 
     @staticmethod
-    def delete_sprint(sprint_id, user_id):
+    def delete_sprint(sprint_id, user):
         """Delete a sprint, moving tasks back to backlog."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
             sprint = Sprint.query.get_or_404(sprint_id)
-            user = User.query.get_or_404(user_id)
 
             if not user.has_project_permission(sprint.project_id, 'manage_sprints') and sprint.project.owner_id != user_id:
                 logger.warning(f"User {user_id} tried to delete sprint {sprint_id} without permission")
@@ -158,11 +185,12 @@ class SprintService:
 
     @staticmethod
     @cached_per_user(timeout=300, key_prefix=CacheKeys.USER_SPRINTS)
-    def get_project_sprints(project_id, user_id):
+    def get_project_sprints(project_id, user):
         """Get all sprints for a project with caching."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
             project = Project.query.get_or_404(project_id)
-            user = User.query.get_or_404(user_id)
 
             if not user.has_project_permission(project_id, 'create_tasks') and project.owner_id != user_id:
                 return {'error': 'Insufficient permissions to view sprints'}, 403
@@ -176,11 +204,12 @@ class SprintService:
             return {'error': f'Error fetching sprints: {str(e)}'}, 500
 
     @staticmethod
-    def start_sprint(sprint_id, user_id):
+    def start_sprint(sprint_id, user):
         """Start a sprint and notify team members."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
             sprint = Sprint.query.get_or_404(sprint_id)
-            user = User.query.get_or_404(user_id)
 
             if not user.has_project_permission(sprint.project_id, 'manage_sprints') and sprint.project.owner_id != user_id:
                 return {'error': 'Insufficient permissions to start sprint'}, 403
@@ -209,6 +238,7 @@ class SprintService:
                         project_id=sprint.project_id,
                         sprint_id=sprint.id
                     )
+            record_notification_fanout('sprint_started', sum(1 for member in team_members if member.id != user_id))
 
             invalidate_project_cache(sprint.project_id)
             return sprint.to_dict(), 200
@@ -219,11 +249,12 @@ class SprintService:
             return {'error': f'Error starting sprint: {str(e)}'}, 500
 
     @staticmethod
-    def complete_sprint(sprint_id, user_id):
+    def complete_sprint(sprint_id, user):
         """Complete a sprint, move incomplete tasks back, notify team."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
             sprint = Sprint.query.get_or_404(sprint_id)
-            user = User.query.get_or_404(user_id)
 
             if not user.has_project_permission(sprint.project_id, 'manage_sprints') and sprint.project.owner_id != user_id:
                 return {'error': 'Insufficient permissions to complete sprint'}, 403
@@ -234,6 +265,7 @@ class SprintService:
             sprint.status = SprintStatus.COMPLETED
             incomplete_tasks = [task for task in sprint.tasks if task.status != TaskStatus.DONE]
             for task in incomplete_tasks:
+                Task.move_hours_rollup(task.actual_hours, old_sprint_id=sprint.id)
                 task.sprint_id = None
                 task.status = TaskStatus.BACKLOG
 
@@ -253,6 +285,7 @@ class SprintService:
                         project_id=sprint.project_id,
                         sprint_id=sprint.id
                     )
+            record_notification_fanout('sprint_completed', sum(1 for member in team_members if member.id != user_id))
 
             invalidate_project_cache(sprint.project_id)
             return sprint.to_dict(), 200
@@ -263,11 +296,12 @@ class SprintService:
             return {'error': f'Error completing sprint: {str(e)}'}, 500
 
     @staticmethod
-    def get_sprint_burndown(sprint_id, user_id):
+    def get_sprint_burndown(sprint_id, user):
         """Get burndown chart data with permission check."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
             sprint = Sprint.query.get_or_404(sprint_id)
-            user = User.query.get_or_404(user_id)
 
             if not user.has_project_permission(sprint.project_id, 'create_tasks') and sprint.project.owner_id != user_id:
                 return {'error': 'Insufficient permissions to view sprint data'}, 403
@@ -279,12 +313,13 @@ class SprintService:
             return {'error': f'Error fetching burndown data: {str(e)}'}, 500
 
     @staticmethod
-    def add_task_to_sprint(sprint_id, task_id, user_id):
+    def add_task_to_sprint(sprint_id, task_id, user):
         """Add a task to a sprint with status adjustment."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
             sprint = Sprint.query.get_or_404(sprint_id)
             task = Task.query.get_or_404(task_id)
-            user = User.query.get_or_404(user_id)
 
             if not user.has_project_permission(sprint.project_id, 'edit_tasks') and sprint.project.owner_id != user_id:
                 return {'error': 'Insufficient permissions to modify sprint tasks'}, 403
@@ -292,6 +327,7 @@ class SprintService:
             if task.project_id != sprint.project_id:
                 return {'error': 'Task must belong to the same project as the sprint'}, 400
 
+            Task.move_hours_rollup(task.actual_hours, old_sprint_id=task.sprint_id, new_sprint_id=sprint.id)
             task.sprint_id = sprint.id
             if task.status == TaskStatus.BACKLOG:
                 task.status = TaskStatus.TODO
@@ -307,16 +343,18 @@ class SprintService:
             return {'error': f'Error adding task to sprint: {str(e)}'}, 500
 
     @staticmethod
-    def remove_task_from_sprint(sprint_id, task_id, user_id):
+    def remove_task_from_sprint(sprint_id, task_id, user):
         """Remove a task from a sprint and move to backlog."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
             sprint = Sprint.query.get_or_404(sprint_id)
             task = Task.query.get_or_404(task_id)
-            user = User.query.get_or_404(user_id)
 
             if not user.has_project_permission(sprint.project_id, 'edit_tasks') and sprint.project.owner_id != user_id:
                 return {'error': 'Insufficient permissions to modify sprint tasks'}, 403
 
+            Task.move_hours_rollup(task.actual_hours, old_sprint_id=task.sprint_id)
             task.sprint_id = None
             task.status = TaskStatus.BACKLOG
 
@@ -331,10 +369,10 @@ class SprintService:
             return {'error': f'Error removing task from sprint: {str(e)}'}, 500
 
     @staticmethod
-    def _handle_status_change(sprint, old_status, new_status, user_id):
+    def _handle_status_change(sprint, old_status, new_status, user):
         """Handle sprint status change notifications with logging."""
+        user_id = user.id
         try:
-            user = User.query.get(user_id)
             team_members = sprint.project.get_team_members()
 
             status_messages = {
@@ -357,6 +395,7 @@ class SprintService:
                         project_id=sprint.project_id,
                         sprint_id=sprint.id
                     )
+            record_notification_fanout('sprint_status_changed', sum(1 for member in team_members if member.id != user_id))
 
             logger.info(f"Sprint {sprint.id} status changed from {old_status} to {new_status} by user {user_id}")
 
@@ -0,0 +1,132 @@
+# app/services/sync_service.py
+from app.models.change_log import ChangeLog
+from app.models.notification import Notification
+from app.models.project import Project
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.task_comment import TaskComment
+from app import db
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import func, or_
+from sqlalchemy.orm import selectinload
+from app.utils.logger import get_logger, log_db_query
+from app.utils.jwt_utils import resolve_user
+
+logger = get_logger('sync')
+
+# Response keys per entity type, in the order clients should apply them
+COLLECTIONS = {'task': 'tasks', 'comment': 'comments', 'sprint': 'sprints', 'notification': 'notifications'}
+
+
+class SyncService:
+
+    @staticmethod
+    def _visible_project_ids(user):
+        owned = db.session.query(Project.id).filter(Project.owner_id == user.id)
+        return {membership.project_id for membership in user.project_memberships} | {row.id for row in owned}
+
+    @staticmethod
+    def _load(entity_type, ids, user, project_ids):
+        """Current rows for changed ids, keeping only those this user may see."""
+        if entity_type == 'task':
+            rows = Task.query.filter(Task.id.in_(ids)).options(
+                selectinload(Task.assignee), selectinload(Task.creator), selectinload(Task.project),
+                selectinload(Task.sprint), selectinload(Task.comments), selectinload(Task.attachments),
+                selectinload(Task.time_logs)
+            ).all()
+            visible = lambda task: task.project_id in project_ids or user.id in (task.assigned_to_id, task.created_by_id)
+        elif entity_type == 'comment':
+            rows = TaskComment.query.filter(TaskComment.id.in_(ids))\
+                .options(selectinload(TaskComment.user), selectinload(TaskComment.task)).all()
+            visible = lambda comment: comment.task.project_id in project_ids or user.id in (comment.task.assigned_to_id, comment.task.created_by_id)
+        elif entity_type == 'sprint':
+            rows = Sprint.query.filter(Sprint.id.in_(ids))\
+                .options(selectinload(Sprint.project), selectinload(Sprint.tasks)).all()
+            visible = lambda sprint: sprint.project_id in project_ids
+        else:
+            rows = Notification.query.filter(Notification.id.in_(ids)).options(
+                selectinload(Notification.task), selectinload(Notification.related_user),
+                selectinload(Notification.project), selectinload(Notification.sprint)
+            ).all()
+            visible = lambda notification: notification.user_id == user.id
+        return {row.id: row for row in rows if visible(row)}
+
+    @staticmethod
+    def get_changes(user, since=None, limit=None):
+        """Tasks, comments, sprints and notifications changed after a sync token.
+
+        Without ``since`` only the current token is returned: clients take it
+        *before* their full download, then pass it back on reconnect. Each
+        entity appears once, in its current state or as a deleted id (also
+        used for rows the user can no longer see). Follow ``next_token``
+        while ``has_more`` is true. A token older than the retained log gets
+        410, meaning "do a full reload".
+        """
+        user = resolve_user(user)
+        user_id = user.id
+        try:
+            limit = min(limit or current_app.config.get('SYNC_PAGE_SIZE', 500),
+                        current_app.config.get('SYNC_MAX_PAGE_SIZE', 2000))
+
+            # Change log ids become visible in commit order (see
+            # app.utils.change_feed), so the highest id seen is a safe token
+            if since is None:
+                token = db.session.query(func.max(ChangeLog.id)).scalar() or 0
+                return {'changes': {}, 'deleted': {}, 'next_token': token, 'has_more': False}, 200
+
+            oldest = db.session.query(func.min(ChangeLog.id)).scalar()
+            if oldest is not None and since < oldest - 1:
+                logger.info(f"Sync token {since} for user {user_id} predates the change log ({oldest})")
+                return {'error': 'Sync token expired; reload everything and start from a new token'}, 410
+
+            project_ids = SyncService._visible_project_ids(user)
+            entries = ChangeLog.query.filter(
+                ChangeLog.id > since,
+                or_(ChangeLog.project_id.in_(sorted(project_ids)), ChangeLog.user_id == user_id)
+            ).order_by(ChangeLog.id).limit(limit + 1).all()
+            log_db_query("SELECT", "change_log")
+
+            has_more = len(entries) > limit
+            entries = entries[:limit]
+
+            # Later entries win: an entity created then deleted is just deleted
+            latest = {(entry.entity_type, entry.entity_id): entry.action for entry in entries}
+
+            changes, deleted = {}, {}
+            for entity_type, collection in COLLECTIONS.items():
+                ids = [entity_id for (kind, entity_id), action in latest.items() if kind == entity_type]
+                if not ids:
+                    continue
+                upserts = [entity_id for entity_id in ids if latest[(entity_type, entity_id)] == ChangeLog.UPSERT]
+                current = SyncService._load(entity_type, upserts, user, project_ids) if upserts else {}
+                if current:
+                    changes[collection] = [row.to_dict() for row in current.values()]
+                gone = [entity_id for entity_id in ids if entity_id not in current]
+                if gone:
+                    deleted[collection] = gone
+
+            next_token = entries[-1].id if entries else since
+            logger.debug(f"Sync for user {user_id}: {len(entries)} log entries after {since}, next {next_token}")
+            return {'changes': changes, 'deleted': deleted, 'next_token': next_token, 'has_more': has_more}, 200
+
+        except Exception as e:
+            logger.error(f"Error building sync for user {user_id}: {str(e)}")
+            return {'error': f'Error fetching changes: {str(e)}'}, 500
+
+    @staticmethod
+    def prune_change_log(days=None):
+        """Delete change log entries older than the retention period.
+
+        The newest entry is always kept so token expiry can still be detected.
+        """
+        days = days if days is not None else current_app.config.get('SYNC_RETENTION_DAYS', 30)
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        newest = db.session.query(func.max(ChangeLog.id)).scalar()
+        if newest is None:
+            return 0
+        count = ChangeLog.query.filter(ChangeLog.created_at < cutoff, ChangeLog.id < newest)\
+            .delete(synchronize_session=False)
+        db.session.commit()
+        logger.info(f"Pruned {count} change log entries older than {days} days")
+        return count
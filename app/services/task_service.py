@@ -8,9 +8,14 @@ from app.models.time_log import TimeLog
 from app import db
 from app.models.enums import TaskStatus, TaskPriority, TaskType, NotificationType
 from datetime import datetime
+from flask import current_app
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+from sqlalchemy.orm.exc import StaleDataError
 import json
 from app.utils.cache_utils import cache, cached_per_user, CacheKeys, invalidate_user_cache, invalidate_project_cache
 from app.utils.logger import get_logger, log_db_query, log_api_request
+from app.utils.jwt_utils import resolve_user
 
 # Initialize logger for this module
 logger = get_logger('tasks')
@@ -18,11 +23,11 @@ logger = get_logger('tasks')
 
 class TaskService:
     @staticmethod
-    def create_task(dto, user_id):
+    def create_task(dto, user):
         """Create a new task with enhanced IT features."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
-            user = User.query.get_or_404(user_id)
-
             project_id = dto.get('project_id')
             if project_id:
                 project = Project.query.get_or_404(project_id)
@@ -90,19 +95,31 @@ class TaskService:
             return {'error': f'Error creating task: {str(e)}'}, 500
 
     @staticmethod
-    def update_task(task_id, dto, user_id):
-        """Update task with enhanced features."""
+    def update_task(task_id, dto, user, expected_version=None):
+        """Update task with enhanced features.
+
+        With ``expected_version`` (the client's If-Match) the update only
+        applies if nobody changed the task since the client read it; otherwise
+        409 is returned with the current task.
+        """
+        user = resolve_user(user)
+        user_id = user.id
         try:
             logger.info(f"Updating task {task_id} by user {user_id}")
             task = Task.query.get_or_404(task_id)
-            user = User.query.get_or_404(user_id)
 
             if task.project_id:
                 if not user.has_project_permission(task.project_id, 'edit_tasks') and task.project.owner_id != user_id and task.created_by_id != user_id:
                     return {'error': 'Insufficient permissions to update this task'}, 403
 
+            if expected_version is not None and task.version != expected_version:
+                logger.info(f"Task {task_id} update rejected: version {expected_version} is stale (now {task.version})")
+                return {'error': 'Task was modified by someone else', 'current': task.to_dict()}, 409
+
             old_assignee_id = task.assigned_to_id
             old_status = task.status
+            old_sprint_id = task.sprint_id
+            old_project_id = task.project_id
 
             # Basic updates
             for field in ['title', 'description', 'acceptance_criteria']:
@@ -147,6 +164,12 @@ class TaskService:
                 labels = dto['labels']
                 task.labels = json.dumps(labels) if labels else None
 
+            Task.move_hours_rollup(
+                task.actual_hours,
+                old_sprint_id=old_sprint_id, new_sprint_id=task.sprint_id,
+                old_project_id=old_project_id, new_project_id=task.project_id
+            )
+
             db.session.commit()
             logger.info(f"Task updated successfully: {task.id} - status: {task.status.value}")
             log_db_query("UPDATE", "tasks")
@@ -158,25 +181,35 @@ class TaskService:
             if task.project_id:
                 invalidate_project_cache(task.project_id)
 
-            TaskService._handle_task_update_notifications(task, user_id, old_assignee_id, old_status)
+            TaskService._handle_task_update_notifications(task, user, old_assignee_id, old_status)
 
             return task.to_dict(), 200
 
+        except StaleDataError:
+            # Someone else's update committed between our read and write
+            db.session.rollback()
+            logger.info(f"Task {task_id} update lost a concurrent write race")
+            current = Task.query.get(task_id)
+            if not current:
+                return {'error': 'Task not found'}, 404
+            return {'error': 'Task was modified by someone else', 'current': current.to_dict()}, 409
         except Exception as e:
             db.session.rollback()
             return {'error': f'Error updating task: {str(e)}'}, 500
 
     @staticmethod
-    def delete_task(task_id, user_id):
+    def delete_task(task_id, user):
         """Delete a task."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
             task = Task.query.get_or_404(task_id)
-            user = User.query.get_or_404(user_id)
 
             if task.project_id:
                 if not user.has_project_permission(task.project_id, 'delete_tasks') and task.project.owner_id != user_id and task.created_by_id != user_id:
                     return {'error': 'Insufficient permissions to delete this task'}, 403
 
+            task.detach_hours_rollup()
             db.session.delete(task)
             db.session.commit()
             return {"message": "Task deleted successfully", "task_id": task_id}, 200
@@ -186,12 +219,13 @@ class TaskService:
             return {'error': f'Error deleting task: {str(e)}'}, 500
 
     @staticmethod
-    def assign_task(task_id, user_id, assigner_id):
+    def assign_task(task_id, user_id, assigner):
         """Assign a task to a user."""
+        assigner = resolve_user(assigner)
+        assigner_id = assigner.id
         try:
             task = Task.query.get_or_404(task_id)
             user = User.query.get_or_404(user_id)
-            assigner = User.query.get_or_404(assigner_id)
 
             if task.project_id:
                 if not assigner.has_project_permission(task.project_id, 'edit_tasks') and task.project.owner_id != assigner_id:
@@ -219,75 +253,147 @@ class TaskService:
             return {'error': f'Error assigning task: {str(e)}'}, 500
 
     @staticmethod
-    def get_task_by_id(task_id, user_id):
-        """Get task by ID with permission check."""
+    def get_task_by_id(task_id, user, fieldset=None):
+        """Get task by ID with permission check.
+
+        With a ``fieldset`` only the selected columns and relations are loaded
+        and returned.
+        """
+        user = resolve_user(user)
+        user_id = user.id
         try:
-            task = Task.query.get_or_404(task_id)
-            user = User.query.get_or_404(user_id)
+            if fieldset:
+                task = Task.query.options(*fieldset.loader_options(Task, extra_columns=('project_id',)))\
+                    .filter(Task.id == task_id).first_or_404()
+            else:
+                task = Task.query.get_or_404(task_id)
 
             if task.project_id:
                 if not user.has_project_permission(task.project_id, 'create_tasks') and task.project.owner_id != user_id:
                     return {'error': 'Insufficient permissions to view this task'}, 403
 
+            if fieldset:
+                return fieldset.serialize(task), 200
             return task.to_dict(include_subtasks=True), 200
 
         except Exception as e:
             return {'error': f'Error fetching task: {str(e)}'}, 500
 
     @staticmethod
-    def get_tasks_by_filters(user_id, filters=None):
-        """Get tasks with advanced filtering."""
+    def get_task_hierarchy(task_id, user, max_depth=None):
+        """Get a task's ancestor chain and its subtree with rolled-up totals."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
-            user = User.query.get_or_404(user_id)
-            query = Task.query
+            task = Task.query.get_or_404(task_id)
 
-            if filters:
-                if filters.get('project_id'):
-                    project_id = filters['project_id']
-                    project = Project.query.get_or_404(project_id)
-                    if not user.has_project_permission(project_id, 'create_tasks') and project.owner_id != user_id:
-                        return {'error': 'Insufficient permissions to view tasks in this project'}, 403
-                    query = query.filter(Task.project_id == project_id)
+            if task.project_id:
+                if not user.has_project_permission(task.project_id, 'create_tasks') and task.project.owner_id != user_id:
+                    return {'error': 'Insufficient permissions to view this task'}, 403
 
-                if filters.get('sprint_id'):
-                    query = query.filter(Task.sprint_id == filters['sprint_id'])
+            depth_limit = current_app.config.get('TASK_TREE_MAX_DEPTH', 10)
+            if max_depth is None or max_depth > depth_limit:
+                max_depth = depth_limit
+            if max_depth < 0:
+                return {'error': 'max_depth must be zero or greater'}, 400
 
-                if filters.get('assigned_to_id'):
-                    query = query.filter(Task.assigned_to_id == filters['assigned_to_id'])
+            rows = Task.get_subtree(task_id, max_depth=max_depth)
+            ancestors = Task.get_ancestors(task_id, max_depth=depth_limit)
+            tree = Task.build_tree(rows, task_id)
+            logger.info(f"Loaded hierarchy for task {task_id}: {len(rows)} nodes, {len(ancestors)} ancestors")
 
-                if filters.get('created_by_id'):
-                    query = query.filter(Task.created_by_id == filters['created_by_id'])
+            return {
+                'task_id': task_id,
+                'max_depth': max_depth,
+                'ancestors': [ancestor.to_tree_node() for ancestor in ancestors],
+                'tree': tree,
+                'total_nodes': len(rows)
+            }, 200
 
-                for field, enum_class in [('status', TaskStatus), ('priority', TaskPriority), ('task_type', TaskType)]:
-                    if filters.get(field):
-                        try:
-                            query = query.filter(getattr(Task, field) == enum_class[filters[field].upper()])
-                        except KeyError:
-                            return {'error': f'Invalid {field} filter'}, 400
+        except Exception as e:
+            logger.error(f"Error fetching hierarchy for task {task_id}: {str(e)}")
+            return {'error': f'Error fetching task hierarchy: {str(e)}'}, 500
+
+    @staticmethod
+    def _filtered_task_query(user_id, filters=None):
+        """Build the task listing query for the given filters (no permission checks)."""
+        query = Task.query
+
+        if filters:
+            if filters.get('project_id'):
+                query = query.filter(Task.project_id == filters['project_id'])
+
+            if filters.get('sprint_id'):
+                query = query.filter(Task.sprint_id == filters['sprint_id'])
+
+            if filters.get('assigned_to_id'):
+                query = query.filter(Task.assigned_to_id == filters['assigned_to_id'])
+
+            if filters.get('created_by_id'):
+                query = query.filter(Task.created_by_id == filters['created_by_id'])
+
+            for field, enum_class in [('status', TaskStatus), ('priority', TaskPriority), ('task_type', TaskType)]:
+                if filters.get(field):
+                    try:
+                        query = query.filter(getattr(Task, field) == enum_class[filters[field].upper()])
+                    except KeyError:
+                        raise ValueError(f'Invalid {field} filter')
 
-                if filters.get('overdue'):
-                    query = query.filter(Task.due_date < datetime.utcnow(), Task.status != TaskStatus.DONE)
+            if filters.get('overdue'):
+                query = query.filter(*Task.overdue_criteria())
 
-                if filters.get('parent_task_id'):
-                    query = query.filter(Task.parent_task_id == filters['parent_task_id'])
+            if filters.get('parent_task_id'):
+                query = query.filter(Task.parent_task_id == filters['parent_task_id'])
 
-            if not filters or not filters.get('project_id'):
-                query = query.filter(db.or_(Task.assigned_to_id == user_id, Task.created_by_id == user_id))
+        if not filters or not filters.get('project_id'):
+            query = query.filter(db.or_(Task.assigned_to_id == user_id, Task.created_by_id == user_id))
+
+        return query
+
+    @staticmethod
+    def get_tasks_version(user_id, filters=None):
+        """Cheap version token for a task listing: row count plus newest update."""
+        count, latest = TaskService._filtered_task_query(user_id, filters)\
+            .with_entities(func.count(Task.id), func.max(Task.updated_at))\
+            .one()
+        return f"{count}:{latest.isoformat() if latest else ''}"
+
+    @staticmethod
+    def get_tasks_by_filters(user, filters=None, fieldset=None):
+        """Get tasks with advanced filtering, optionally restricted to a sparse fieldset."""
+        user = resolve_user(user)
+        user_id = user.id
+        try:
+            if filters and filters.get('project_id'):
+                project_id = filters['project_id']
+                project = Project.query.get_or_404(project_id)
+                if not user.has_project_permission(project_id, 'create_tasks') and project.owner_id != user_id:
+                    return {'error': 'Insufficient permissions to view tasks in this project'}, 403
+
+            try:
+                query = TaskService._filtered_task_query(user_id, filters)
+            except ValueError as e:
+                return {'error': str(e)}, 400
 
             query = query.order_by(Task.priority.desc(), Task.due_date.asc())
-            tasks = query.all()
 
+            if fieldset:
+                tasks = query.options(*fieldset.loader_options(Task)).all()
+                return [fieldset.serialize(task) for task in tasks], 200
+
+            tasks = query.all()
             return [task.to_dict() for task in tasks], 200
 
         except Exception as e:
             return {'error': f'Error fetching tasks: {str(e)}'}, 500
 
     @staticmethod
-    def add_comment(task_id, user_id, comment_text):
+    def add_comment(task_id, user, comment_text):
         """Add a comment to a task."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
             task = Task.query.get_or_404(task_id)
-            user = User.query.get_or_404(user_id)
 
             if task.project_id:
                 if not user.has_project_permission(task.project_id, 'create_tasks') and task.project.owner_id != user_id:
@@ -326,11 +432,12 @@ class TaskService:
             return {"error": str(e)}, 500
 
     @staticmethod
-    def log_time(task_id, user_id, hours, description, work_date=None):
+    def log_time(task_id, user, hours, description, work_date=None):
         """Log time spent on a task."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
             task = Task.query.get_or_404(task_id)
-            user = User.query.get_or_404(user_id)
 
             if task.project_id:
                 if not user.has_project_permission(task.project_id, 'create_tasks') and task.project.owner_id != user_id:
@@ -341,7 +448,9 @@ class TaskService:
             time_log.validate_hours()
 
             db.session.add(time_log)
-            task.actual_hours = (task.actual_hours or 0) + hours
+            # Atomic in-database increments; a read-modify-write here loses updates
+            # when people log time on the same task (or its subtasks) concurrently.
+            Task.add_logged_hours(task_id, hours)
             db.session.commit()
 
             return time_log.to_dict(), 201
@@ -353,30 +462,34 @@ class TaskService:
             return {'error': f'Error logging time: {str(e)}'}, 500
 
     @staticmethod
-    def get_task_time_logs(task_id, user_id):
+    def get_task_time_logs(task_id, user):
         """Get time logs for a task."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
             task = Task.query.get_or_404(task_id)
-            user = User.query.get_or_404(user_id)
 
             if task.project_id:
                 if not user.has_project_permission(task.project_id, 'create_tasks') and task.project.owner_id != user_id:
                     return {'error': 'Insufficient permissions to view time logs for this task'}, 403
 
-            time_logs = TimeLog.query.filter_by(task_id=task_id).order_by(TimeLog.work_date.desc()).all()
+            time_logs = TimeLog.query.filter_by(task_id=task_id)\
+                .options(joinedload(TimeLog.task), joinedload(TimeLog.user))\
+                .order_by(TimeLog.work_date.desc())\
+                .all()
             return [log.to_dict() for log in time_logs], 200
 
         except Exception as e:
             return {'error': f'Error fetching time logs: {str(e)}'}, 500
 
     @staticmethod
-    def get_overdue_tasks(user_id):
+    def get_overdue_tasks(user):
         """Get overdue tasks for a user."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
-            user = User.query.get_or_404(user_id)
             overdue_tasks = Task.query.filter(
-                Task.due_date < datetime.utcnow(),
-                Task.status != TaskStatus.DONE,
+                *Task.overdue_criteria(),
                 db.or_(Task.assigned_to_id == user_id, Task.created_by_id == user_id)
             ).order_by(Task.due_date.asc()).all()
             return [task.to_dict() for task in overdue_tasks], 200
@@ -385,9 +498,9 @@ class TaskService:
             return {'error': f'Error fetching overdue tasks: {str(e)}'}, 500
 
     @staticmethod
-    def _handle_task_update_notifications(task, user_id, old_assignee_id, old_status):
+    def _handle_task_update_notifications(task, user, old_assignee_id, old_status):
         """Handle notifications for task updates."""
-        user = User.query.get(user_id)
+        user_id = user.id
 
         if task.assigned_to_id != old_assignee_id and task.assigned_to_id != user_id:
             Notification.create_notification(
@@ -426,41 +539,111 @@ class TaskService:
                 )
 
     @staticmethod
-    def get_user_time_logs(user_id, start_date=None, end_date=None, limit=50):
+    def get_user_time_logs(user, start_date=None, end_date=None, limit=50):
         """Get time logs for a user with optional date filtering."""
+        user = resolve_user(user)
+        user_id = user.id
         try:
-            user = User.query.get_or_404(user_id)
             query = TimeLog.query.filter_by(user_id=user_id)
 
             if start_date:
                 try:
-                    query = query.filter(TimeLog.work_date >= datetime.fromisoformat(start_date).date())
+                    start_date = datetime.fromisoformat(start_date).date()
                 except ValueError:
                     return {'error': 'Invalid start_date format. Use YYYY-MM-DD'}, 400
+                query = query.filter(TimeLog.work_date >= start_date)
             if end_date:
                 try:
-                    query = query.filter(TimeLog.work_date <= datetime.fromisoformat(end_date).date())
+                    end_date = datetime.fromisoformat(end_date).date()
                 except ValueError:
                     return {'error': 'Invalid end_date format. Use YYYY-MM-DD'}, 400
+                query = query.filter(TimeLog.work_date <= end_date)
+
+            time_logs = query.options(joinedload(TimeLog.task), joinedload(TimeLog.user))\
+                .order_by(TimeLog.work_date.desc(), TimeLog.logged_at.desc())\
+                .limit(limit)\
+                .all()
+            serialized_logs = [log.to_dict() for log in time_logs]
+
+            # Totals cover the whole date range and are aggregated in SQL; each
+            # day references its returned logs by id instead of re-serializing them.
+            daily_totals, _, total_hours = TimeLog.get_report(
+                'day', user_id=user_id, start_date=start_date, end_date=end_date, per_page=limit
+            )
+            log_ids_by_date = {}
+            for log in serialized_logs:
+                log_ids_by_date.setdefault(log['work_date'], []).append(log['id'])
 
-            time_logs = query.order_by(TimeLog.work_date.desc(), TimeLog.logged_at.desc()).limit(limit).all()
-            total_hours = sum(log.hours for log in time_logs)
-
-            daily_breakdown = {}
-            for log in time_logs:
-                date_str = log.work_date.isoformat()
-                if date_str not in daily_breakdown:
-                    daily_breakdown[date_str] = {'date': date_str, 'total_hours': 0, 'logs': []}
-                daily_breakdown[date_str]['total_hours'] += log.hours
-                daily_breakdown[date_str]['logs'].append(log.to_dict())
+            daily_breakdown = [{
+                'date': day['key'],
+                'total_hours': day['total_hours'],
+                'entries': day['entries'],
+                'log_ids': log_ids_by_date.get(day['key'], [])
+            } for day in daily_totals]
 
             return {
-                'time_logs': [log.to_dict() for log in time_logs],
+                'time_logs': serialized_logs,
                 'total_hours': total_hours,
-                'total_entries': len(time_logs),
-                'daily_breakdown': list(daily_breakdown.values()),
+                'total_entries': len(serialized_logs),
+                'daily_breakdown': daily_breakdown,
                 'user': user.to_dict()
             }, 200
 
         except Exception as e:
             return {'error': f'Error fetching user time logs: {str(e)}'}, 500
+
+    @staticmethod
+    def get_time_report(user, group_by='day', start_date=None, end_date=None, project_id=None,
+                        task_id=None, page=1, per_page=50):
+        """Get an SQL-aggregated timesheet report.
+
+        Without a project the report covers the caller's own logs; with a project
+        it covers every member's logs on that project's tasks.
+        """
+        user = resolve_user(user)
+        user_id = user.id
+        try:
+            if project_id:
+                project = Project.query.get_or_404(project_id)
+                if not user.has_project_permission(project_id, 'create_tasks') and project.owner_id != user.id:
+                    return {'error': 'Insufficient permissions to view time logs for this project'}, 403
+
+            try:
+                start_date = datetime.fromisoformat(start_date).date() if start_date else None
+                end_date = datetime.fromisoformat(end_date).date() if end_date else None
+            except ValueError:
+                return {'error': 'Invalid date format. Use YYYY-MM-DD'}, 400
+
+            page = max(page, 1)
+            per_page = min(max(per_page, 1), 200)
+
+            groups, total_groups, total_hours = TimeLog.get_report(
+                group_by,
+                user_id=None if project_id else user.id,
+                project_id=project_id,
+                task_id=task_id,
+                start_date=start_date,
+                end_date=end_date,
+                page=page,
+                per_page=per_page
+            )
+
+            return {
+                'group_by': group_by,
+                'start_date': start_date.isoformat() if start_date else None,
+                'end_date': end_date.isoformat() if end_date else None,
+                'groups': groups,
+                'total_hours': total_hours,
+                'total': total_groups,
+                'page': page,
+                'per_page': per_page,
+                'total_pages': (total_groups + per_page - 1) // per_page,
+                'has_next': page * per_page < total_groups,
+                'has_prev': page > 1
+            }, 200
+
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        except Exception as e:
+            logger.error(f"Error building time report for user {user_id}: {str(e)}")
+            return {'error': f'Error building time report: {str(e)}'}, 500
@@ -50,16 +50,18 @@ def get_api_info():
         "tasks": {
             "prefix": "/api/tasks",
             "endpoints": [
-                "GET /api/tasks - Get tasks with filters",
+                "GET /api/tasks - Get tasks with filters (supports fields= / include= sparse fieldsets)",
                 "POST /api/tasks - Create new task",
                 "GET /api/tasks/overdue - Get overdue tasks",
                 "GET /api/tasks/{id} - Get task by ID",
+                "GET /api/tasks/{id}/hierarchy - Get ancestor chain and subtask tree",
                 "PUT /api/tasks/{id} - Update task",
                 "DELETE /api/tasks/{id} - Delete task",
                 "POST /api/tasks/{id}/assign - Assign task to user",
                 "POST /api/tasks/{id}/comments - Add comment to task",
                 "POST /api/tasks/{id}/time - Log time on task",
-                "GET /api/tasks/{id}/time - Get time logs for task"
+                "GET /api/tasks/{id}/time - Get time logs for task",
+                "GET /api/tasks/time/report - Timesheet report grouped by day/week/project/task/user"
             ]
         },
         "projects": {
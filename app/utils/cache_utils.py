@@ -7,6 +7,13 @@ from flask_jwt_extended import get_jwt_identity
 import json
 import hashlib
 import os
+import uuid
+
+from app.utils.etag import versioned_key
+from app.utils.metrics import record_cache_lookup
+from app.utils.logger import get_logger
+
+logger = get_logger('cache')
 
 # Initialize cache (will be configured in __init__.py)
 cache = Cache()
@@ -53,10 +60,11 @@ def cached_per_user(timeout=300, key_prefix=""):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            cache_key = user_cache_key(key_prefix or f.__name__, **kwargs)
+            cache_key = versioned_key(user_cache_key(key_prefix or f.__name__, **kwargs))
             
             # Try to get from cache
             cached_result = cache.get(cache_key)
+            record_cache_lookup(key_prefix or f.__name__, cached_result is not None)
             if cached_result is not None:
                 try:
                     return json.loads(cached_result)
@@ -101,6 +109,32 @@ def invalidate_project_cache(project_id):
     except Exception as e:
         print(f"⚠️ Cache invalidation failed: {e}")
 
+# Tag-based invalidation: a cached value's key embeds the current version of
+# each tag it depends on, so bumping a tag orphans every such value at once
+# (they expire on their own) without scanning keys
+def _tag_key(tag):
+    return f"cache_tag:{tag}"
+
+def tag_versions(tags):
+    """Stable fingerprint of the current versions of ``tags``, for cache keys."""
+    tags = sorted(tags)
+    try:
+        versions = cache.get_many(*[_tag_key(tag) for tag in tags]) if tags else []
+    except Exception as e:
+        logger.warning("⚠️ Cache tag lookup failed: %s", e)
+        return None
+    return hashlib.md5("|".join(f"{tag}={version or 0}" for tag, version in zip(tags, versions)).encode()).hexdigest()
+
+def invalidate_tags(*tags):
+    """Bump the version of each tag, invalidating values cached under it."""
+    if not tags:
+        return
+    try:
+        version = uuid.uuid4().hex
+        cache.set_many({_tag_key(tag): version for tag in tags}, timeout=0)
+    except Exception as e:
+        logger.warning("⚠️ Cache tag invalidation failed: %s", e)
+
 # Common cache patterns
 class CacheKeys:
     USER_TASKS = "user_tasks"
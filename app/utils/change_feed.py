@@ -0,0 +1,182 @@
+"""
+Change tracking for the incremental sync feed (``/api/sync``)
+
+Every flush that creates, updates or deletes a task, comment, sprint or
+notification records ``change_log`` rows, which are inserted as the
+transaction commits, so the feed never misses a committed write and never
+reports a rolled-back one, whichever service made it. The insert is the
+last statement before COMMIT and, on PostgreSQL, holds a transaction-level
+advisory lock: change log ids become visible in id order, so a sync token
+(the highest id a client saw) can never skip a transaction that flushed
+earlier but committed later. New or deleted time logs mark their task as
+changed, since logging time updates the task's hours with bulk UPDATEs the
+ORM does not track.
+
+Each row carries its audience: the task's or sprint's project, or a single
+user for notifications and tasks outside any project. When a task moves
+between projects or assignees, both the old and new audience get a row, so
+whoever lost access learns to drop it.
+
+The same hooks bump the ``user_<id>`` and ``project_<id>`` cache tags a
+commit touched (see ``invalidate_tags``), after the commit so a concurrent
+reader cannot cache the old rows under the new version.
+"""
+from itertools import chain
+
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import Session
+
+from app.models.change_log import ChangeLog
+from app.models.notification import Notification
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.task_comment import TaskComment
+from app.models.time_log import TimeLog
+from app.utils.cache_utils import invalidate_tags
+from app.utils.logger import get_logger
+
+logger = get_logger('db')
+
+ENTITY_TYPES = {Task: 'task', TaskComment: 'comment', Sprint: 'sprint', Notification: 'notification'}
+
+# pg_advisory_xact_lock key serializing change log inserts with their commits
+CHANGE_LOG_LOCK_KEY = 0x73796e63
+
+_session_events_registered = False
+
+
+def _states(obj, attr):
+    """Every value an attribute had in this flush: before and after."""
+    history = inspect(obj).attrs[attr].history
+    return set(chain(history.added, history.unchanged, history.deleted))
+
+
+def _task_audience(task):
+    projects = _states(task, 'project_id')
+    audience = {(project_id, None) for project_id in projects if project_id is not None}
+    if None in projects:
+        users = _states(task, 'assigned_to_id') | _states(task, 'created_by_id')
+        audience |= {(None, user_id) for user_id in users if user_id is not None}
+    return audience
+
+
+def _audience(session, obj):
+    if isinstance(obj, Task):
+        return _task_audience(obj)
+    if isinstance(obj, TaskComment):
+        task = session.get(Task, obj.task_id)
+        return _task_audience(task) if task is not None else set()
+    if isinstance(obj, Sprint):
+        return {(project_id, None) for project_id in _states(obj, 'project_id') if project_id is not None}
+    if isinstance(obj, Notification):
+        return {(None, user_id) for user_id in _states(obj, 'user_id') if user_id is not None}
+    return set()
+
+
+def _record_changes(session, flush_context):
+    """after_flush hook: entity ids are assigned and the pre-flush history is still readable."""
+    changed = chain(
+        ((obj, ChangeLog.UPSERT) for obj in session.new),
+        ((obj, ChangeLog.UPSERT) for obj in session.dirty if session.is_modified(obj)),
+        ((obj, ChangeLog.DELETE) for obj in session.deleted),
+    )
+
+    rows = set()
+    with session.no_autoflush:
+        for obj, action in changed:
+            if isinstance(obj, TimeLog):
+                obj, action = session.get(Task, obj.task_id), ChangeLog.UPSERT
+            entity_type = ENTITY_TYPES.get(type(obj))
+            if entity_type is None or obj is None:
+                continue
+            for project_id, user_id in _audience(session, obj):
+                rows.add((entity_type, obj.id, action, project_id, user_id))
+
+    if rows:
+        session.info.setdefault('change_rows', []).extend(rows)
+
+
+def _write_changes(session):
+    """before_commit hook: insert the transaction's change rows just before COMMIT."""
+    if session.in_nested_transaction():
+        return
+    # Commit would flush these after this hook; flush now so their rows are written
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    rows = session.info.pop('change_rows', None)
+    if not rows:
+        return
+
+    connection = session.connection()
+    if connection.dialect.name == 'postgresql':
+        # Held until COMMIT ends: no later id can be seen before this one
+        connection.execute(text('SELECT pg_advisory_xact_lock(:key)'), {'key': CHANGE_LOG_LOCK_KEY})
+    # Flush order is kept, so a later delete still outranks an earlier upsert
+    connection.execute(ChangeLog.__table__.insert(), [
+        {'entity_type': entity_type, 'entity_id': entity_id, 'action': action,
+         'project_id': project_id, 'user_id': user_id}
+        for entity_type, entity_id, action, project_id, user_id in dict.fromkeys(rows)
+    ])
+
+
+def _discard_changes(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop('change_rows', None)
+
+
+def _cache_tags(obj):
+    if isinstance(obj, Task):
+        users = _states(obj, 'assigned_to_id') | _states(obj, 'created_by_id')
+        return {f"project_{project_id}" for project_id in _states(obj, 'project_id') if project_id is not None} | \
+            {f"user_{user_id}" for user_id in users if user_id is not None}
+    if isinstance(obj, Notification):
+        return {f"user_{user_id}" for user_id in _states(obj, 'user_id') if user_id is not None}
+    if isinstance(obj, Project):
+        return {f"project_{obj.id}"}
+    if isinstance(obj, ProjectMember):
+        return {f"user_{user_id}" for user_id in _states(obj, 'user_id') if user_id is not None} | \
+            {f"project_{project_id}" for project_id in _states(obj, 'project_id') if project_id is not None}
+    return set()
+
+
+def _collect_cache_tags(session, flush_context):
+    tags = session.info.setdefault('cache_tags', set())
+    with session.no_autoflush:
+        for obj in chain(session.new, session.dirty, session.deleted):
+            tags |= _cache_tags(obj)
+
+
+def has_uncommitted_writes(session):
+    """True if the session's transaction has changes pending or flushed but not committed."""
+    # after_flush leaves cache_tags in session.info until the commit or rollback
+    return bool(session.new or session.dirty or session.deleted) or 'cache_tags' in session.info
+
+
+def _invalidate_cache_tags(session):
+    tags = session.info.pop('cache_tags', None)
+    if tags:
+        invalidate_tags(*tags)
+
+
+def _discard_cache_tags(session, previous_transaction):
+    if previous_transaction.parent is None:
+        session.info.pop('cache_tags', None)
+
+
+def init_change_feed(app):
+    """Start recording changes for ``/api/sync`` and invalidating cache tags."""
+    global _session_events_registered
+
+    if _session_events_registered:
+        return
+    event.listen(Session, 'after_flush', _collect_cache_tags)
+    event.listen(Session, 'after_commit', _invalidate_cache_tags)
+    event.listen(Session, 'after_soft_rollback', _discard_cache_tags)
+    if app.config.get('SYNC_ENABLED', True):
+        event.listen(Session, 'after_flush', _record_changes)
+        event.listen(Session, 'before_commit', _write_changes)
+        event.listen(Session, 'after_soft_rollback', _discard_changes)
+        app.logger.info("✅ Change feed tracking enabled")
+    _session_events_registered = True
@@ -0,0 +1,72 @@
+"""
+Negotiated gzip/brotli compression for API responses
+"""
+import gzip
+
+from flask import request
+
+from app.utils.etag import ENCODING_SUFFIXES
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+def _negotiate_encoding(algorithms):
+    """Pick the first configured algorithm the client accepts."""
+    accept_encodings = request.accept_encodings
+    for algorithm in algorithms:
+        if algorithm == 'br' and brotli is None:
+            continue
+        if accept_encodings.quality(algorithm) > 0:
+            return algorithm
+    return None
+
+
+def _compress(data, algorithm, config):
+    if algorithm == 'br':
+        return brotli.compress(data, quality=config.get('COMPRESS_BR_LEVEL', 4))
+    return gzip.compress(data, compresslevel=config.get('COMPRESS_LEVEL', 6), mtime=0)
+
+
+def compress_response(response, config):
+    """Compress eligible responses above ``COMPRESS_MIN_SIZE`` bytes."""
+    if not config.get('COMPRESS_ENABLED', True):
+        return response
+    if response.direct_passthrough or response.is_streamed:
+        return response
+    if not 200 <= response.status_code < 300 or response.status_code == 204:
+        return response
+    if 'Content-Encoding' in response.headers:
+        return response
+    if response.mimetype not in config.get('COMPRESS_MIMETYPES', ('application/json',)):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    data = response.get_data()
+    if len(data) < config.get('COMPRESS_MIN_SIZE', 1024):
+        return response
+
+    algorithm = _negotiate_encoding(config.get('COMPRESS_ALGORITHMS', ('br', 'gzip')))
+    if algorithm is None:
+        return response
+
+    response.set_data(_compress(data, algorithm, config))
+    response.headers['Content-Encoding'] = algorithm
+
+    # Each encoding is a different representation, so give it its own strong ETag
+    etag, weak = response.get_etag()
+    if etag and algorithm in ENCODING_SUFFIXES:
+        response.set_etag(f"{etag}-{algorithm}", weak)
+
+    return response
+
+
+def init_compression(app):
+    """Register the compression hook on the app."""
+    @app.after_request
+    def compress(response):
+        return compress_response(response, app.config)
+    return app
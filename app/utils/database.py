@@ -1,4 +1,7 @@
 # app/utils/database.py
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool
+
 from app import db
 
 def init_database():
@@ -7,12 +10,65 @@ def init_database():
 
 def test_connection():
     try:
-        # Change this line:
-        db.session.execute("SELECT 1")
-        # To this:
-        from sqlalchemy import text
         db.session.execute(text("SELECT 1"))
         return True
     except Exception as e:
         print(f"Database connection failed: {e}")
-        return False
\ No newline at end of file
+        return False
+
+def build_engine_options(config):
+    """Build SQLALCHEMY_ENGINE_OPTIONS from the DB_POOL_* settings.
+
+    Options set explicitly in SQLALCHEMY_ENGINE_OPTIONS win. With DB_PGBOUNCER
+    on, SQLAlchemy keeps no pool of its own (PgBouncer is the pool) and
+    server-side prepared statements are disabled, since they do not survive
+    transaction pooling.
+    """
+    uri = config.get('SQLALCHEMY_DATABASE_URI') or ''
+    options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+
+    if config.get('DB_PGBOUNCER'):
+        options.setdefault('poolclass', NullPool)
+        if uri.startswith('postgresql+psycopg:'):
+            # psycopg 3 prepares repeated statements by default; psycopg2 never does
+            connect_args = dict(options.get('connect_args') or {})
+            connect_args.setdefault('prepare_threshold', None)
+            options['connect_args'] = connect_args
+        return options
+
+    if uri.startswith('sqlite'):
+        # SQLite pools are chosen by Flask-SQLAlchemy/SQLAlchemy
+        return options
+
+    options.setdefault('pool_size', config.get('DB_POOL_SIZE', 5))
+    options.setdefault('max_overflow', config.get('DB_MAX_OVERFLOW', 10))
+    options.setdefault('pool_timeout', config.get('DB_POOL_TIMEOUT', 10))
+    options.setdefault('pool_recycle', config.get('DB_POOL_RECYCLE', 1800))
+    options.setdefault('pool_pre_ping', config.get('DB_POOL_PRE_PING', True))
+    options.setdefault('pool_use_lifo', config.get('DB_POOL_USE_LIFO', True))
+    return options
+
+def release_connection(session=None):
+    """Return a read-only session's connection to the pool, keeping its objects.
+
+    Unlike ``close()``, nothing is detached: ending the transaction only
+    expires loaded objects, which reload on next access. A session with
+    uncommitted writes keeps its transaction and connection. Returns whether
+    the connection was released.
+    """
+    from app.utils.change_feed import has_uncommitted_writes
+
+    session = session or db.session()
+    if not session.in_transaction() or session.in_nested_transaction() or has_uncommitted_writes(session):
+        return False
+    session.rollback()
+    return True
+
+def pool_status():
+    """Snapshot of the main engine's connection pool."""
+    pool = db.engine.pool
+    status = {'class': type(pool).__name__, 'status': pool.status()}
+    for name in ('size', 'checkedin', 'checkedout', 'overflow'):
+        if hasattr(pool, name):
+            status[name] = getattr(pool, name)()
+    return status
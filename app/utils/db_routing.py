@@ -0,0 +1,149 @@
+"""
+Read-replica routing for the Task Management System
+
+When ``REPLICA_DATABASE_URI`` is set, a ``replica`` bind is registered and
+the session sends reads there:
+
+- every query issued while serving a GET/HEAD request
+- everything inside ``replica_reads`` (used by AnalyticsService), including
+  calls from Socket.IO handlers and outside requests
+
+Flushes and explicit INSERT/UPDATE/DELETE statements always go to the
+primary. After a successful write request the user is pinned to the primary
+for ``REPLICA_STICKY_SECONDS`` so they read their own writes despite replica
+lag. The pin lives in the shared cache, so it holds across workers.
+
+To try it locally with SQLite, point ``REPLICA_DATABASE_URI`` at a copy of
+the primary database file.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from flask import g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.utils.logger import get_logger
+
+logger = get_logger('db')
+
+REPLICA_BIND = 'replica'
+READ_METHODS = ('GET', 'HEAD')
+
+_force_replica = ContextVar('force_replica', default=False)
+
+
+def _sticky_key(user_id):
+    return f"db:sticky_primary:{user_id}"
+
+
+def _current_user_id():
+    try:
+        from flask_jwt_extended import get_jwt_identity
+        return get_jwt_identity()
+    except RuntimeError:
+        # Not verified yet (or no JWT); the user loader records the identity
+        # before it queries
+        return g.get('current_user_id')
+
+
+def _is_sticky(user_id):
+    if user_id is None:
+        return False
+    from app.utils.cache_utils import cache
+    try:
+        return bool(cache.get(_sticky_key(user_id)))
+    except Exception as e:
+        logger.warning(f"Sticky-primary lookup failed, using primary: {e}")
+        return True
+
+
+def _user_pinned():
+    """Whether the current user wrote recently, cached on ``g`` per request.
+
+    Only cached once the JWT identity is known, so queries made while the
+    token is being verified do not decide it too early.
+    """
+    if 'db_user_pinned' in g:
+        return g.db_user_pinned
+    user_id = _current_user_id()
+    if user_id is None:
+        return False
+    g.db_user_pinned = _is_sticky(user_id)
+    return g.db_user_pinned
+
+
+def use_replica():
+    """True when the current read may be served by the replica."""
+    if not has_request_context():
+        # Background jobs and scripts opt in explicitly
+        return _force_replica.get()
+    if getattr(request, 'sid', None) is not None and not _force_replica.get():
+        # Socket.IO handlers write and read back in one event
+        return False
+    if request.method not in READ_METHODS:
+        return False
+    return not _user_pinned()
+
+
+@contextmanager
+def replica_reads_context():
+    token = _force_replica.set(True)
+    try:
+        yield
+    finally:
+        _force_replica.reset(token)
+
+
+def replica_reads(f):
+    """Run a read-only function against the replica (unless the user is pinned)."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        with replica_reads_context():
+            return f(*args, **kwargs)
+    return decorated_function
+
+
+class RoutingSession(Session):
+    """Session that sends reads to the replica bind when allowed."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is not None or self._flushing or isinstance(clause, UpdateBase):
+            return engine
+
+        # Only tables on the default (primary) bind have a replica
+        engines = self._db.engines
+        replica = engines.get(REPLICA_BIND)
+        if replica is not None and engine is engines.get(None) and use_replica():
+            return replica
+        return engine
+
+
+def init_replica_routing(app):
+    """Register the replica bind and the sticky-primary hook.
+
+    Must run before ``db.init_app`` so the bind's engine gets created.
+    """
+    uri = app.config.get('REPLICA_DATABASE_URI')
+    if not uri:
+        return
+
+    binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+    binds.setdefault(REPLICA_BIND, uri)
+    app.config['SQLALCHEMY_BINDS'] = binds
+
+    @app.after_request
+    def pin_writer_to_primary(response):
+        if request.method not in READ_METHODS and response.status_code < 400:
+            user_id = _current_user_id()
+            if user_id is not None:
+                from app.utils.cache_utils import cache
+                try:
+                    cache.set(_sticky_key(user_id), 1, timeout=app.config.get('REPLICA_STICKY_SECONDS', 5))
+                except Exception as e:
+                    logger.warning(f"Could not pin user {user_id} to primary: {e}")
+        return response
+
+    app.logger.info("✅ Read replica routing enabled")
@@ -0,0 +1,162 @@
+"""
+ETag and conditional GET helpers for the Task Management System
+"""
+from functools import wraps
+import hashlib
+import json
+
+from flask import g, request, make_response
+from flask_jwt_extended import get_jwt_identity
+
+from app.utils.logger import get_logger
+
+logger = get_logger('api')
+
+# Suffixes added to the ETag when a response is content-encoded, so each
+# encoding keeps a distinct strong validator (see app.utils.compression).
+ENCODING_SUFFIXES = ('gzip', 'br')
+
+# One year: the longest max-age caches honour, for content-addressed responses
+IMMUTABLE_MAX_AGE = 31536000
+
+
+def make_etag(*parts):
+    """Build a strong ETag value from version parts."""
+    key_string = "|".join(str(part) for part in parts)
+    return hashlib.sha1(key_string.encode()).hexdigest()
+
+
+def etag_matches(etag):
+    """Check the request's If-None-Match header against an ETag and its encoded variants."""
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return False
+    if if_none_match.star_tag or if_none_match.contains(etag):
+        return True
+    return any(if_none_match.contains(f"{etag}-{suffix}") for suffix in ENCODING_SUFFIXES)
+
+
+def conditional_get(version_func):
+    """Answer GET requests with 304 when the client's ETag is still current.
+
+    ``version_func`` receives the view's arguments and returns a cheap version
+    token (e.g. a row count and the newest ``updated_at``). It runs before the
+    view, so an unchanged resource is answered without the expensive query or
+    serialization. The ETag also covers the caller and query string, since the
+    same version can back different payloads. Must be applied below
+    ``jwt_required``.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            g.resource_version = None
+            if request.method not in ('GET', 'HEAD'):
+                return f(*args, **kwargs)
+
+            try:
+                version = version_func(*args, **kwargs)
+            except Exception as e:
+                logger.warning(f"ETag version lookup failed for {request.path}: {e}")
+                return f(*args, **kwargs)
+
+            # Server-side caches behind the view key on the same version (see
+            # versioned_key), so a new ETag never goes out with a stale body
+            g.resource_version = make_etag(version)
+            etag = make_etag(request.path, request.query_string.decode(), get_jwt_identity(), version)
+
+            if etag_matches(etag):
+                response = make_response('', 304)
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'private, no-cache'
+                logger.debug(f"304 Not Modified for {request.path}")
+                return response
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated_function
+    return decorator
+
+
+def versioned_key(key):
+    """Scope a cache key to the version ``conditional_get`` computed for this request.
+
+    A body cached under an older version is then never served, and needs no
+    invalidation of its own; outside ``conditional_get`` the key is unchanged.
+    """
+    version = g.get('resource_version')
+    return f"{key}:v={version}" if version else key
+
+
+def version_etag(response, version):
+    """Send a single resource's ``version`` as its ETag (``ETag: "3"``).
+
+    This is the value ``If-Match`` carries back on a conditional update, so a
+    client can echo the ETag of its last GET or PUT.
+    """
+    response = make_response(response)
+    if version is not None and response.status_code == 200:
+        response.set_etag(str(version))
+    return response
+
+
+def if_match_version():
+    """The resource version a client sent in ``If-Match``, for conditional updates.
+
+    Accepts the ETag of the resource (see ``version_etag``) or its
+    ``version`` field as ``"3"``, ``W/"3"`` or ``3``. Returns None when the
+    header is absent or ``*`` (update unconditionally) and raises ValueError
+    for anything else.
+    """
+    value = request.headers.get('If-Match', '').strip()
+    if not value or value == '*':
+        return None
+    if value.startswith('W/'):
+        value = value[2:]
+    value = value.strip('"')
+    # Compressed responses carry the version with an encoding suffix
+    for suffix in ENCODING_SUFFIXES:
+        if value.endswith(f"-{suffix}"):
+            value = value[:-len(suffix) - 1]
+    if not value.isdigit():
+        raise ValueError('If-Match must carry the resource version, e.g. If-Match: "3"')
+    return int(value)
+
+
+class StaticPayload:
+    """A JSON body serialized once, with its content hash as a strong ETag.
+
+    For data fixed for the life of the process (e.g. enum metadata), so
+    requests skip serialization, cache lookups and version queries entirely.
+    """
+    __slots__ = ('body', 'etag')
+
+    def __init__(self, data):
+        # Stable key order so every worker produces the same bytes and ETag
+        self.body = json.dumps(data, sort_keys=True, separators=(',', ':'), default=dict).encode()
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+
+
+def send_static_payload(payload):
+    """Serve a ``StaticPayload`` with ETag revalidation.
+
+    Requests that name the current content version (``?v=<etag>``) are marked
+    ``immutable`` and cacheable for a year; others must revalidate, which the
+    ETag turns into a 304 without a body. Both are ``private``: the routes
+    are authenticated, so shared caches must not answer for them.
+    """
+    if request.args.get('v') == payload.etag:
+        cache_control = f'private, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    else:
+        cache_control = 'private, no-cache'
+
+    if etag_matches(payload.etag):
+        response = make_response('', 304)
+    else:
+        response = make_response(payload.body)
+        response.mimetype = 'application/json'
+    response.set_etag(payload.etag)
+    response.headers['Cache-Control'] = cache_control
+    return response
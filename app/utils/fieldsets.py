@@ -0,0 +1,222 @@
+"""
+Sparse fieldsets (``fields=`` / ``include=``) for API payloads
+
+A fieldset drives both the query and the serializer: only the requested
+columns are selected (``load_only``), only the requested relationships are
+eager-loaded, and the payload contains nothing else.
+
+Models opt in by declaring:
+
+- ``SPARSE_FIELDS``: scalar payload keys a client may request
+- ``SPARSE_COMPUTED``: keys that are not plain columns, mapped to
+  ``(attributes_to_load, getter)``
+- ``SPARSE_RELATIONS``: payload key -> relationship attribute
+- ``SPARSE_SUMMARY``: fields used when the model is embedded without
+  explicit sub-fields
+
+``id`` is always included, and so is the ``version`` of models with a
+``version_id_col``: it is the ETag that ``If-Match`` sends back.
+
+Examples::
+
+    GET /api/tasks?fields=title,status,priority,assigned_to.name
+    GET /api/notifications?fields=title,read&include=task
+"""
+from datetime import date, datetime
+from enum import Enum
+import json
+
+from flask import request
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+
+def json_list(value):
+    """Parse a JSON-encoded list column, as the models' ``to_dict`` do."""
+    if not value:
+        return []
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return []
+
+
+def _split(value):
+    return [part.strip() for part in value.split(',') if part.strip()] if value else []
+
+
+def _column_value(value):
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+class Fieldset:
+    """A parsed ``fields`` / ``include`` selection."""
+
+    def __init__(self, fields=None, include=None):
+        self.fields = None
+        self.nested = {}
+
+        if fields:
+            self.fields = []
+            for name in fields:
+                if '.' in name:
+                    relation, sub_field = name.split('.', 1)
+                    sub_fields = self.nested.get(relation) or []
+                    sub_fields.append(sub_field)
+                    self.nested[relation] = sub_fields
+                elif name not in self.fields:
+                    self.fields.append(name)
+
+        for relation in include or []:
+            self.nested.setdefault(relation, None)
+
+        self._resolved = {}
+
+    def __str__(self):
+        # Stable form, used in cache keys
+        fields = ','.join(sorted(self.fields or []))
+        nested = ','.join(
+            f"{relation}({','.join(sorted(sub_fields or []))})"
+            for relation, sub_fields in sorted(self.nested.items())
+        )
+        return f"fields={fields};include={nested}"
+
+    def includes(self, relation):
+        return relation in self.nested or relation in (self.fields or [])
+
+    def resolve(self, model):
+        """Split the selection into scalar fields and relations for ``model``.
+
+        Raises ``ValueError`` for names the model does not expose.
+        """
+        if model in self._resolved:
+            return self._resolved[model]
+
+        allowed = getattr(model, 'SPARSE_FIELDS', ())
+        relations_map = getattr(model, 'SPARSE_RELATIONS', {})
+
+        scalars = []
+        relations = {}
+        for name in (allowed if self.fields is None else self.fields):
+            if name == 'id':
+                continue
+            if name in relations_map:
+                relations.setdefault(name, None)
+            elif name in allowed:
+                scalars.append(name)
+            else:
+                raise ValueError(f"Unknown field '{name}' for {model.__tablename__}")
+
+        version_column = inspect(model).version_id_col
+        if version_column is not None:
+            version = inspect(model).get_property_by_column(version_column).key
+            if version not in scalars:
+                scalars.append(version)
+
+        for name, sub_fields in self.nested.items():
+            if name not in relations_map:
+                raise ValueError(f"Unknown relation '{name}' for {model.__tablename__}")
+            target = inspect(model).relationships[relations_map[name]].mapper.class_
+            nested = Fieldset(fields=sub_fields or getattr(target, 'SPARSE_SUMMARY', ()))
+            nested.resolve(target)
+            relations[name] = nested
+
+        for name in relations:
+            if relations[name] is None:
+                target = inspect(model).relationships[relations_map[name]].mapper.class_
+                relations[name] = Fieldset(fields=getattr(target, 'SPARSE_SUMMARY', ()))
+
+        self._resolved[model] = (scalars, relations)
+        return scalars, relations
+
+    def _load_attributes(self, model):
+        """Columns and relationships (for computed fields) needed on ``model``."""
+        scalars, _ = self.resolve(model)
+        mapper = inspect(model)
+        computed = getattr(model, 'SPARSE_COMPUTED', {})
+
+        columns = ['id']
+        relationships = []
+        for name in scalars:
+            for attribute in (computed[name][0] if name in computed else (name,)):
+                if attribute in mapper.relationships:
+                    relationships.append(attribute)
+                elif attribute not in columns:
+                    columns.append(attribute)
+        return columns, relationships
+
+    def loader_options(self, model, path=None, extra_columns=()):
+        """Query options that load exactly what ``serialize`` will read.
+
+        ``extra_columns`` are loaded as well, for columns the caller itself
+        reads (e.g. ``project_id`` for a permission check).
+        """
+        mapper = inspect(model)
+        columns, relationships = self._load_attributes(model)
+        columns += [column for column in extra_columns if column not in columns]
+        _, relations = self.resolve(model)
+
+        def start(loader, attribute):
+            return getattr(path, loader.__name__)(attribute) if path is not None else loader(attribute)
+
+        options = []
+        column_attrs = [getattr(model, column) for column in columns]
+        options.append(path.load_only(*column_attrs) if path is not None else load_only(*column_attrs))
+
+        # Relationships read only to count them: load primary keys in one batch
+        for name in relationships:
+            target = mapper.relationships[name].mapper
+            primary_key = [getattr(target.class_, column.key) for column in target.primary_key]
+            options.append(start(selectinload, getattr(model, name)).load_only(*primary_key))
+
+        for name, nested in relations.items():
+            attribute = getattr(model, model.SPARSE_RELATIONS[name])
+            prop = mapper.relationships[model.SPARSE_RELATIONS[name]]
+            loader = selectinload if prop.uselist else joinedload
+            options.extend(nested.loader_options(prop.mapper.class_, path=start(loader, attribute)))
+
+        return options
+
+    def serialize(self, obj):
+        """Serialize ``obj`` with only the selected fields."""
+        model = type(obj)
+        scalars, relations = self.resolve(model)
+        computed = getattr(model, 'SPARSE_COMPUTED', {})
+
+        result = {'id': obj.id}
+        for name in scalars:
+            if name in computed:
+                result[name] = computed[name][1](obj)
+            else:
+                result[name] = _column_value(getattr(obj, name))
+
+        for name, nested in relations.items():
+            related = getattr(obj, model.SPARSE_RELATIONS[name])
+            if related is None:
+                result[name] = None
+            elif isinstance(related, list):
+                result[name] = [nested.serialize(item) for item in related]
+            else:
+                result[name] = nested.serialize(related)
+
+        return result
+
+
+def fieldset_from_request(model):
+    """Build a validated Fieldset from ``fields`` / ``include`` query args.
+
+    Returns ``None`` when neither is given so callers keep the full payload.
+    Raises ``ValueError`` for unknown fields.
+    """
+    fields = _split(request.args.get('fields'))
+    include = _split(request.args.get('include'))
+    if not fields and not include:
+        return None
+
+    fieldset = Fieldset(fields=fields or None, include=include)
+    fieldset.resolve(model)
+    return fieldset
@@ -0,0 +1,54 @@
+"""
+Fast JSON encoding for Flask responses
+"""
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Output matches the default provider except that keys keep their insertion
+    order (sorting costs more than it is worth for API payloads) and non-ASCII
+    text is emitted as UTF-8 instead of ``\\u`` escapes. Datetimes are passed
+    through to Flask's default handler so they keep the same HTTP-date format.
+    """
+
+    sort_keys = False
+
+    def _options(self, sort_keys=False, indent=False):
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        option = self._options(kwargs.get('sort_keys', self.sort_keys), kwargs.get('indent'))
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        option = self._options(self.sort_keys, indent) | orjson.OPT_APPEND_NEWLINE
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option),
+            mimetype=self.mimetype
+        )
+
+
+def init_json_provider(app):
+    """Use the orjson provider when orjson is installed, else keep Flask's default."""
+    if orjson is None:
+        app.logger.warning("orjson not installed, using the standard library JSON encoder")
+        return app.json
+    app.json = OrjsonProvider(app)
+    return app.json
@@ -0,0 +1,91 @@
+"""
+Request-scoped current user for the Task Management System
+
+The JWT ``user_lookup_loader`` loads the token's user once per request,
+together with the project memberships that permission checks read, and
+flask_jwt_extended keeps it on ``g`` for the rest of the request. Routes
+pass ``current_user`` to services instead of the raw identity, so a task
+update no longer fetches the same user row three or four times.
+
+Services accept either a loaded ``User`` or an id (scripts and Socket.IO
+handlers still pass ids) and normalise it with ``resolve_user``. Endpoints
+whose response is the same for every caller use ``token_required``, which
+checks the token without loading the user.
+"""
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request
+from flask_jwt_extended import decode_token, get_current_user
+from flask_jwt_extended.exceptions import NoAuthorizationError, WrongTokenError
+from sqlalchemy.orm import joinedload
+
+from app.utils.logger import get_logger
+
+logger = get_logger('auth')
+
+
+def _load_user(user_id):
+    from app.models.user import User
+    return User.query.options(joinedload(User.project_memberships)).filter_by(id=int(user_id)).first()
+
+
+def init_user_loader(jwt):
+    """Register the JWT callbacks that load ``current_user``."""
+
+    @jwt.user_lookup_loader
+    def user_lookup_callback(jwt_header, jwt_data):
+        identity = jwt_data[current_app.config.get('JWT_IDENTITY_CLAIM', 'sub')]
+        # Exposed before the lookup so replica routing can tell who is asking
+        g.current_user_id = identity
+        return _load_user(identity)
+
+    @jwt.user_lookup_error_loader
+    def user_lookup_error_callback(jwt_header, jwt_data):
+        logger.warning(f"Token presented for unknown user {g.get('current_user_id')}")
+        return {'success': False, 'error': 'User not found'}, 401
+
+
+def _request_user():
+    if not has_request_context():
+        return None
+    try:
+        return get_current_user()
+    except RuntimeError:
+        # No verified JWT in this request
+        return None
+
+
+def resolve_user(user):
+    """Return a ``User`` for a loaded user or a user id.
+
+    Ids matching the request's JWT identity reuse the already loaded user;
+    anything else is fetched (404 if missing).
+    """
+    from app.models.user import User
+
+    if isinstance(user, User):
+        return user
+    loaded = _request_user()
+    if loaded is not None and str(loaded.id) == str(user):
+        return loaded
+    return User.query.get_or_404(user)
+
+
+def token_required(f):
+    """Like ``jwt_required()``, but checks only the access token, not its user.
+
+    The signature, expiry and token type are verified from the Authorization
+    header without the ``user_lookup_loader``, so the request makes no
+    database query. Failures raise the flask_jwt_extended errors that
+    ``jwt_required`` raises, and get the same responses.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        header_type = current_app.config.get('JWT_HEADER_TYPE', 'Bearer')
+        scheme, _, token = request.headers.get(current_app.config.get('JWT_HEADER_NAME', 'Authorization'), '').partition(' ')
+        if scheme != header_type or not token:
+            raise NoAuthorizationError('Missing Authorization Header')
+        if decode_token(token.strip()).get('type') != 'access':
+            raise WrongTokenError('Only non-refresh tokens are allowed')
+        return f(*args, **kwargs)
+    return decorated_function
@@ -1,66 +1,177 @@
 """
 Simple, organized logging configuration for Task Management System
+
+Loggers never write to the console or disk on the request thread: the
+``app`` logger (which every ``app.*`` logger propagates to) and the
+third-party loggers hold a single ``QueueHandler``, and a ``QueueListener``
+thread feeds the console, ``app.log`` and ``errors.log`` handlers.
+
+- ``LOG_FORMAT``: ``text`` (default) or ``json`` (one object per line)
+- ``LOG_QUEUE_SIZE``: records buffered before new ones are dropped, so a slow
+  disk can never block a request
+- ``LOG_SAMPLING``: keep only a fraction of DEBUG records per logger, e.g.
+  ``app.db=0.1,app.cache=0.05``
+
+Pass arguments %-style (``logger.debug("Task %s", task_id)``) on hot paths:
+the message is only built if the record is actually emitted.
 """
+import atexit
+import json
 import logging
 import logging.handlers
 import os
+import queue
+import random
 from pathlib import Path
 from datetime import datetime
 
 class ColoredFormatter(logging.Formatter):
     """Add colors to console logging"""
-    
+
     # Color codes
     COLORS = {
         'DEBUG': '\033[36m',     # Cyan
-        'INFO': '\033[32m',      # Green  
+        'INFO': '\033[32m',      # Green
         'WARNING': '\033[33m',   # Yellow
         'ERROR': '\033[31m',     # Red
         'CRITICAL': '\033[35m',  # Magenta
         'RESET': '\033[0m'       # Reset
     }
-    
+
     def format(self, record):
-        # Add color to levelname
+        # Color a copy: the same record also goes to the file handlers
         if record.levelname in self.COLORS:
+            record = logging.makeLogRecord(record.__dict__)
             record.levelname = f"{self.COLORS[record.levelname]}{record.levelname}{self.COLORS['RESET']}"
-        
+
         return super().format(record)
 
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per record, including any ``extra`` fields."""
+
+    # Attributes every LogRecord has; anything else came from ``extra``
+    RESERVED = frozenset(logging.makeLogRecord({}).__dict__) | {'message', 'asctime'}
+
+    def format(self, record):
+        entry = {
+            'timestamp': datetime.utcfromtimestamp(record.created).isoformat(timespec='milliseconds') + 'Z',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'module': record.module,
+            'function': record.funcName,
+            'line': record.lineno,
+            'process': record.process,
+        }
+        for key, value in record.__dict__.items():
+            if key not in self.RESERVED and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a random fraction of records below INFO; INFO and above always pass."""
+
+    def __init__(self, rate):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        return record.levelno >= logging.INFO or random.random() < self.rate
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_queue_handler = None
+_listener = None
+_listener_config = None  # (handlers, queue size) of the current setup
+_process_hooks_registered = False
+
+
+def _start_listener():
+    """(Re)start the background writer for this process."""
+    global _listener
+    handlers, queue_size = _listener_config
+    _queue_handler.queue = queue.Queue(maxsize=queue_size)
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def _restart_in_child():
+    # Threads don't survive fork (gunicorn --preload): give each worker its own writer
+    if _listener_config is not None:
+        _start_listener()
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _queue_handler is not None and _queue_handler.dropped:
+        logging.getLogger('app').warning("Dropped %d log records (queue full)", _queue_handler.dropped)
+
+
+def parse_sampling(spec):
+    """Parse ``LOG_SAMPLING`` ("logger=rate,...") into a dict."""
+    rates = {}
+    for item in (spec or '').split(','):
+        name, _, rate = item.strip().partition('=')
+        if name and rate:
+            rates[name] = float(rate)
+    return rates
+
+
 def setup_logging(app):
     """Setup comprehensive logging for the application"""
-    
+    global _queue_handler, _listener_config, _process_hooks_registered
+
     # Create logs directory
     log_dir = Path(app.instance_path).parent / 'logs'
     log_dir.mkdir(exist_ok=True)
-    
+
     # Get log level from config
     log_level = getattr(logging, app.config.get('LOG_LEVEL', 'INFO').upper())
-    
+    json_output = app.config.get('LOG_FORMAT', 'text').lower() == 'json'
+
     # Configure root logger
     logging.basicConfig(level=log_level, handlers=[])
-    
+
     # Create formatters
     detailed_formatter = logging.Formatter(
         fmt='%(asctime)s | %(levelname)-8s | %(name)s | %(funcName)s:%(lineno)d | %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    
-    simple_formatter = logging.Formatter(
-        fmt='%(asctime)s | %(levelname)-8s | %(message)s',
-        datefmt='%H:%M:%S'
-    )
-    
+
     colored_formatter = ColoredFormatter(
         fmt='%(asctime)s | %(levelname)-8s | %(name)s | %(message)s',
         datefmt='%H:%M:%S'
     )
-    
+    json_formatter = JSONFormatter()
+
     # 1. Console Handler (colored, simple format)
     console_handler = logging.StreamHandler()
     console_handler.setLevel(log_level)
-    console_handler.setFormatter(colored_formatter)
-    
+    console_handler.setFormatter(json_formatter if json_output else colored_formatter)
+
     # 2. Application Log File (detailed format)
     app_handler = logging.handlers.RotatingFileHandler(
         log_dir / 'app.log',
@@ -68,24 +179,33 @@ def setup_logging(app):
         backupCount=5
     )
     app_handler.setLevel(log_level)
-    app_handler.setFormatter(detailed_formatter)
-    
+    app_handler.setFormatter(json_formatter if json_output else detailed_formatter)
+
     # 3. Error Log File (errors only)
     error_handler = logging.handlers.RotatingFileHandler(
-        log_dir / 'errors.log', 
+        log_dir / 'errors.log',
         maxBytes=10*1024*1024,  # 10MB
         backupCount=5
     )
     error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(detailed_formatter)
-    
+    error_handler.setFormatter(json_formatter if json_output else detailed_formatter)
+
+    # 4. Everything goes through one queue; the listener thread does the writing
+    stop_logging()
+    _listener_config = ((console_handler, app_handler, error_handler), app.config.get('LOG_QUEUE_SIZE', 10000))
+    _queue_handler = DroppingQueueHandler(None)
+    _start_listener()
+    if not _process_hooks_registered:
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=_restart_in_child)
+        atexit.register(stop_logging)
+        _process_hooks_registered = True
+
     # Configure Flask app logger
     app.logger.handlers.clear()
-    app.logger.addHandler(console_handler)
-    app.logger.addHandler(app_handler)
-    app.logger.addHandler(error_handler)
+    app.logger.addHandler(_queue_handler)
     app.logger.setLevel(log_level)
-    
+
     # Configure other loggers
     loggers_to_configure = [
         'werkzeug',       # Flask dev server
@@ -93,74 +213,85 @@ def setup_logging(app):
         'socketio',       # Socket.IO
         'celery',         # Background tasks
     ]
-    
+
     for logger_name in loggers_to_configure:
         logger = logging.getLogger(logger_name)
         logger.handlers.clear()
-        logger.addHandler(app_handler)
+        logger.addHandler(_queue_handler)
         logger.setLevel(logging.WARNING)  # Less verbose for third-party
-        logger.propagate = True
-    
+        logger.propagate = False
+
     # Custom application loggers
-    setup_custom_loggers(app_handler, error_handler, log_level)
-    
+    setup_custom_loggers(log_level, parse_sampling(app.config.get('LOG_SAMPLING')))
+
     app.logger.info("🔧 Logging system initialized")
-    app.logger.info(f"📁 Log directory: {log_dir}")
-    app.logger.info(f"📊 Log level: {logging.getLevelName(log_level)}")
+    app.logger.info("📁 Log directory: %s", log_dir)
+    app.logger.info("📊 Log level: %s", logging.getLevelName(log_level))
+
+def setup_custom_loggers(log_level, sampling=None):
+    """Setup custom loggers for different parts of the application
+
+    They have no handlers of their own and propagate to the ``app`` logger's
+    queue handler, so each record is written once.
+    """
+    sampling = sampling or {}
 
-def setup_custom_loggers(app_handler, error_handler, log_level):
-    """Setup custom loggers for different parts of the application"""
-    
     custom_loggers = {
         'auth': 'Authentication & Authorization',
         'tasks': 'Task Management',
-        'projects': 'Project Management', 
+        'projects': 'Project Management',
         'cache': 'Caching System',
         'socket': 'Real-time Communications',
         'api': 'API Requests',
         'db': 'Database Operations'
     }
-    
+
     for name, description in custom_loggers.items():
         logger = logging.getLogger(f'app.{name}')
         logger.handlers.clear()
-        logger.addHandler(app_handler)
-        logger.addHandler(error_handler)
+        logger.filters = [f for f in logger.filters if not isinstance(f, SamplingFilter)]
         logger.setLevel(log_level)
         logger.propagate = True
 
+    for name, rate in sampling.items():
+        if rate < 1:
+            logging.getLogger(name).addFilter(SamplingFilter(rate))
+
 def get_logger(name):
     """Get a logger for a specific module"""
     return logging.getLogger(f'app.{name}')
 
-# Convenience functions for different log types
+# Convenience functions for different log types (called per request, so the
+# messages are %-formatted only when the level is enabled)
 def log_api_request(endpoint, method, user_id=None, ip=None):
     """Log API requests"""
     logger = get_logger('api')
-    logger.info(f"📡 {method} {endpoint} | User: {user_id} | IP: {ip}")
+    logger.info("📡 %s %s | User: %s | IP: %s", method, endpoint, user_id, ip)
 
 def log_db_query(query_type, table, duration_ms=None):
     """Log database operations"""
     logger = get_logger('db')
-    duration = f" | {duration_ms}ms" if duration_ms else ""
-    logger.debug(f"🗄️ {query_type} on {table}{duration}")
+    if duration_ms:
+        logger.debug("🗄️ %s on %s | %sms", query_type, table, duration_ms)
+    else:
+        logger.debug("🗄️ %s on %s", query_type, table)
 
 def log_cache_operation(operation, key, hit=None):
     """Log cache operations"""
     logger = get_logger('cache')
     status = "HIT" if hit else "MISS" if hit is False else ""
-    logger.debug(f"⚡ Cache {operation}: {key} {status}")
+    logger.debug("⚡ Cache %s: %s %s", operation, key, status)
 
 def log_socket_event(event, user_id=None, room=None):
     """Log socket events"""
     logger = get_logger('socket')
-    logger.info(f"🔌 Socket {event} | User: {user_id} | Room: {room}")
+    logger.info("🔌 Socket %s | User: %s | Room: %s", event, user_id, room)
 
 def log_auth_event(event, user_id=None, email=None, success=True):
     """Log authentication events"""
     logger = get_logger('auth')
     status = "SUCCESS" if success else "FAILED"
-    logger.info(f"🔐 {event} {status} | User: {user_id} | Email: {email}")
+    logger.info("🔐 %s %s | User: %s | Email: %s", event, status, user_id, email)
 
 
 
@@ -172,13 +303,11 @@ def log_request(func):
     @wraps(func)
     def wrapper(*args, **kwargs):
         logger = get_logger('api')
-        endpoint = request.path
-        method = request.method
-        user_ip = request.remote_addr
-        data = request.get_json(silent=True)
-        email = data.get('email') if data else None
-
-        logger.info(f"API called | Endpoint: {endpoint} | Method: {method} | Email: {email} | IP: {user_ip}")
+        if logger.isEnabledFor(logging.INFO):
+            data = request.get_json(silent=True)
+            email = data.get('email') if isinstance(data, dict) else None
+            logger.info("API called | Endpoint: %s | Method: %s | Email: %s | IP: %s",
+                        request.path, request.method, email, request.remote_addr)
 
         return func(*args, **kwargs)
     return wrapper
@@ -0,0 +1,226 @@
+"""
+Prometheus metrics for the Task Management System
+
+Exposes ``/metrics`` with request latency/counts, DB pool and query timings,
+cache hit/miss per key prefix, Socket.IO room sizes and notification fan-out.
+
+Scrapes are accepted from ``METRICS_ALLOWED_NETWORKS`` (loopback by
+default) or with ``Authorization: Bearer <METRICS_TOKEN>``; anyone else gets
+403, since the output names routes and shows pool state and latencies.
+
+Under gunicorn (or any multi-process server) set ``PROMETHEUS_MULTIPROC_DIR``
+to an empty, writable directory before the workers start, and call
+``mark_worker_dead(worker.pid)`` from gunicorn's ``child_exit`` hook. Each
+process then writes its samples to memory-mapped files and ``/metrics``
+aggregates them, whichever worker serves the scrape.
+
+All ``record_*`` helpers are no-ops when ``prometheus_client`` is missing.
+"""
+import hmac
+import os
+import time
+from ipaddress import ip_address, ip_network
+
+from flask import Response, current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.utils.logger import get_logger
+
+try:
+    from prometheus_client import (
+        CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+    )
+except ImportError:  # pragma: no cover - optional dependency
+    Counter = None
+
+logger = get_logger('api')
+
+_DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5)
+_FANOUT_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+if Counter is not None:
+    REQUEST_LATENCY = Histogram(
+        'http_request_duration_seconds', 'HTTP request latency', ['method', 'endpoint']
+    )
+    REQUEST_COUNT = Counter(
+        'http_requests_total', 'HTTP requests', ['method', 'endpoint', 'status']
+    )
+    DB_QUERY_DURATION = Histogram(
+        'db_query_duration_seconds', 'SQL statement execution time', buckets=_DB_BUCKETS
+    )
+    DB_POOL_CHECKOUT_DURATION = Histogram(
+        'db_pool_checkout_duration_seconds', 'Time a connection stays checked out of the pool', buckets=_DB_BUCKETS
+    )
+    DB_POOL_CONNECT_DURATION = Histogram(
+        'db_pool_connect_duration_seconds', 'Time to open a new DBAPI connection', buckets=_DB_BUCKETS
+    )
+    DB_POOL_IN_USE = Gauge(
+        'db_pool_connections_in_use', 'Connections currently checked out of the pool', multiprocess_mode='livesum'
+    )
+    DB_POOL_CONNECTIONS_OPENED = Counter(
+        'db_pool_connections_opened_total', 'New DBAPI connections opened by the pool'
+    )
+    DB_POOL_INVALIDATIONS = Counter(
+        'db_pool_invalidations_total', 'Connections discarded as stale or broken (pre-ping, disconnects)'
+    )
+    CACHE_REQUESTS = Counter(
+        'cache_requests_total', 'Cache lookups by key prefix', ['prefix', 'result']
+    )
+    SOCKET_ROOM_CLIENTS = Gauge(
+        'socketio_room_clients', 'Connected Socket.IO clients per room', ['room'], multiprocess_mode='livesum'
+    )
+    NOTIFICATION_FANOUT = Histogram(
+        'notification_fanout_recipients', 'Recipients per notification fan-out', ['event'], buckets=_FANOUT_BUCKETS
+    )
+
+_engine_events_registered = False
+
+
+def metrics_available():
+    return Counter is not None
+
+
+def _room_label(room):
+    # Personal rooms are collapsed so the label set stays bounded by project count
+    return 'user_*' if str(room).startswith('user_') else str(room)
+
+
+def record_cache_lookup(prefix, hit):
+    if Counter is not None:
+        CACHE_REQUESTS.labels(prefix=prefix or 'default', result='hit' if hit else 'miss').inc()
+
+
+def record_room_join(room):
+    if Counter is not None:
+        SOCKET_ROOM_CLIENTS.labels(room=_room_label(room)).inc()
+
+
+def record_room_leave(room):
+    if Counter is not None:
+        SOCKET_ROOM_CLIENTS.labels(room=_room_label(room)).dec()
+
+
+def record_notification_fanout(event_name, recipients):
+    if Counter is not None:
+        NOTIFICATION_FANOUT.labels(event=event_name).observe(recipients)
+
+
+def mark_worker_dead(pid):
+    """Drop a dead worker's live gauges (call from gunicorn's ``child_exit``)."""
+    if Counter is not None and os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('metrics_query_start')
+    if starts:
+        DB_QUERY_DURATION.observe(time.perf_counter() - starts.pop())
+
+
+def _start_connect(dialect, connection_record, cargs, cparams):
+    connection_record.info['metrics_connect_start'] = time.perf_counter()
+
+
+def _connected(dbapi_connection, connection_record):
+    DB_POOL_CONNECTIONS_OPENED.inc()
+    start = connection_record.info.pop('metrics_connect_start', None)
+    if start is not None:
+        DB_POOL_CONNECT_DURATION.observe(time.perf_counter() - start)
+
+
+def _checked_out(dbapi_connection, connection_record, connection_proxy):
+    DB_POOL_IN_USE.inc()
+    connection_record.info['metrics_checkout_at'] = time.perf_counter()
+
+
+def _checked_in(dbapi_connection, connection_record):
+    DB_POOL_IN_USE.dec()
+    start = connection_record.info.pop('metrics_checkout_at', None) if connection_record is not None else None
+    if start is not None:
+        DB_POOL_CHECKOUT_DURATION.observe(time.perf_counter() - start)
+
+
+def _instrument_engine(engine):
+    """Track one engine's pool through its public pool and dialect events.
+
+    Connection hold times (checkout to checkin) and the time to open new
+    connections show pool pressure; a growing hold time or in-use count
+    precedes checkout timeouts.
+    """
+    event.listen(engine, 'do_connect', _start_connect)
+    event.listen(engine.pool, 'connect', _connected)
+    event.listen(engine.pool, 'checkout', _checked_out)
+    event.listen(engine.pool, 'checkin', _checked_in)
+    event.listen(engine.pool, 'invalidate', lambda *args: DB_POOL_INVALIDATIONS.inc())
+
+
+def _scrape_allowed():
+    token = current_app.config.get('METRICS_TOKEN')
+    if token:
+        scheme, _, given = request.headers.get('Authorization', '').partition(' ')
+        if scheme == 'Bearer' and hmac.compare_digest(given.strip().encode(), token.encode()):
+            return True
+    try:
+        address = ip_address(request.remote_addr or '')
+    except ValueError:
+        return False
+    return any(address in network for network in current_app.extensions['metrics_networks'])
+
+
+def metrics_view():
+    """Serve metrics in the Prometheus text format."""
+    if not _scrape_allowed():
+        logger.warning(f"Metrics scrape refused for {request.remote_addr}")
+        return Response('Forbidden\n', status=403, mimetype='text/plain')
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        data = generate_latest(registry)
+    else:
+        data = generate_latest()
+    return Response(data, mimetype=CONTENT_TYPE_LATEST)
+
+
+def init_metrics(app, db):
+    """Register request timing hooks, DB instrumentation and ``/metrics``."""
+    global _engine_events_registered
+
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    if Counter is None:
+        app.logger.warning("prometheus_client not installed, /metrics disabled")
+        return
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_start = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        start = g.pop('metrics_start', None)
+        if start is None or request.path == '/metrics':
+            return response
+        endpoint = request.url_rule.rule if request.url_rule else 'unmatched'
+        REQUEST_LATENCY.labels(method=request.method, endpoint=endpoint).observe(time.perf_counter() - start)
+        REQUEST_COUNT.labels(method=request.method, endpoint=endpoint, status=response.status_code).inc()
+        return response
+
+    if not _engine_events_registered:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _engine_events_registered = True
+
+    with app.app_context():
+        for engine in db.engines.values():
+            _instrument_engine(engine)
+
+    networks = app.config.get('METRICS_ALLOWED_NETWORKS', '127.0.0.0/8,::1/128')
+    app.extensions['metrics_networks'] = [ip_network(network.strip()) for network in networks.split(',') if network.strip()]
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+    app.logger.info("✅ Metrics enabled at /metrics")
@@ -0,0 +1,130 @@
+"""
+Password hashing for the Task Management System
+
+Hashing and verification are CPU-bound by design, so under a login storm they
+starve every other request on a gevent or threaded worker. Here they run in a
+small per-process pool instead, and the request only waits on the result.
+
+- ``PASSWORD_HASH_METHOD`` is a werkzeug method string, e.g.
+  ``scrypt:32768:8:1`` or ``pbkdf2:sha256`` (werkzeug's defaults fill in
+  omitted cost parameters). Hashes made with other parameters still verify
+  and are upgraded on the next successful login (see ``needs_rehash``).
+- ``PASSWORD_HASH_WORKERS`` sizes the pool; 0 hashes inline (scripts, tests).
+- ``PASSWORD_HASH_MAX_PENDING`` bounds queued jobs per process. Callers wait
+  up to ``PASSWORD_HASH_TIMEOUT`` seconds for a slot and as long again for
+  the result, then get ``PasswordHashBusy`` so the route can answer 503
+  instead of waiting forever on a saturated, hung or crashed pool.
+"""
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from flask import current_app, has_app_context
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from app.utils.logger import get_logger
+
+logger = get_logger('auth')
+
+DEFAULTS = {
+    'PASSWORD_HASH_METHOD': 'scrypt:32768:8:1',
+    'PASSWORD_HASH_WORKERS': 2,
+    'PASSWORD_HASH_MAX_PENDING': 32,
+    'PASSWORD_HASH_TIMEOUT': 10,
+}
+
+_executor = None
+_slots = None
+_lock = threading.Lock()
+
+# Configured method -> the expanded form werkzeug stores in hashes
+_stored_methods = {}
+
+
+class PasswordHashBusy(Exception):
+    """Raised when the hashing pool has no free slot within the timeout."""
+
+
+def _setting(name):
+    if has_app_context():
+        return current_app.config.get(name, DEFAULTS[name])
+    return DEFAULTS[name]
+
+
+def _pool():
+    """Create the pool on first use, so it starts after gunicorn forks."""
+    global _executor, _slots
+    workers = _setting('PASSWORD_HASH_WORKERS')
+    if workers <= 0:
+        return None, None
+    with _lock:
+        if _executor is None:
+            # spawn: forking a threaded server process can copy held locks
+            _executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _slots = threading.BoundedSemaphore(_setting('PASSWORD_HASH_MAX_PENDING'))
+            atexit.register(shutdown_pool)
+            logger.info(f"Password hashing pool started with {workers} workers")
+    return _executor, _slots
+
+
+def _run(fn, *args):
+    executor, slots = _pool()
+    if executor is None:
+        return fn(*args)
+
+    timeout = _setting('PASSWORD_HASH_TIMEOUT')
+    if not slots.acquire(timeout=timeout):
+        logger.warning("Password hashing pool saturated, rejecting request")
+        raise PasswordHashBusy("Password hashing is busy, try again shortly")
+    try:
+        future = executor.submit(fn, *args)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            future.cancel()
+            logger.error(f"Password hashing took over {timeout}s, rejecting request")
+            raise PasswordHashBusy("Password hashing is busy, try again shortly")
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool on the next call
+        logger.error("Password hashing pool broke, restarting it")
+        shutdown_pool()
+        raise PasswordHashBusy("Password hashing is busy, try again shortly")
+    finally:
+        slots.release()
+
+
+def shutdown_pool():
+    global _executor
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def hash_password(password):
+    """Hash a password with the configured method and cost."""
+    return _run(generate_password_hash, password, _setting('PASSWORD_HASH_METHOD'))
+
+
+def verify_password(password_hash, password):
+    return _run(check_password_hash, password_hash, password)
+
+
+def _stored_method(method):
+    """The method prefix werkzeug writes for ``method``, defaults filled in.
+
+    ``scrypt`` is stored as ``scrypt:32768:8:1`` and ``pbkdf2:sha256`` as
+    ``pbkdf2:sha256:<iterations>``, so the configured value is expanded once
+    per process by hashing a dummy password.
+    """
+    if method not in _stored_methods:
+        _stored_methods[method] = generate_password_hash('', method).split('$', 1)[0]
+    return _stored_methods[method]
+
+
+def needs_rehash(password_hash):
+    """True when a stored hash was made with other parameters than configured."""
+    method = password_hash.split('$', 1)[0]
+    return method != _stored_method(_setting('PASSWORD_HASH_METHOD'))
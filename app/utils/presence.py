@@ -0,0 +1,198 @@
+"""
+Presence tracking for Socket.IO: who is online, on a project, or viewing a task
+
+Everything lives in Redis sorted sets scored by expiry time, so it is shared
+across workers and cleans itself up when a disconnect is never delivered:
+
+- ``presence:user:<id>``: the user's live sids
+- ``presence:room:project_<id>``: ``<user_id>:<sid>`` of sockets in the room
+- ``presence:task:<id>``: ``<user_id>:<sid>`` of sockets viewing the task
+
+Clients send ``heartbeat`` every ``PRESENCE_HEARTBEAT_SECONDS``; each one
+pushes the socket's expiry ``PRESENCE_TTL`` seconds ahead. Reads drop expired
+members first, and every key expires on its own once nobody refreshes it.
+Lookups touch one key (``ZCOUNT``/``ZRANGEBYSCORE``), never a scan of all
+connections.
+
+Without Redis a per-process store with the same behaviour is used.
+"""
+import threading
+import time
+
+from app.utils.cache_utils import cache
+from app.utils.logger import get_logger
+
+logger = get_logger('socket')
+
+settings = {'ttl': 60}
+
+
+def configure_presence(app):
+    settings['ttl'] = app.config.get('PRESENCE_TTL', 60)
+
+
+class _LocalSortedSets:
+    """The few Redis sorted-set commands presence needs, for a single process."""
+
+    def __init__(self):
+        self._sets = {}
+        self._lock = threading.Lock()
+
+    def pipeline(self):
+        return _LocalPipeline(self)
+
+    def zadd(self, key, mapping):
+        with self._lock:
+            self._sets.setdefault(key, {}).update(mapping)
+
+    def zrem(self, key, *members):
+        with self._lock:
+            members_set = self._sets.get(key, {})
+            for member in members:
+                members_set.pop(member, None)
+            if not members_set:
+                self._sets.pop(key, None)
+
+    def zremrangebyscore(self, key, low, high):
+        with self._lock:
+            members_set = self._sets.get(key, {})
+            for member, score in list(members_set.items()):
+                if float(low) <= score <= float(high):
+                    del members_set[member]
+            if not members_set:
+                self._sets.pop(key, None)
+
+    def zrangebyscore(self, key, low, high):
+        with self._lock:
+            return [member for member, score in sorted(self._sets.get(key, {}).items(), key=lambda item: item[1])
+                    if float(low) <= score <= float(high)]
+
+    def zcount(self, key, low, high):
+        return len(self.zrangebyscore(key, low, high))
+
+    def expire(self, key, seconds):
+        pass  # Expired members are pruned on read; empty sets are dropped
+
+
+class _LocalPipeline:
+    def __init__(self, store):
+        self._store = store
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self._calls.append((getattr(self._store, name), args))
+            return self
+        return queue
+
+    def execute(self):
+        return [method(*args) for method, args in self._calls]
+
+
+_local_store = _LocalSortedSets()
+
+
+def _store():
+    return getattr(cache.cache, '_write_client', None) or _local_store
+
+
+def _text(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _user_key(user_id):
+    return f"presence:user:{user_id}"
+
+
+def _room_key(room):
+    return f"presence:room:{room}"
+
+
+def _task_key(task_id):
+    return f"presence:task:{task_id}"
+
+
+def _refresh(sid, user_id, rooms=(), task_id=None):
+    """Push this socket's expiry forward in every set it belongs to."""
+    ttl = settings['ttl']
+    expires = time.time() + ttl
+    member = f"{user_id}:{sid}"
+    keys = [(_user_key(user_id), sid)]
+    keys += [(_room_key(room), member) for room in rooms]
+    if task_id is not None:
+        keys.append((_task_key(task_id), member))
+
+    pipe = _store().pipeline()
+    for key, key_member in keys:
+        pipe.zadd(key, {key_member: expires})
+        pipe.expire(key, ttl * 2)
+    pipe.execute()
+
+
+def connect(sid, user_id, rooms):
+    """Register a new socket and the project rooms it joined."""
+    try:
+        _refresh(sid, user_id, rooms)
+    except Exception as e:
+        logger.warning("Presence update failed for user %s: %s", user_id, e)
+
+
+def heartbeat(sid, user_id, rooms, task_id=None):
+    try:
+        _refresh(sid, user_id, rooms, task_id)
+    except Exception as e:
+        logger.warning("Presence heartbeat failed for user %s: %s", user_id, e)
+
+
+def disconnect(sid, user_id, rooms, task_id=None):
+    """Remove a socket everywhere; anything missed here simply expires."""
+    member = f"{user_id}:{sid}"
+    try:
+        pipe = _store().pipeline()
+        pipe.zrem(_user_key(user_id), sid)
+        for room in rooms:
+            pipe.zrem(_room_key(room), member)
+        if task_id is not None:
+            pipe.zrem(_task_key(task_id), member)
+        pipe.execute()
+    except Exception as e:
+        logger.warning("Presence cleanup failed for user %s: %s", user_id, e)
+
+
+def view_task(sid, user_id, task_id, rooms):
+    heartbeat(sid, user_id, rooms, task_id)
+
+
+def leave_task(sid, user_id, task_id):
+    try:
+        _store().zrem(_task_key(task_id), f"{user_id}:{sid}")
+    except Exception as e:
+        logger.warning("Presence update failed for user %s: %s", user_id, e)
+
+
+def _live_members(key):
+    now = time.time()
+    store = _store()
+    pipe = store.pipeline()
+    pipe.zremrangebyscore(key, '-inf', now)
+    pipe.zrangebyscore(key, now, '+inf')
+    return [_text(member) for member in pipe.execute()[1]]
+
+
+def _users(members):
+    """Distinct user ids from ``<user_id>:<sid>`` members, in first-seen order."""
+    return list(dict.fromkeys(member.split(':', 1)[0] for member in members))
+
+
+def is_online(user_id):
+    return _store().zcount(_user_key(user_id), time.time(), '+inf') > 0
+
+
+def room_users(room):
+    """User ids with at least one live socket in a room."""
+    return _users(_live_members(_room_key(room)))
+
+
+def task_viewers(task_id):
+    """User ids with at least one live socket viewing a task."""
+    return _users(_live_members(_task_key(task_id)))
@@ -0,0 +1,144 @@
+"""
+Per-request SQL profiling and N+1 detection for the Task Management System
+"""
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+import re
+
+from flask import g, request
+from flask_sqlalchemy.record_queries import get_recorded_queries
+from sqlalchemy import event
+
+from app.utils.logger import get_logger
+
+logger = get_logger('db')
+
+_WHITESPACE = re.compile(r'\s+')
+_IN_LIST = re.compile(r'\bIN\s*\((?:[^()]|\([^()]*\))*\)', re.IGNORECASE)
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def normalize_statement(statement):
+    """Reduce a SQL statement to its shape, so repeated lookups group together.
+
+    Literals and ``IN (...)`` lists are replaced with placeholders; bound
+    parameters are already placeholders.
+    """
+    statement = _WHITESPACE.sub(' ', statement).strip()
+    statement = _STRING.sub('?', statement)
+    statement = _IN_LIST.sub('IN (?)', statement)
+    return _NUMBER.sub('?', statement)
+
+
+def build_query_profile(queries, slow_count=3, repeat_threshold=5):
+    """Summarize recorded queries.
+
+    ``queries`` are ``(statement, duration_seconds)`` pairs. Statement shapes
+    run ``repeat_threshold`` or more times are reported as N+1 suspects.
+    """
+    total_ms = 0.0
+    shapes = defaultdict(lambda: {'count': 0, 'total_ms': 0.0})
+    timed = []
+
+    for statement, duration in queries:
+        duration_ms = duration * 1000
+        total_ms += duration_ms
+        shape = shapes[normalize_statement(statement)]
+        shape['count'] += 1
+        shape['total_ms'] += duration_ms
+        timed.append((duration_ms, statement))
+
+    timed.sort(key=lambda item: item[0], reverse=True)
+    repeated = [
+        {'statement': statement, 'count': shape['count'], 'total_ms': round(shape['total_ms'], 2)}
+        for statement, shape in sorted(shapes.items(), key=lambda item: item[1]['count'], reverse=True)
+        if shape['count'] >= repeat_threshold
+    ]
+
+    return {
+        'query_count': len(timed),
+        'db_time_ms': round(total_ms, 2),
+        'slowest': [
+            {'statement': _WHITESPACE.sub(' ', statement).strip(), 'duration_ms': round(duration_ms, 2)}
+            for duration_ms, statement in timed[:slow_count]
+        ],
+        'repeated': repeated
+    }
+
+
+def init_query_profiler(app):
+    """Profile the queries of every request.
+
+    Relies on ``SQLALCHEMY_RECORD_QUERIES``. Adds a ``Server-Timing`` header,
+    logs one summary line per request (warning when N+1 suspects or slow
+    statements show up) and leaves the profile on ``g.query_profile``.
+    """
+    if not app.config.get('QUERY_PROFILER_ENABLED', False):
+        return
+    if not app.config.get('SQLALCHEMY_RECORD_QUERIES'):
+        app.logger.warning("Query profiler disabled: SQLALCHEMY_RECORD_QUERIES is off")
+        return
+
+    @app.after_request
+    def profile_queries(response):
+        queries = get_recorded_queries()
+        if not queries:
+            return response
+
+        profile = build_query_profile(
+            [(query.statement, query.duration) for query in queries],
+            slow_count=app.config.get('QUERY_PROFILER_SLOWEST', 3),
+            repeat_threshold=app.config.get('QUERY_N_PLUS_ONE_THRESHOLD', 5)
+        )
+        g.query_profile = profile
+
+        response.headers.add('Server-Timing', f'db;dur={profile["db_time_ms"]};desc="{profile["query_count"]} queries"')
+
+        slow_ms = app.config.get('QUERY_SLOW_MS', 100)
+        slow = [query for query in profile['slowest'] if query['duration_ms'] >= slow_ms]
+        summary = (
+            f"🗄️ {request.method} {request.path} | queries={profile['query_count']} "
+            f"| db_ms={profile['db_time_ms']} | repeated={len(profile['repeated'])} | slow={len(slow)}"
+        )
+        extra = {'query_profile': profile, 'endpoint': request.endpoint}
+
+        if profile['repeated'] or slow:
+            for shape in profile['repeated']:
+                logger.warning(f"Possible N+1 on {request.path}: {shape['count']}x {shape['statement'][:200]}")
+            logger.warning(summary, extra=extra)
+        else:
+            logger.debug(summary, extra=extra)
+
+        return response
+
+    app.logger.info("✅ Query profiler enabled")
+
+
+@contextmanager
+def assert_query_budget(engine, max_queries):
+    """Fail if the wrapped block runs more than ``max_queries`` statements.
+
+    Meant for tests::
+
+        with assert_query_budget(db.engine, 3):
+            client.get('/api/tasks', headers=auth_headers)
+
+    Yields the list of executed statements. The failure message lists the
+    most repeated statement shapes, which usually points at the N+1.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+    if len(statements) > max_queries:
+        shapes = Counter(normalize_statement(statement) for statement in statements)
+        top = "\n".join(f"  {count}x {shape[:200]}" for shape, count in shapes.most_common(5))
+        raise AssertionError(f"Query budget exceeded: {len(statements)} queries (budget {max_queries})\n{top}")
@@ -0,0 +1,106 @@
+"""
+Missed-event replay for Socket.IO reconnects
+
+Events sent to a user's personal room are also appended to a bounded
+per-user Redis stream (``socket:events:user_<id>``, trimmed to
+``SOCKET_REPLAY_MAXLEN`` entries and expiring after ``SOCKET_REPLAY_TTL``
+seconds of silence). Each payload carries its stream id as ``event_id``.
+
+A reconnecting client passes the last ``event_id`` it saw (in the connect
+``auth`` or a ``resume`` event) and receives only what it missed, in order,
+followed by ``replay_complete``. ``gap: true`` there means older events
+were already trimmed and the client should refetch notifications once.
+Replayed events may repeat ones that also arrived live; clients skip
+``event_id``s they already have.
+
+Without Redis (e.g. SimpleCache in development) a per-process buffer is
+used, which only covers reconnects to the same process.
+"""
+from collections import deque
+from itertools import count
+import json
+import threading
+
+from app.utils.cache_utils import cache
+from app.utils.logger import get_logger
+
+logger = get_logger('socket')
+
+settings = {'maxlen': 200, 'ttl': 86400}
+
+_local_streams = {}  # user_id -> deque of (event_id, event, data)
+_local_ids = count(1)
+_local_lock = threading.Lock()
+
+
+def configure_replay(app):
+    settings['maxlen'] = app.config.get('SOCKET_REPLAY_MAXLEN', 200)
+    settings['ttl'] = app.config.get('SOCKET_REPLAY_TTL', 86400)
+
+
+def _stream_key(user_id):
+    return f"socket:events:user_{user_id}"
+
+
+def _redis():
+    return getattr(cache.cache, '_write_client', None)
+
+
+def _id_tuple(event_id):
+    """Stream ids ("<ms>-<seq>") compare as integer pairs."""
+    ms, _, seq = str(event_id).partition('-')
+    return int(ms), int(seq or 0)
+
+
+def _text(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def record_event(user_id, event, data):
+    """Append an event to the user's replay buffer; returns its ``event_id``."""
+    if not settings['maxlen']:
+        return None
+    payload = json.dumps(data, default=str)
+    client = _redis()
+    try:
+        if client is not None:
+            key = _stream_key(user_id)
+            pipe = client.pipeline()
+            pipe.xadd(key, {'event': event, 'data': payload}, maxlen=settings['maxlen'], approximate=True)
+            pipe.expire(key, settings['ttl'])
+            return _text(pipe.execute()[0])
+
+        with _local_lock:
+            event_id = f"0-{next(_local_ids)}"
+            stream = _local_streams.setdefault(user_id, deque(maxlen=settings['maxlen']))
+            stream.append((event_id, event, payload))
+            return event_id
+    except Exception as e:
+        # Live delivery still works; only replay is lost
+        logger.warning("Could not record %s for user %s: %s", event, user_id, e)
+        return None
+
+
+def events_since(user_id, last_event_id):
+    """Events after ``last_event_id`` as ``(events, gap)``.
+
+    ``events`` is a list of ``(event_id, event, data)``; ``gap`` is True when
+    the buffer no longer reaches back to ``last_event_id``.
+    """
+    after = _id_tuple(last_event_id)
+    client = _redis()
+    if client is not None:
+        key = _stream_key(user_id)
+        entries = client.xrange(key, min=f"({last_event_id}", max='+')
+        first = client.xrange(key, min='-', max='+', count=1)
+        entries = [(_text(event_id), {_text(k): _text(v) for k, v in fields.items()}) for event_id, fields in entries]
+        events = [(event_id, fields['event'], json.loads(fields['data'])) for event_id, fields in entries]
+        oldest = _text(first[0][0]) if first else None
+    else:
+        with _local_lock:
+            stream = list(_local_streams.get(user_id, ()))
+        events = [(event_id, event, json.loads(payload)) for event_id, event, payload in stream if _id_tuple(event_id) > after]
+        oldest = stream[0][0] if stream else None
+
+    gap = oldest is None or _id_tuple(oldest) > after
+    return events, gap
@@ -0,0 +1,91 @@
+"""
+Project room membership for Socket.IO
+
+A user's project ids (owned or member) and email are loaded with one query
+when they connect and cached under ``socket:memberships:user_<id>`` for
+``SOCKET_MEMBERSHIP_TTL`` seconds, so reconnects and ``join_project_room``
+checks usually cost no database round-trip.
+
+Membership changes drop the cached set and are published on the
+``socket:membership`` Redis channel; every Socket.IO process subscribes and
+moves its own connections for that user into or out of the project room
+(see ``socket_utils.apply_membership_change``). Without Redis the change is
+applied in-process only.
+"""
+import json
+
+from sqlalchemy import or_
+
+from app import db
+from app.utils.cache_utils import cache
+from app.utils.logger import get_logger
+
+logger = get_logger('socket')
+
+MEMBERSHIP_CHANNEL = 'socket:membership'
+
+settings = {'ttl': 300}
+
+
+def configure_rooms(app):
+    settings['ttl'] = app.config.get('SOCKET_MEMBERSHIP_TTL', 300)
+
+
+def _cache_key(user_id):
+    return f"socket:memberships:user_{user_id}"
+
+
+def redis_client():
+    return getattr(cache.cache, '_write_client', None)
+
+
+def load_memberships(user_id):
+    """``(email, project_ids)`` for a user, or None if the user no longer exists."""
+    key = _cache_key(user_id)
+    try:
+        cached = cache.get(key)
+    except Exception as e:
+        logger.warning("Membership cache read failed for user %s: %s", user_id, e)
+        cached = None
+    if cached is not None:
+        return cached['email'], set(cached['project_ids'])
+
+    from app.models.user import User
+    from app.models.project import Project
+    from app.models.project_member import ProjectMember
+
+    member_of = db.select(ProjectMember.project_id).where(ProjectMember.user_id == int(user_id))
+    rows = db.session.query(User.email, Project.id)\
+        .outerjoin(Project, or_(Project.owner_id == User.id, Project.id.in_(member_of)))\
+        .filter(User.id == int(user_id))\
+        .all()
+    if not rows:
+        return None
+
+    email = rows[0][0]
+    project_ids = sorted({project_id for _, project_id in rows if project_id is not None})
+    try:
+        cache.set(key, {'email': email, 'project_ids': project_ids}, timeout=settings['ttl'])
+    except Exception as e:
+        logger.warning("Membership cache write failed for user %s: %s", user_id, e)
+    return email, set(project_ids)
+
+
+def membership_changed(user_id, project_id, joined):
+    """Record that a user gained or lost a project and update live room subscriptions."""
+    try:
+        cache.delete(_cache_key(user_id))
+    except Exception as e:
+        logger.warning("Membership cache invalidation failed for user %s: %s", user_id, e)
+
+    message = {'user_id': user_id, 'project_id': project_id, 'joined': joined}
+    client = redis_client()
+    if client is not None:
+        try:
+            client.publish(MEMBERSHIP_CHANNEL, json.dumps(message))
+            return
+        except Exception as e:
+            logger.warning("Membership publish failed, applying locally: %s", e)
+
+    from app.utils.socket_utils import apply_membership_change
+    apply_membership_change(message)
@@ -2,17 +2,26 @@
 """
 Socket.IO utilities for real-time communication
 """
-from flask import request
+from flask import current_app, request
 from flask_socketio import SocketIO, emit, join_room, leave_room, disconnect
 from flask_jwt_extended import decode_token
 from functools import wraps
 import json
+import os
 from datetime import datetime
 import logging
 
+from app.utils.metrics import record_room_join, record_room_leave
+from app.utils.socket_replay import configure_replay, record_event, events_since
+from app.utils.socket_rooms import MEMBERSHIP_CHANNEL, configure_rooms, load_memberships, redis_client
+from app.utils import presence
+
 # Initialize SocketIO (configured in __init__.py)
 socketio = None
 connected_users = {}  # sid -> user_id
+socket_rooms = {}  # sid -> rooms joined, for room size metrics
+viewing_tasks = {}  # sid -> task id the socket is viewing
+_membership_listener_pid = None  # Process running the membership subscriber
 
 # Configure logger
 logger = logging.getLogger('socketio')
@@ -31,14 +40,126 @@ def init_socketio(app):
         app,
         cors_allowed_origins="*",
         async_mode='threading',
-        logger=True,
-        engineio_logger=True
+        # Packet-level logging is costly at startup and per message; opt in
+        logger=app.config.get('SOCKETIO_LOGGING', False),
+        engineio_logger=app.config.get('SOCKETIO_LOGGING', False)
     )
+    configure_replay(app)
+    configure_rooms(app)
+    presence.configure_presence(app)
     register_socket_events()
     logger.info("SocketIO initialized")
     return socketio
 
 
+def _join_room(room, sid=None):
+    """Join a room and count the client in the room metrics.
+
+    Pass ``sid`` to move a connection other than the current one (outside
+    its event handler).
+    """
+    if sid is None:
+        join_room(room)
+        sid = request.sid
+    else:
+        socketio.server.enter_room(sid, room, namespace='/')
+    rooms = socket_rooms.setdefault(sid, set())
+    if room not in rooms:
+        rooms.add(room)
+        record_room_join(room)
+
+
+def _leave_room(room, sid):
+    socketio.server.leave_room(sid, room, namespace='/')
+    rooms = socket_rooms.get(sid, set())
+    if room in rooms:
+        rooms.discard(room)
+        record_room_leave(room)
+
+
+def _project_rooms(sid):
+    return [room for room in socket_rooms.get(sid, ()) if room.startswith('project_')]
+
+
+def _broadcast_task_viewers(task_id):
+    socketio.emit('task_viewers', {'task_id': task_id, 'user_ids': presence.task_viewers(task_id)}, room=f"task_{task_id}")
+
+
+def _stop_viewing(sid, user_id):
+    """Leave the task a socket was viewing, if any, and tell the remaining viewers."""
+    task_id = viewing_tasks.pop(sid, None)
+    if task_id is None:
+        return
+    socketio.server.leave_room(sid, f"task_{task_id}", namespace='/')
+    presence.leave_task(sid, user_id, task_id)
+    _broadcast_task_viewers(task_id)
+
+
+def apply_membership_change(message):
+    """Move this process's connections for a user into or out of a project room."""
+    user_id, project_id, joined = str(message['user_id']), message['project_id'], message['joined']
+    room = f"project_{project_id}"
+    for sid, connected_user in list(connected_users.items()):
+        if str(connected_user) != user_id:
+            continue
+        if joined:
+            _join_room(room, sid)
+            presence.connect(sid, connected_user, [room])
+            socketio.emit('room_joined', {'room': room, 'message': f'Added to project {project_id}'}, to=sid)
+        else:
+            _leave_room(room, sid)
+            presence.disconnect(sid, connected_user, [room])
+            socketio.emit('room_left', {'room': room, 'message': f'Removed from project {project_id}'}, to=sid)
+        logger.info(f"User {user_id} {'joined' if joined else 'left'} {room} (SID {sid})")
+
+
+def _listen_for_membership_changes(client):
+    pubsub = client.pubsub(ignore_subscribe_messages=True)
+    while True:
+        try:
+            pubsub.subscribe(MEMBERSHIP_CHANNEL)
+            for message in pubsub.listen():
+                try:
+                    apply_membership_change(json.loads(message['data']))
+                except Exception as e:
+                    logger.error(f"Bad membership message {message!r}: {e}", exc_info=True)
+        except Exception as e:
+            logger.warning(f"Membership subscriber disconnected, retrying: {e}")
+            socketio.sleep(5)
+
+
+def _ensure_membership_listener():
+    """Subscribe this process to membership changes, once (after any fork)."""
+    global _membership_listener_pid
+    if _membership_listener_pid == os.getpid():
+        return
+    _membership_listener_pid = os.getpid()
+    client = redis_client()
+    if client is not None:
+        socketio.start_background_task(_listen_for_membership_changes, client)
+
+
+def _replay_missed_events(user_id, last_event_id):
+    """Send the events a reconnecting client missed, then ``replay_complete``."""
+    try:
+        events, gap = events_since(user_id, last_event_id)
+    except ValueError:
+        emit('error', {'message': 'Invalid last_event_id'})
+        return
+    except Exception as e:
+        logger.error(f"Replay failed for user {user_id}: {e}", exc_info=True)
+        events, gap = [], True
+
+    for event_id, event, data in events:
+        emit(event, dict(data, event_id=event_id))
+    emit('replay_complete', {
+        'replayed': len(events),
+        'last_event_id': events[-1][0] if events else last_event_id,
+        'gap': gap
+    })
+    logger.info(f"Replayed {len(events)} missed events to user {user_id} (gap: {gap})")
+
+
 def authenticated_only(f):
     """Decorator to ensure user is connected and authenticated via SocketIO"""
     @wraps(f)
@@ -76,18 +197,28 @@ def register_socket_events():
             decoded_token = decode_token(token)
             user_id = decoded_token['sub']
 
-            connected_users[request.sid] = user_id
-            join_room(f"user_{user_id}")
+            # One cached lookup checks the user exists and lists their projects
+            membership = load_memberships(user_id)
+            if membership:
+                email, project_ids = membership
+                _ensure_membership_listener()
+                connected_users[request.sid] = user_id
+                _join_room(f"user_{user_id}")
+                for project_id in project_ids:
+                    _join_room(f"project_{project_id}")
+                presence.connect(request.sid, user_id, _project_rooms(request.sid))
 
-            from app.models.user import User
-            user = User.query.get(user_id)
-            if user:
                 emit('connected', {
-                    'message': f'Welcome {user.email}!',
+                    'message': f'Welcome {email}!',
                     'user_id': user_id,
-                    'room': f"user_{user_id}"
+                    'room': f"user_{user_id}",
+                    'project_rooms': [f"project_{project_id}" for project_id in sorted(project_ids)],
+                    'heartbeat_seconds': current_app.config.get('PRESENCE_HEARTBEAT_SECONDS', 25)
                 })
-                logger.info(f"User {user.email} (ID: {user_id}) connected with SID {request.sid}")
+                logger.info(f"User {email} (ID: {user_id}) connected with SID {request.sid}, {len(project_ids)} project rooms")
+                # Already in the user room, so nothing falls between replay and live events
+                if auth and isinstance(auth, dict) and auth.get('last_event_id'):
+                    _replay_missed_events(user_id, auth['last_event_id'])
             else:
                 emit('error', {'message': 'User not found'})
                 disconnect()
@@ -103,18 +234,94 @@ def register_socket_events():
     def handle_disconnect():
         """Handle client disconnection"""
         user_id = connected_users.pop(request.sid, None)
+        if user_id is not None:
+            presence.disconnect(request.sid, user_id, _project_rooms(request.sid))
+            _stop_viewing(request.sid, user_id)
+        for room in socket_rooms.pop(request.sid, ()):
+            record_room_leave(room)
         logger.info(f"Client disconnected: SID {request.sid}, User ID {user_id}")
 
 
+    @socketio.on('heartbeat')
+    @authenticated_only
+    def handle_heartbeat(data, user_id):
+        """Keep this socket's presence alive; send every PRESENCE_HEARTBEAT_SECONDS."""
+        presence.heartbeat(request.sid, user_id, _project_rooms(request.sid), viewing_tasks.get(request.sid))
+        return {'ttl': presence.settings['ttl']}
+
+
+    @socketio.on('view_task')
+    @authenticated_only
+    def handle_view_task(data, user_id):
+        """Start viewing a task: join its room and announce the current viewers."""
+        try:
+            task_id = int((data or {}).get('task_id'))
+        except (TypeError, ValueError):
+            emit('error', {'message': 'Task ID required'})
+            return
+
+        from app.models.task import Task
+        task = Task.query.with_entities(Task.project_id, Task.assigned_to_id, Task.created_by_id)\
+            .filter(Task.id == task_id).first()
+        membership = load_memberships(user_id)
+        allowed = task is not None and membership is not None and (
+            task.project_id in membership[1] or str(user_id) in (str(task.assigned_to_id), str(task.created_by_id))
+        )
+        if not allowed:
+            emit('error', {'message': 'Access denied to this task'})
+            return
+
+        if viewing_tasks.get(request.sid) != task_id:
+            _stop_viewing(request.sid, user_id)
+            viewing_tasks[request.sid] = task_id
+            join_room(f"task_{task_id}")
+        presence.view_task(request.sid, user_id, task_id, _project_rooms(request.sid))
+        _broadcast_task_viewers(task_id)
+
+
+    @socketio.on('leave_task')
+    @authenticated_only
+    def handle_leave_task(data, user_id):
+        _stop_viewing(request.sid, user_id)
+
+
+    @socketio.on('get_presence')
+    @authenticated_only
+    def handle_get_presence(data, user_id):
+        """Online users of a project, or whether given users are online."""
+        data = data or {}
+        if data.get('project_id'):
+            membership = load_memberships(user_id)
+            project_id = int(data['project_id'])
+            if not membership or project_id not in membership[1]:
+                emit('error', {'message': 'Access denied to this project'})
+                return
+            emit('presence', {'project_id': project_id, 'online_user_ids': presence.room_users(f"project_{project_id}")})
+        else:
+            user_ids = data.get('user_ids') or []
+            emit('presence', {'online': {str(uid): presence.is_online(uid) for uid in user_ids[:100]}})
+
+
     @socketio.on('join_user_room')
     @authenticated_only
     def handle_join_user_room(data, user_id):
         room = f"user_{user_id}"
-        join_room(room)
+        _join_room(room)
         emit('room_joined', {'room': room, 'message': 'Joined personal notification room'})
         logger.info(f"User {user_id} joined personal room: {room}")
 
 
+    @socketio.on('resume')
+    @authenticated_only
+    def handle_resume(data, user_id):
+        """Replay events missed since ``last_event_id`` (for clients that can't set connect auth)."""
+        last_event_id = (data or {}).get('last_event_id')
+        if not last_event_id:
+            emit('error', {'message': 'last_event_id required'})
+            return
+        _replay_missed_events(user_id, last_event_id)
+
+
     @socketio.on('join_project_room')
     @authenticated_only
     def handle_join_project_room(data, user_id):
@@ -124,9 +331,14 @@ def register_socket_events():
                 emit('error', {'message': 'Project ID required'})
                 return
 
-            # TODO: verify user access to project
+            membership = load_memberships(user_id)
+            if not membership or int(project_id) not in membership[1]:
+                emit('error', {'message': 'Access denied to this project'})
+                logger.warning(f"User {user_id} denied access to project room {project_id}")
+                return
+
             room = f"project_{project_id}"
-            join_room(room)
+            _join_room(room)
             emit('room_joined', {'room': room, 'message': f'Joined project {project_id} room'})
             logger.info(f"User {user_id} joined project room: {room}")
 
@@ -199,7 +411,8 @@ def register_socket_events():
 def broadcast_notification(user_id, notification_data):
     """Broadcast a notification to a specific user"""
     if socketio:
-        socketio.emit('new_notification', notification_data, room=f"user_{user_id}")
+        event_id = record_event(user_id, 'new_notification', notification_data)
+        socketio.emit('new_notification', dict(notification_data, event_id=event_id), room=f"user_{user_id}")
         logger.info(f"Notification sent to user {user_id}: {notification_data.get('title', 'No title')}")
 
 
@@ -216,7 +429,8 @@ def broadcast_task_update(task_data, project_id=None, assignee_id=None):
         if project_id:
             socketio.emit('task_updated', task_data, room=f"project_{project_id}")
         if assignee_id:
-            socketio.emit('task_updated', task_data, room=f"user_{assignee_id}")
+            event_id = record_event(assignee_id, 'task_updated', task_data)
+            socketio.emit('task_updated', dict(task_data, event_id=event_id), room=f"user_{assignee_id}")
         logger.info(f"Task update broadcast: Task ID {task_data.get('id', 'Unknown ID')}")
 
 
@@ -13,11 +13,48 @@ class BaseConfig:
     # JWT settings
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt-secret-key')
     JWT_ACCESS_TOKEN_EXPIRES = int(os.getenv('JWT_ACCESS_TOKEN_EXPIRES', 3600))
-    
+
+    # Password hashing settings (see app.utils.passwords)
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')  # werkzeug method:cost; old hashes upgrade on login
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 2))  # Hashing processes per app process; 0 = inline
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 32))  # Queued hashes before callers wait
+    PASSWORD_HASH_TIMEOUT = int(os.getenv('PASSWORD_HASH_TIMEOUT', 10))  # Seconds to wait for a slot, then for the hash, before 503
+
     # Database settings
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_RECORD_QUERIES = True
+
+    # Connection pool settings (turned into SQLALCHEMY_ENGINE_OPTIONS in create_app)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))  # Persistent connections per process
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))  # Extra connections allowed under burst
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 10))  # Seconds to wait for a connection before failing
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))  # Seconds; recycle before RDS/NAT idle timeouts
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'True').lower() == 'true'  # Detect stale connections on checkout
+    DB_POOL_USE_LIFO = os.getenv('DB_POOL_USE_LIFO', 'True').lower() == 'true'  # Let idle connections age out
+    DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'False').lower() == 'true'  # NullPool, no prepared statements
+
+    # Read replica settings (unset = all queries on the primary)
+    REPLICA_DATABASE_URI = os.getenv('REPLICA_DATABASE_URI')  # GET requests and analytics read from here
+    REPLICA_STICKY_SECONDS = int(os.getenv('REPLICA_STICKY_SECONDS', 5))  # Pin a user to the primary after a write
+
+    # Query profiler settings (reads the queries recorded above)
+    # Server-Timing exposes DB timings and query counts to any caller: on by default only in development
+    QUERY_PROFILER_ENABLED = os.getenv('QUERY_PROFILER_ENABLED', str(os.getenv('FLASK_ENV', 'production') == 'development')).lower() == 'true'
+    QUERY_SLOW_MS = float(os.getenv('QUERY_SLOW_MS', 100))  # Statements at or above this are logged as slow
+    QUERY_N_PLUS_ONE_THRESHOLD = int(os.getenv('QUERY_N_PLUS_ONE_THRESHOLD', 5))  # Repeats of one statement shape per request
+    QUERY_PROFILER_SLOWEST = int(os.getenv('QUERY_PROFILER_SLOWEST', 3))  # Slowest statements kept per request
     
+    # Startup settings
+    LOG_ROUTES = os.getenv('LOG_ROUTES', 'False').lower() == 'true'  # Log every route when the app is created
+    STARTUP_DB_CHECK = os.getenv('STARTUP_DB_CHECK', 'False').lower() == 'true'  # SELECT 1 when wsgi.py is imported
+    SOCKETIO_ENABLED = os.getenv('SOCKETIO_ENABLED', 'True').lower() == 'true'  # Off for CLI/worker-only processes
+    SOCKETIO_LOGGING = os.getenv('SOCKETIO_LOGGING', 'False').lower() == 'true'  # socketio/engineio packet logs
+    SOCKET_REPLAY_MAXLEN = int(os.getenv('SOCKET_REPLAY_MAXLEN', 200))  # Events kept per user for reconnect replay; 0 = off
+    SOCKET_REPLAY_TTL = int(os.getenv('SOCKET_REPLAY_TTL', 86400))  # Seconds an idle user's buffer is kept
+    SOCKET_MEMBERSHIP_TTL = int(os.getenv('SOCKET_MEMBERSHIP_TTL', 300))  # Seconds a user's project room set is cached
+    PRESENCE_TTL = int(os.getenv('PRESENCE_TTL', 60))  # Seconds a socket stays present without a heartbeat
+    PRESENCE_HEARTBEAT_SECONDS = int(os.getenv('PRESENCE_HEARTBEAT_SECONDS', 25))  # Sent to clients in `connected`
+
     # CORS settings
     CORS_HEADERS = 'Content-Type,Authorization'
 
@@ -25,6 +62,9 @@ class BaseConfig:
     # Logging settings
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_TO_STDOUT = os.getenv('LOG_TO_STDOUT', 'true').lower() == 'true'
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'text')  # 'text' or 'json' (one object per line)
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))  # Records buffered for the writer thread; extra are dropped
+    LOG_SAMPLING = os.getenv('LOG_SAMPLING', '')  # DEBUG sampling per logger, e.g. 'app.db=0.1,app.cache=0.05'
 
     # ✅ ADD CACHING CONFIGURATION
     # Redis/Caching settings
@@ -32,6 +72,42 @@ class BaseConfig:
     CACHE_TYPE = os.getenv('CACHE_TYPE', 'RedisCache')
     CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
     CACHE_DEFAULT_TIMEOUT = int(os.getenv('CACHE_DEFAULT_TIMEOUT', 300))  # 5 minutes
+
+    # Response compression settings
+    COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'True').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))  # Bytes; smaller bodies are sent as-is
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))  # gzip level 1-9
+    COMPRESS_BR_LEVEL = int(os.getenv('COMPRESS_BR_LEVEL', 4))  # brotli quality 0-11
+    COMPRESS_ALGORITHMS = tuple(os.getenv('COMPRESS_ALGORITHMS', 'br,gzip').split(','))  # Preference order
+    COMPRESS_MIMETYPES = ('application/json',)
+
+    # Metrics settings (/metrics; set PROMETHEUS_MULTIPROC_DIR when running several workers)
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True').lower() == 'true'
+    METRICS_ALLOWED_NETWORKS = os.getenv('METRICS_ALLOWED_NETWORKS', '127.0.0.0/8,::1/128')  # CIDRs that may scrape /metrics
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')  # Bearer token that may scrape from anywhere; empty = networks only
+
+    # Task hierarchy settings
+    TASK_TREE_MAX_DEPTH = int(os.getenv('TASK_TREE_MAX_DEPTH', 10))  # Upper bound for subtree/ancestor queries
+
+    # Kanban board settings (/api/projects/<id>/board)
+    BOARD_COLUMN_LIMIT = int(os.getenv('BOARD_COLUMN_LIMIT', 20))  # Cards per status column by default
+    BOARD_MAX_COLUMN_LIMIT = int(os.getenv('BOARD_MAX_COLUMN_LIMIT', 100))  # Upper bound for ?limit=
+
+    # Incremental sync settings (/api/sync, change_log table)
+    SYNC_ENABLED = os.getenv('SYNC_ENABLED', 'True').lower() == 'true'  # Record changes on every flush
+    SYNC_PAGE_SIZE = int(os.getenv('SYNC_PAGE_SIZE', 500))  # Change log entries per response by default
+    SYNC_MAX_PAGE_SIZE = int(os.getenv('SYNC_MAX_PAGE_SIZE', 2000))  # Upper bound for ?limit=
+    SYNC_RETENTION_DAYS = int(os.getenv('SYNC_RETENTION_DAYS', 30))  # Older tokens get 410 (full reload)
+
+    # Dashboard settings (/api/dashboard)
+    DASHBOARD_WORKERS = int(os.getenv('DASHBOARD_WORKERS', 4))  # Section threads per process, shared by all requests; 1 = inline
+    DASHBOARD_TASK_LIMIT = int(os.getenv('DASHBOARD_TASK_LIMIT', 10))  # Tasks per list by default (max 50)
+    DASHBOARD_CACHE_TTL = int(os.getenv('DASHBOARD_CACHE_TTL', 60))  # Seconds; tag invalidation usually comes first
+
+    # Overdue/escalation scanner settings (manage.py scan_overdue)
+    OVERDUE_SCAN_INTERVAL = int(os.getenv('OVERDUE_SCAN_INTERVAL', 60))  # Seconds between passes with --loop
+    OVERDUE_SCAN_BATCH_SIZE = int(os.getenv('OVERDUE_SCAN_BATCH_SIZE', 500))  # Tasks flagged per transaction
+    OVERDUE_SCAN_LOCK_TIMEOUT = int(os.getenv('OVERDUE_SCAN_LOCK_TIMEOUT', 300))  # Seconds; one scanner at a time across hosts
     
     @classmethod
     def init_app(cls, app):
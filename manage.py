@@ -8,19 +8,23 @@ import os
 import sys
 import click
 from pathlib import Path
-from sqlalchemy import inspect
 
 # Add project root to Python path
 project_root = Path(__file__).parent.absolute()
 sys.path.insert(0, str(project_root))
 
 
-def get_minimal_app(env='development'):
-    """Minimal Flask app for DB operations only (no blueprints, no socketio, no logging)"""
+def get_minimal_app(env='development', load_models=True):
+    """Minimal Flask app for DB operations only (no blueprints, no socketio, no logging)
+
+    Commands that only inspect the schema pass ``load_models=False`` to skip
+    importing every model module.
+    """
     from dotenv import load_dotenv
     from flask import Flask
     from app import db
-    import app.models  # ensures all models are imported
+    if load_models:
+        import app.models  # ensures all models are imported
     from config import get_config
 
     # Load environment variables
@@ -58,6 +62,7 @@ def create_db(env):
             print("✅ All tables created successfully!")
 
             # Show tables
+            from sqlalchemy import inspect
             inspector = inspect(db.engine)
             tables = inspector.get_table_names()
             print(f"📊 Tables: {', '.join(tables) if tables else 'None found'}")
@@ -96,6 +101,7 @@ def reset_db(env):
             print("✅ Recreated tables")
 
             # Show result
+            from sqlalchemy import inspect
             inspector = inspect(db.engine)
             tables = inspector.get_table_names()
             print(f"📊 Tables: {', '.join(tables) if tables else 'None found'}")
@@ -107,10 +113,11 @@ def reset_db(env):
 @click.option('--env', default='development', help='Environment to use')
 def show_tables(env):
     """Show all tables"""
-    app = get_minimal_app(env)
+    app = get_minimal_app(env, load_models=False)
     with app.app_context():
         from app import db
         try:
+            from sqlalchemy import inspect
             inspector = inspect(db.engine)
             tables = inspector.get_table_names()
 
@@ -124,6 +131,65 @@ def show_tables(env):
             print(f"❌ Failed: {e}")
 
 
+@cli.command()
+@click.option('--env', default='development', help='Environment to use')
+def recompute_rollups(env):
+    """Rebuild task/sprint/project hour rollups"""
+    app = get_minimal_app(env)
+    with app.app_context():
+        from app.models.task import Task
+        try:
+            count = Task.recompute_hour_rollups()
+            print(f"✅ Recomputed hour rollups for {count} tasks")
+        except Exception as e:
+            print(f"❌ Failed: {e}")
+
+
+@cli.command()
+@click.option('--env', default='development', help='Environment to use')
+@click.option('--days', type=int, default=None, help='Keep this many days (default: SYNC_RETENTION_DAYS)')
+def prune_change_log(env, days):
+    """Delete old /api/sync change log entries"""
+    app = get_minimal_app(env)
+    with app.app_context():
+        from app.services.sync_service import SyncService
+        try:
+            count = SyncService.prune_change_log(days)
+            print(f"✅ Pruned {count} change log entries")
+        except Exception as e:
+            print(f"❌ Failed: {e}")
+
+
+@cli.command()
+@click.option('--env', default='development', help='Environment to use')
+@click.option('--loop', is_flag=True, help='Keep scanning every OVERDUE_SCAN_INTERVAL seconds')
+def scan_overdue(env, loop):
+    """Flag overdue tasks and send overdue/escalation notifications"""
+    import time
+    app = get_minimal_app(env)
+    # Notifications must reach the sync feed and bump dashboard cache tags
+    from app.utils.cache_utils import init_cache
+    from app.utils.change_feed import init_change_feed
+    init_cache(app)
+    init_change_feed(app)
+
+    with app.app_context():
+        from app.services.overdue_service import OverdueService
+        while True:
+            try:
+                result = OverdueService.scan()
+                if result is None:
+                    print("⏭️ Another scanner is running")
+                else:
+                    print(f"✅ Cleared {result['cleared']}, flagged {result['flagged']}, "
+                          f"escalated {result['escalated']}, {result['notifications']} notifications")
+            except Exception as e:
+                print(f"❌ Failed: {e}")
+            if not loop:
+                break
+            time.sleep(app.config.get('OVERDUE_SCAN_INTERVAL', 60))
+
+
 @cli.command()
 @click.option('--env', default='development', help='Environment to use')
 def run(env):
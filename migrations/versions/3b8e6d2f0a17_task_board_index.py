@@ -0,0 +1,26 @@
+"""task board index
+
+Revision ID: 3b8e6d2f0a17
+Revises: 7c2f4a91d3e5
+Create Date: 2026-10-19 14:02:37.551902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b8e6d2f0a17'
+down_revision = '7c2f4a91d3e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.create_index('ix_task_project_status', ['project_id', 'status'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_project_status')
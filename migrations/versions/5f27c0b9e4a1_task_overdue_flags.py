@@ -0,0 +1,50 @@
+"""task overdue flags
+
+Revision ID: 5f27c0b9e4a1
+Revises: e6a3f18c4d92
+Create Date: 2026-10-19 18:47:12.604318
+
+"""
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5f27c0b9e4a1'
+down_revision = 'e6a3f18c4d92'
+branch_labels = None
+depends_on = None
+
+# TASK_PRIORITY_CONFIG escalation_hours at the time of this migration
+ESCALATION_HOURS = {'CRITICAL': 4, 'HIGH': 24, 'MEDIUM': 72, 'LOW': 168}
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('overdue_since', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('escalated_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_task_due_date', ['due_date'], unique=False)
+        batch_op.create_index('ix_task_overdue_since', ['overdue_since'], unique=False)
+
+    # Mark tasks that are already overdue (and escalation-due) as notified, so
+    # the scanner's first pass does not notify the whole backlog
+    task = sa.table('task', sa.column('due_date', sa.DateTime()), sa.column('status', sa.String()),
+                    sa.column('priority', sa.String()), sa.column('overdue_since', sa.DateTime()),
+                    sa.column('escalated_at', sa.DateTime()))
+    now = datetime.utcnow()
+    open_overdue = sa.and_(task.c.due_date < now, task.c.status.notin_(['DONE', 'CANCELLED']))
+    op.execute(task.update().where(open_overdue).values(overdue_since=now))
+    for priority, hours in ESCALATION_HOURS.items():
+        op.execute(task.update().where(
+            open_overdue, task.c.priority == priority, task.c.due_date < now - timedelta(hours=hours)
+        ).values(escalated_at=now))
+
+
+def downgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_index('ix_task_overdue_since')
+        batch_op.drop_index('ix_task_due_date')
+        batch_op.drop_column('escalated_at')
+        batch_op.drop_column('overdue_since')
@@ -0,0 +1,64 @@
+"""maintained hour rollups
+
+Revision ID: 7c2f4a91d3e5
+Revises: 0e51fd3ecd4b
+Create Date: 2026-10-19 10:12:04.118273
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c2f4a91d3e5'
+down_revision = '0e51fd3ecd4b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('subtree_actual_hours', sa.Float(), server_default='0', nullable=True))
+
+    with op.batch_alter_table('sprint', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('actual_hours', sa.Float(), server_default='0', nullable=True))
+
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('actual_hours', sa.Float(), server_default='0', nullable=True))
+
+    # Backfill the rollups from the existing per-task totals
+    op.execute("""
+        WITH RECURSIVE tree(ancestor_id, task_id) AS (
+            SELECT id, id FROM task
+            UNION ALL
+            SELECT tree.ancestor_id, task.id FROM task JOIN tree ON task.parent_task_id = tree.task_id
+        )
+        UPDATE task SET subtree_actual_hours = totals.hours
+        FROM (
+            SELECT tree.ancestor_id, COALESCE(SUM(t.actual_hours), 0) AS hours
+            FROM tree JOIN task t ON t.id = tree.task_id
+            GROUP BY tree.ancestor_id
+        ) AS totals
+        WHERE task.id = totals.ancestor_id
+    """)
+    op.execute("""
+        UPDATE sprint SET actual_hours = (
+            SELECT COALESCE(SUM(task.actual_hours), 0) FROM task WHERE task.sprint_id = sprint.id
+        )
+    """)
+    op.execute("""
+        UPDATE project SET actual_hours = (
+            SELECT COALESCE(SUM(task.actual_hours), 0) FROM task WHERE task.project_id = project.id
+        )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_column('actual_hours')
+
+    with op.batch_alter_table('sprint', schema=None) as batch_op:
+        batch_op.drop_column('actual_hours')
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_column('subtree_actual_hours')
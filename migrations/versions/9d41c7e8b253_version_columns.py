@@ -0,0 +1,32 @@
+"""task and sprint version columns
+
+Revision ID: 9d41c7e8b253
+Revises: 3b8e6d2f0a17
+Create Date: 2026-10-19 15:21:48.306114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d41c7e8b253'
+down_revision = '3b8e6d2f0a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+    with op.batch_alter_table('sprint', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('sprint', schema=None) as batch_op:
+        batch_op.drop_column('version')
+
+    with op.batch_alter_table('task', schema=None) as batch_op:
+        batch_op.drop_column('version')
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Endpoint Benchmark Harness
+
+Drives key read endpoints and reports latency percentiles (p50/p95/p99) and
+SQL queries per request, for regression tracking against synthetic data
+(see scripts/generate_synthetic_data.py).
+
+Two modes:
+- in-process (default): the Flask test client; queries are counted with an
+  engine listener
+- --url: a running server such as a local gunicorn; queries are read from
+  the Server-Timing header added by the query profiler
+
+Run with:
+    python scripts/benchmark_endpoints.py --requests 200 --json results.json
+    python scripts/benchmark_endpoints.py --url http://localhost:8000 --compare results.json
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import time
+import urllib.error
+import urllib.request
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+DEFAULT_ENDPOINTS = [
+    '/api/tasks?per_page=50',
+    '/api/tasks?per_page=50&fields=title,status,priority,assigned_to.name',
+    '/api/tasks/overdue',
+    '/api/projects',
+    '/api/projects/recent',
+    '/api/notifications',
+    '/api/notifications/summary',
+    '/api/analytics/task-status-distribution',
+    '/api/enums',
+]
+
+_SERVER_TIMING_QUERIES = re.compile(r'db;[^,]*desc="(\d+) queries"')
+
+
+def percentile(samples, pct):
+    if len(samples) < 2:
+        return samples[0] if samples else 0.0
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1]
+
+
+def summarize(endpoint, latencies_ms, query_counts, errors):
+    return {
+        'endpoint': endpoint,
+        'requests': len(latencies_ms),
+        'errors': errors,
+        'p50_ms': round(percentile(latencies_ms, 50), 2),
+        'p95_ms': round(percentile(latencies_ms, 95), 2),
+        'p99_ms': round(percentile(latencies_ms, 99), 2),
+        'mean_ms': round(statistics.fmean(latencies_ms), 2) if latencies_ms else 0.0,
+        'queries_per_request': round(statistics.fmean(query_counts), 1) if query_counts else None,
+    }
+
+
+def run_in_process(args, endpoints):
+    from flask_jwt_extended import create_access_token
+    from sqlalchemy import event
+
+    from app import create_app, db
+    from app.models.user import User
+    from config import get_config
+
+    app = create_app(get_config(args.env))
+    results = []
+
+    with app.app_context():
+        user = User.query.filter_by(email=args.email).first()
+        if not user:
+            sys.exit(f"❌ User {args.email} not found (run generate_synthetic_data.py first)")
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+        statements = []
+        def count_statement(*_):
+            statements.append(1)
+        event.listen(db.engine, 'before_cursor_execute', count_statement)
+
+        client = app.test_client()
+        for endpoint in endpoints:
+            for _ in range(args.warmup):
+                client.get(endpoint, headers=headers)
+
+            latencies, query_counts, errors = [], [], 0
+            for _ in range(args.requests):
+                statements.clear()
+                start = time.perf_counter()
+                response = client.get(endpoint, headers=headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+                query_counts.append(len(statements))
+                if response.status_code >= 400:
+                    errors += 1
+            results.append(summarize(endpoint, latencies, query_counts, errors))
+            print_row(results[-1])
+
+        event.remove(db.engine, 'before_cursor_execute', count_statement)
+    return results
+
+
+def login(base_url, email, password):
+    request = urllib.request.Request(
+        f"{base_url}/api/auth/login",
+        data=json.dumps({'email': email, 'password': password}).encode(),
+        headers={'Content-Type': 'application/json'},
+        method='POST'
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())['data']['access_token']
+
+
+def run_http(args, endpoints):
+    token = args.token or login(args.url, args.email, args.password)
+    headers = {'Authorization': f'Bearer {token}', 'Accept-Encoding': 'gzip'}
+    results = []
+
+    for endpoint in endpoints:
+        latencies, query_counts, errors = [], [], 0
+        for n in range(args.warmup + args.requests):
+            request = urllib.request.Request(f"{args.url}{endpoint}", headers=headers)
+            failed = False
+            start = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request) as response:
+                    response.read()
+                    server_timing = response.headers.get('Server-Timing', '')
+            except urllib.error.HTTPError as e:
+                server_timing = e.headers.get('Server-Timing', '')
+                failed = True
+            elapsed = (time.perf_counter() - start) * 1000
+            if n < args.warmup:
+                continue
+            errors += failed
+            latencies.append(elapsed)
+            match = _SERVER_TIMING_QUERIES.search(server_timing)
+            if match:
+                query_counts.append(int(match.group(1)))
+        results.append(summarize(endpoint, latencies, query_counts, errors))
+        print_row(results[-1])
+    return results
+
+
+def print_row(row):
+    queries = '-' if row['queries_per_request'] is None else row['queries_per_request']
+    print(f"  {row['endpoint'][:60]:60} {row['p50_ms']:8.1f} {row['p95_ms']:8.1f} {row['p99_ms']:8.1f} "
+          f"{queries:>8} {row['errors']:>6}")
+
+
+def compare(results, baseline_path, threshold):
+    """Print endpoints whose p95 or query count regressed against a saved run."""
+    with open(baseline_path) as f:
+        baseline = {row['endpoint']: row for row in json.load(f)['results']}
+
+    regressions = 0
+    print(f"\n📈 Compared with {baseline_path} (threshold {threshold:.0%})")
+    for row in results:
+        before = baseline.get(row['endpoint'])
+        if not before:
+            continue
+        if before['p95_ms'] and row['p95_ms'] > before['p95_ms'] * (1 + threshold):
+            regressions += 1
+            print(f"  ⚠️  {row['endpoint']}: p95 {before['p95_ms']} -> {row['p95_ms']} ms")
+        if before.get('queries_per_request') is not None and row['queries_per_request'] is not None \
+                and row['queries_per_request'] > before['queries_per_request']:
+            regressions += 1
+            print(f"  ⚠️  {row['endpoint']}: queries {before['queries_per_request']} -> {row['queries_per_request']}")
+    if not regressions:
+        print("  ✅ No regressions")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark API endpoints')
+    parser.add_argument('--env', default='development', help='Config environment (in-process mode)')
+    parser.add_argument('--url', help='Base URL of a running server, e.g. http://localhost:8000')
+    parser.add_argument('--email', default='user0@synthetic.example')
+    parser.add_argument('--password', default='benchmark123')
+    parser.add_argument('--token', help='Bearer token to use instead of logging in (--url mode)')
+    parser.add_argument('--endpoint', action='append', dest='endpoints', help='Endpoint to benchmark (repeatable)')
+    parser.add_argument('--requests', type=int, default=100, help='Measured requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=5, help='Unmeasured requests per endpoint')
+    parser.add_argument('--json', help='Write results to this file')
+    parser.add_argument('--compare', help='Results file from an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed p95 slowdown when comparing')
+    args = parser.parse_args()
+
+    endpoints = args.endpoints or DEFAULT_ENDPOINTS
+    mode = args.url or 'flask test client'
+    print(f"📊 Benchmarking {len(endpoints)} endpoints via {mode}, {args.requests} requests each\n")
+    print(f"  {'endpoint':60} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'errors':>6}")
+
+    results = run_http(args, endpoints) if args.url else run_in_process(args, endpoints)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'mode': mode, 'requests': args.requests, 'results': results}, f, indent=2)
+        print(f"\n💾 Results written to {args.json}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
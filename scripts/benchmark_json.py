@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+JSON Serialization Benchmark
+
+Measures the cost of encoding task list payloads with the standard library
+encoder (as Flask's default provider calls it) against orjson, and the size of
+the encoded body raw, gzipped and brotli-compressed.
+
+Run with: python scripts/benchmark_json.py [--tasks 1000] [--rounds 50]
+"""
+import argparse
+import gzip
+import json
+import random
+import time
+from datetime import datetime, timedelta
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def make_user(user_id):
+    return {
+        'id': user_id,
+        'name': f'User {user_id}',
+        'email': f'user{user_id}@example.com',
+        'role': 'developer',
+        'avatar_url': None,
+        'bio': 'Works on the task management system',
+        'is_active': True,
+        'created_at': datetime(2024, 1, 1).isoformat(),
+    }
+
+
+def make_task(task_id):
+    """Build a dict shaped like Task.to_dict()."""
+    now = datetime(2024, 6, 1) + timedelta(minutes=task_id)
+    return {
+        'id': task_id,
+        'title': f'Task {task_id}: implement feature',
+        'description': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * 3,
+        'status': random.choice(['TODO', 'IN_PROGRESS', 'IN_REVIEW', 'DONE']),
+        'priority': random.choice(['LOW', 'MEDIUM', 'HIGH', 'CRITICAL']),
+        'task_type': 'FEATURE',
+        'assigned_to': make_user(task_id % 50),
+        'created_by': make_user(task_id % 7),
+        'project': {'id': task_id % 20, 'name': f'Project {task_id % 20}', 'status': 'ACTIVE'},
+        'sprint': None,
+        'due_date': (now + timedelta(days=7)).isoformat(),
+        'start_date': now.isoformat(),
+        'completion_date': None,
+        'estimated_hours': 8.0,
+        'actual_hours': round(random.random() * 10, 2),
+        'subtree_actual_hours': 0.0,
+        'story_points': random.choice([1, 2, 3, 5, 8]),
+        'estimation_unit': 'HOURS',
+        'labels': ['backend', 'api'],
+        'acceptance_criteria': None,
+        'parent_task_id': None,
+        'created_at': now.isoformat(),
+        'updated_at': now.isoformat(),
+        'comments_count': task_id % 5,
+        'attachments_count': 0,
+        'time_logs_count': task_id % 3,
+    }
+
+
+def stdlib_dumps(payload):
+    # Same arguments Flask's DefaultJSONProvider uses for compact responses
+    return json.dumps(payload, ensure_ascii=True, sort_keys=True, separators=(',', ':')).encode()
+
+
+def orjson_dumps(payload):
+    return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME)
+
+
+def time_per_call(func, payload, rounds):
+    func(payload)  # warm up
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func(payload)
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark JSON encoding of task payloads')
+    parser.add_argument('--tasks', type=int, default=1000, help='Tasks per payload')
+    parser.add_argument('--rounds', type=int, default=50, help='Encodings per encoder')
+    args = parser.parse_args()
+
+    random.seed(42)
+    payload = {
+        'success': True,
+        'message': 'Tasks retrieved successfully',
+        'data': [make_task(i) for i in range(1, args.tasks + 1)],
+        'timestamp': datetime(2024, 6, 1).isoformat(),
+    }
+    per_thousand = 1000 / args.tasks
+
+    print(f"📊 Encoding {args.tasks} tasks, {args.rounds} rounds\n")
+
+    encoders = [('stdlib json', stdlib_dumps)]
+    if orjson is not None:
+        encoders.append(('orjson', orjson_dumps))
+    else:
+        print("⚠️  orjson not installed, skipping")
+
+    baseline = None
+    for name, func in encoders:
+        seconds = time_per_call(func, payload, args.rounds)
+        ms = seconds * 1000 * per_thousand
+        baseline = baseline or ms
+        print(f"  {name:12} {ms:8.2f} ms per 1,000 tasks  ({baseline / ms:.1f}x)")
+
+    body = orjson_dumps(payload) if orjson is not None else stdlib_dumps(payload)
+    print("\n📦 Body size per 1,000 tasks")
+    print(f"  {'raw':12} {len(body) * per_thousand / 1024:8.1f} KiB")
+
+    for level in (1, 6, 9):
+        seconds = time_per_call(lambda b: gzip.compress(b, compresslevel=level, mtime=0), body, 10)
+        size = len(gzip.compress(body, compresslevel=level, mtime=0))
+        print(f"  {'gzip -' + str(level):12} {size * per_thousand / 1024:8.1f} KiB  {seconds * 1000 * per_thousand:6.2f} ms")
+
+    if brotli is not None:
+        for quality in (1, 4, 11):
+            seconds = time_per_call(lambda b: brotli.compress(b, quality=quality), body, 3)
+            size = len(brotli.compress(body, quality=quality))
+            print(f"  {'br q' + str(quality):12} {size * per_thousand / 1024:8.1f} KiB  {seconds * 1000 * per_thousand:6.2f} ms")
+    else:
+        print("  ⚠️  brotli not installed, skipping")
+
+
+if __name__ == '__main__':
+    main()
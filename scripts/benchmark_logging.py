@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Logging Overhead Benchmark
+
+Measures what the per-request log helpers cost the calling thread: writing
+straight to a RotatingFileHandler (the old setup) against the queued
+pipeline, with and without DEBUG sampling.
+
+Run with:
+    python scripts/benchmark_logging.py
+    python scripts/benchmark_logging.py --calls 50000 --sampling app.db=0.1
+"""
+import argparse
+import logging
+import logging.handlers
+import os
+import sys
+import tempfile
+import time
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from flask import Flask
+
+from app.utils import logger as app_logging
+
+
+def run_calls(calls):
+    """Time the helpers a typical request hits; returns microseconds per call."""
+    started = time.perf_counter()
+    for i in range(calls):
+        app_logging.log_api_request('/api/tasks', 'GET', user_id=i, ip='10.0.0.1')
+        app_logging.log_db_query('SELECT', 'tasks', duration_ms=1.5)
+        app_logging.log_cache_operation('get', f'tasks:{i}', hit=i % 2 == 0)
+    return (time.perf_counter() - started) * 1_000_000 / (calls * 3)
+
+
+def direct_setup(log_dir, level):
+    """The previous layout: every app logger writes to its own file handler inline."""
+    handler = logging.handlers.RotatingFileHandler(os.path.join(log_dir, 'direct.log'), maxBytes=10*1024*1024)
+    handler.setFormatter(logging.Formatter('%(asctime)s | %(levelname)-8s | %(name)s | %(funcName)s:%(lineno)d | %(message)s'))
+    for name in ('app', 'app.api', 'app.db', 'app.cache'):
+        logger = logging.getLogger(name)
+        logger.handlers = [handler] if name == 'app' else []
+        logger.filters = []
+        logger.setLevel(level)
+    return handler
+
+
+def queued_setup(log_dir, level, sampling):
+    app = Flask(__name__, instance_path=os.path.join(log_dir, 'instance'))
+    app.config.update(LOG_LEVEL=logging.getLevelName(level), LOG_SAMPLING=sampling)
+    app_logging.setup_logging(app)
+    # Keep the console out of the measurement
+    handlers, queue_size = app_logging._listener_config
+    app_logging.stop_logging()
+    app_logging._listener_config = (handlers[1:], queue_size)
+    app_logging._start_listener()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-request logging overhead')
+    parser.add_argument('--calls', type=int, default=20000, help='Simulated requests per scenario')
+    parser.add_argument('--sampling', default='app.db=0.1,app.cache=0.1', help='LOG_SAMPLING for the sampled run')
+    args = parser.parse_args()
+
+    print(f"📝 Logging cost on the request thread, {args.calls} requests x 3 calls\n")
+    print(f"  {'scenario':32} {'µs/call':>8}")
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        for level in (logging.INFO, logging.DEBUG):
+            label = logging.getLevelName(level)
+
+            handler = direct_setup(log_dir, level)
+            print(f"  {'direct file, ' + label:32} {run_calls(args.calls):8.2f}")
+            handler.close()
+
+            queued_setup(log_dir, level, '')
+            print(f"  {'queued, ' + label:32} {run_calls(args.calls):8.2f}")
+            app_logging.stop_logging()
+
+        queued_setup(log_dir, logging.DEBUG, args.sampling)
+        print(f"  {'queued, DEBUG sampled':32} {run_calls(args.calls):8.2f}")
+        app_logging.stop_logging()
+        print(f"\n  Dropped by the queue: {app_logging._queue_handler.dropped}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Password Hashing Benchmark
+
+Measures logins per second (one verification each) for werkzeug hash
+methods, first on a single core and then through the password pool with
+several workers, to help pick PASSWORD_HASH_METHOD and
+PASSWORD_HASH_WORKERS for a login storm.
+
+Run with:
+    python scripts/benchmark_password_hashing.py
+    python scripts/benchmark_password_hashing.py --method scrypt:16384:8:1 --method pbkdf2:sha256:600000 --workers 4
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from flask import Flask
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from app.utils import passwords
+
+DEFAULT_METHODS = ['scrypt:32768:8:1', 'scrypt:16384:8:1', 'pbkdf2:sha256:600000', 'pbkdf2:sha256:260000']
+PASSWORD = 'benchmark123'
+
+
+def single_core_rate(password_hash, seconds):
+    count = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        check_password_hash(password_hash, PASSWORD)
+        count += 1
+    return count / (time.perf_counter() - started)
+
+
+def pool_rate(app, password_hash, workers, seconds):
+    """Logins/s when many request threads verify through the password pool."""
+    app.config['PASSWORD_HASH_WORKERS'] = workers
+    app.config['PASSWORD_HASH_MAX_PENDING'] = workers * 4
+
+    def login_loop(deadline):
+        done = 0
+        with app.app_context():
+            while time.perf_counter() < deadline:
+                passwords.verify_password(password_hash, PASSWORD)
+                done += 1
+        return done
+
+    with app.app_context():
+        # Start the pool outside the measured window
+        passwords.verify_password(password_hash, PASSWORD)
+
+    started = time.perf_counter()
+    deadline = started + seconds
+    with ThreadPoolExecutor(max_workers=workers * 4) as clients:
+        total = sum(clients.map(login_loop, [deadline] * workers * 4))
+    rate = total / (time.perf_counter() - started)
+    passwords.shutdown_pool()
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark password hashing methods')
+    parser.add_argument('--method', action='append', dest='methods', help='werkzeug method string (repeatable)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Password pool size')
+    parser.add_argument('--seconds', type=float, default=3.0, help='Measuring time per method')
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    methods = args.methods or DEFAULT_METHODS
+    print(f"🔐 Logins/s per method, {args.seconds}s each, pool of {args.workers} workers\n")
+    print(f"  {'method':28} {'hash ms':>8} {'1 core':>8} {'pool':>8}")
+
+    for method in methods:
+        started = time.perf_counter()
+        password_hash = generate_password_hash(PASSWORD, method)
+        hash_ms = (time.perf_counter() - started) * 1000
+
+        per_core = single_core_rate(password_hash, args.seconds)
+        pooled = pool_rate(app, password_hash, args.workers, args.seconds)
+        print(f"  {method:28} {hash_ms:8.1f} {per_core:8.1f} {pooled:8.1f}")
+
+    print("\n💡 Logins/s per core is the 1-core column; the pool column shows how far it scales on this machine")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Startup Time Benchmark
+
+Times cold starts in fresh interpreters: importing the app package, building
+the app with create_app (what gunicorn --preload does once), importing
+wsgi.py and running a manage.py command. Use --budget-ms to fail when a
+stage's median gets slower, and --importtime to list the slowest imports.
+
+Run with:
+    python scripts/benchmark_startup.py --runs 5
+    python scripts/benchmark_startup.py --budget-ms create_app=1500 --budget-ms cli=600
+    python scripts/benchmark_startup.py --importtime 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Each stage prints its own elapsed milliseconds, so interpreter start-up is
+# reported separately from the work being measured.
+_TIMED = "import time; _t = time.perf_counter(); {code}; print((time.perf_counter() - _t) * 1000)"
+
+STAGES = {
+    'import_app': _TIMED.format(code="import app"),
+    'create_app': _TIMED.format(
+        code="from app import create_app; from config import get_config; create_app(get_config('{env}'))"
+    ),
+    'wsgi': _TIMED.format(code="import wsgi"),
+}
+
+
+def run_stage(code, env):
+    result = subprocess.run(
+        [sys.executable, '-c', code], cwd=project_root, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr else 'failed')
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def run_cli(env):
+    """Wall time of a manage.py command, interpreter start-up included."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, 'manage.py', '--help'], cwd=project_root, env=env, capture_output=True, check=True
+    )
+    return (time.perf_counter() - start) * 1000
+
+
+def slowest_imports(env, config_name, count):
+    """Parse -X importtime output for create_app and return the slowest modules."""
+    code = f"from app import create_app; from config import get_config; create_app(get_config('{config_name}'))"
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code], cwd=project_root, env=env, capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        self_us, cumulative_us, module = (part.strip() for part in line[len('import time:'):].split('|'))
+        if not self_us.isdigit():
+            continue  # Header line
+        rows.append((int(cumulative_us), int(self_us), module))
+    return sorted(rows, reverse=True)[:count]
+
+
+def parse_budgets(values):
+    budgets = {}
+    for value in values or []:
+        stage, _, ms = value.partition('=')
+        budgets[stage] = float(ms)
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark application cold start')
+    parser.add_argument('--env', default='development', help='Config environment')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per stage')
+    parser.add_argument('--budget-ms', action='append', help='stage=ms; exit 1 if the median exceeds it')
+    parser.add_argument('--importtime', type=int, metavar='N', help='Show the N slowest imports of create_app')
+    args = parser.parse_args()
+
+    env = dict(os.environ, FLASK_ENV=args.env)
+    budgets = parse_budgets(args.budget_ms)
+    failures = 0
+
+    print(f"⏱️  Cold start, {args.runs} runs per stage ({args.env})\n")
+    print(f"  {'stage':12} {'median ms':>10} {'min ms':>8} {'max ms':>8}  budget")
+
+    stages = {name: (lambda code=code: run_stage(code.replace('{env}', args.env), env)) for name, code in STAGES.items()}
+    stages['cli'] = lambda: run_cli(env)
+
+    for name, measure in stages.items():
+        try:
+            measure()  # Warm the bytecode cache so runs compare like with like
+            samples = [measure() for _ in range(args.runs)]
+        except Exception as e:
+            print(f"  {name:12} ❌ {e}")
+            failures += 1
+            continue
+
+        median = statistics.median(samples)
+        budget = budgets.get(name)
+        status = ''
+        if budget is not None:
+            status = f"✅ {budget:.0f}" if median <= budget else f"⚠️  {budget:.0f}"
+            failures += median > budget
+        print(f"  {name:12} {median:10.1f} {min(samples):8.1f} {max(samples):8.1f}  {status}")
+
+    if args.importtime:
+        print("\n🐢 Slowest imports during create_app (cumulative ms)")
+        for cumulative_us, self_us, module in slowest_imports(env, args.env, args.importtime):
+            print(f"  {cumulative_us / 1000:8.1f}  {self_us / 1000:8.1f} self  {module}")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
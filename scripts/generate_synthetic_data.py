@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Generator
+
+Bulk-loads production-scale volumes of users, projects, members, sprints,
+tasks and notifications for load testing. Rows are inserted in batches with
+executemany instead of one ORM object (and one password hash) at a time.
+
+All synthetic users use the @synthetic.example email domain, and projects are
+named "Synthetic Project N", so the data can be removed again with --purge.
+
+Run with:
+    python scripts/generate_synthetic_data.py --users 10000 --projects 1000 \\
+        --tasks 1000000 --notifications 5000000
+    python scripts/generate_synthetic_data.py --purge
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from werkzeug.security import generate_password_hash
+
+from manage import get_minimal_app
+from app import db
+from app.models.user import User
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.sprint import Sprint
+from app.models.task import Task
+from app.models.notification import Notification
+from app.models.enums import (
+    UserRole, ProjectStatus, SprintStatus, TaskStatus, TaskPriority, TaskType, NotificationType
+)
+
+EMAIL_DOMAIN = 'synthetic.example'
+PROJECT_PREFIX = 'Synthetic Project'
+
+
+def insert_batches(table, rows, batch_size, label):
+    """Insert rows from a generator in executemany batches, committing each batch."""
+    start = time.perf_counter()
+    batch = []
+    total = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            db.session.execute(table.insert(), batch)
+            db.session.commit()
+            total += len(batch)
+            batch = []
+            rate = total / (time.perf_counter() - start)
+            print(f"   ... {total:,} {label} ({rate:,.0f} rows/s)", end='\r')
+    if batch:
+        db.session.execute(table.insert(), batch)
+        db.session.commit()
+        total += len(batch)
+    print(f"✅ {total:,} {label} in {time.perf_counter() - start:.1f}s" + " " * 20)
+    return total
+
+
+def synthetic_user_ids():
+    return [row[0] for row in db.session.query(User.id).filter(User.email.like(f'%@{EMAIL_DOMAIN}')).order_by(User.id)]
+
+
+def synthetic_project_ids():
+    return [row[0] for row in db.session.query(Project.id).filter(Project.name.like(f'{PROJECT_PREFIX} %')).order_by(Project.id)]
+
+
+def generate(args):
+    rng = random.Random(args.seed)
+    now = datetime.utcnow()
+
+    # ===== USERS =====
+    print(f"👥 Creating {args.users:,} users...")
+    # One hash shared by every synthetic user: hashing is deliberately slow
+    password_hash = generate_password_hash(args.password)
+    roles = [UserRole.DEVELOPER] * 8 + [UserRole.TEAM_LEAD, UserRole.PROJECT_MANAGER]
+    insert_batches(User.__table__, (
+        {
+            'name': f'Synthetic User {i}',
+            'email': f'user{i}@{EMAIL_DOMAIN}',
+            'password_hash': password_hash,
+            'role': rng.choice(roles),
+            'timezone': 'UTC',
+            'daily_work_hours': 8.0,
+            'is_active': True,
+            'created_at': now - timedelta(days=rng.randint(0, 720)),
+            'updated_at': now,
+        }
+        for i in range(args.users)
+    ), args.batch_size, 'users')
+    user_ids = synthetic_user_ids()
+
+    # ===== PROJECTS =====
+    print(f"📁 Creating {args.projects:,} projects...")
+    insert_batches(Project.__table__, (
+        {
+            'name': f'{PROJECT_PREFIX} {i}',
+            'description': f'Synthetic project {i} for load testing',
+            'status': rng.choice([ProjectStatus.ACTIVE] * 3 + [ProjectStatus.PLANNING, ProjectStatus.COMPLETED]),
+            'owner_id': rng.choice(user_ids),
+            'start_date': now - timedelta(days=rng.randint(30, 365)),
+            'created_at': now - timedelta(days=rng.randint(30, 365)),
+            'updated_at': now,
+        }
+        for i in range(args.projects)
+    ), args.batch_size, 'projects')
+    project_ids = synthetic_project_ids()
+
+    # ===== MEMBERS =====
+    members = {project_id: rng.sample(user_ids, min(args.members_per_project, len(user_ids))) for project_id in project_ids}
+    print(f"🤝 Creating {sum(len(m) for m in members.values()):,} project memberships...")
+    insert_batches(ProjectMember.__table__, (
+        {'project_id': project_id, 'user_id': user_id, 'role': 'Developer', 'joined_at': now, 'updated_at': now}
+        for project_id, user_list in members.items()
+        for user_id in user_list
+    ), args.batch_size, 'members')
+
+    # ===== SPRINTS =====
+    print(f"🏃 Creating {args.sprints_per_project * len(project_ids):,} sprints...")
+
+    def sprint_rows():
+        for project_id in project_ids:
+            for n in range(args.sprints_per_project):
+                start = now - timedelta(days=14 * (args.sprints_per_project - n))
+                yield {
+                    'name': f'Sprint {n + 1}',
+                    'project_id': project_id,
+                    'status': SprintStatus.ACTIVE if n == args.sprints_per_project - 1 else SprintStatus.COMPLETED,
+                    'start_date': start,
+                    'end_date': start + timedelta(days=14),
+                    'capacity_hours': 400.0,
+                    'created_at': start,
+                    'updated_at': now,
+                }
+
+    insert_batches(Sprint.__table__, sprint_rows(), args.batch_size, 'sprints')
+    sprints = {}
+    for sprint_id, project_id in db.session.query(Sprint.id, Sprint.project_id).filter(Sprint.project_id.in_(project_ids)):
+        sprints.setdefault(project_id, []).append(sprint_id)
+
+    # ===== TASKS =====
+    print(f"📋 Creating {args.tasks:,} tasks...")
+    statuses = list(TaskStatus)
+    priorities = list(TaskPriority)
+    task_types = list(TaskType)
+
+    def task_rows():
+        for i in range(args.tasks):
+            project_id = rng.choice(project_ids)
+            team = members[project_id]
+            created_at = now - timedelta(days=rng.randint(0, 365), minutes=rng.randint(0, 1440))
+            status = rng.choice(statuses)
+            yield {
+                'title': f'Synthetic task {i}',
+                'description': 'Generated for load testing',
+                'status': status,
+                'priority': rng.choice(priorities),
+                'task_type': rng.choice(task_types),
+                'assigned_to_id': rng.choice(team) if rng.random() < 0.9 else None,
+                'created_by_id': rng.choice(team),
+                'project_id': project_id,
+                'sprint_id': rng.choice(sprints[project_id]) if sprints.get(project_id) and rng.random() < 0.6 else None,
+                'due_date': created_at + timedelta(days=rng.randint(1, 60)),
+                'completion_date': created_at + timedelta(days=rng.randint(1, 30)) if status == TaskStatus.DONE else None,
+                'estimated_hours': float(rng.choice([1, 2, 4, 8, 16])),
+                'actual_hours': 0.0,
+                'subtree_actual_hours': 0.0,
+                'story_points': rng.choice([1, 2, 3, 5, 8]),
+                'created_at': created_at,
+                'updated_at': created_at,
+            }
+
+    insert_batches(Task.__table__, task_rows(), args.batch_size, 'tasks')
+
+    # ===== NOTIFICATIONS =====
+    print(f"🔔 Creating {args.notifications:,} notifications...")
+    task_ids = [row[0] for row in db.session.query(Task.id).filter(Task.project_id.in_(project_ids))]
+    notification_types = list(NotificationType)
+
+    def notification_rows():
+        for i in range(args.notifications):
+            created_at = now - timedelta(days=rng.randint(0, 90), minutes=rng.randint(0, 1440))
+            read = rng.random() < 0.7
+            yield {
+                'user_id': rng.choice(user_ids),
+                'task_id': rng.choice(task_ids) if task_ids else None,
+                'type': rng.choice(notification_types),
+                'title': 'Synthetic notification',
+                'message': f'Synthetic notification {i}',
+                'related_user_id': rng.choice(user_ids),
+                'read': read,
+                'read_at': created_at + timedelta(hours=1) if read else None,
+                'created_at': created_at,
+            }
+
+    insert_batches(Notification.__table__, notification_rows(), args.batch_size, 'notifications')
+
+
+def purge():
+    """Delete everything created by this script."""
+    users = db.session.query(User.id).filter(User.email.like(f'%@{EMAIL_DOMAIN}')).scalar_subquery()
+    projects = db.session.query(Project.id).filter(Project.name.like(f'{PROJECT_PREFIX} %')).scalar_subquery()
+
+    steps = [
+        ('notifications', Notification.__table__.delete().where(Notification.user_id.in_(users))),
+        ('tasks', Task.__table__.delete().where(Task.project_id.in_(projects))),
+        ('sprints', Sprint.__table__.delete().where(Sprint.project_id.in_(projects))),
+        ('members', ProjectMember.__table__.delete().where(ProjectMember.project_id.in_(projects))),
+        ('projects', Project.__table__.delete().where(Project.name.like(f'{PROJECT_PREFIX} %'))),
+        ('users', User.__table__.delete().where(User.email.like(f'%@{EMAIL_DOMAIN}'))),
+    ]
+    for label, statement in steps:
+        result = db.session.execute(statement)
+        db.session.commit()
+        print(f"🧹 Deleted {result.rowcount:,} {label}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-load synthetic data for load testing')
+    parser.add_argument('--env', default='development', help='Config environment')
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--projects', type=int, default=1_000)
+    parser.add_argument('--members-per-project', type=int, default=10)
+    parser.add_argument('--sprints-per-project', type=int, default=4)
+    parser.add_argument('--tasks', type=int, default=1_000_000)
+    parser.add_argument('--notifications', type=int, default=5_000_000)
+    parser.add_argument('--batch-size', type=int, default=10_000, help='Rows per INSERT batch')
+    parser.add_argument('--password', default='benchmark123', help='Password for every synthetic user')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--purge', action='store_true', help='Delete previously generated data and exit')
+    args = parser.parse_args()
+
+    app = get_minimal_app(args.env)
+    with app.app_context():
+        if args.purge:
+            purge()
+            return
+
+        if synthetic_user_ids():
+            print("⚠️  Synthetic data already present, run with --purge first")
+            sys.exit(1)
+
+        start = time.perf_counter()
+        generate(args)
+        print(f"\n🎉 Synthetic data loaded in {time.perf_counter() - start:.1f}s")
+        print(f"🔑 Log in as user0@{EMAIL_DOMAIN} / {args.password}")
+
+
+if __name__ == '__main__':
+    main()
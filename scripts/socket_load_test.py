@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Socket.IO Load Test
+
+Opens many authenticated Socket.IO connections against a running server,
+lets them auto-join their user and project rooms, then updates a task over
+HTTP and measures how long the ``task_updated`` broadcast takes to reach
+every socket. Run it at several room sizes to see how fan-out latency
+grows, and pass --server-pid to report server memory per connection.
+
+All connections log in as one user (default: the synthetic user0, see
+scripts/generate_synthetic_data.py), so every socket joins the same project
+room. Needs the python-socketio client with aiohttp
+(``pip install "python-socketio[asyncio_client]"``).
+
+Run with:
+    python scripts/socket_load_test.py --url http://localhost:5000 --sizes 10,100,500
+    python scripts/socket_load_test.py --sizes 1000 --updates 20 --server-pid $(pgrep -f "gunicorn" | head -1)
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+import urllib.request
+import uuid
+
+import socketio
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from scripts.benchmark_endpoints import login, percentile
+
+
+def server_rss_mb(pid):
+    """Resident memory of the server process (Linux /proc)."""
+    if not pid:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def http_json(url, token, method='GET', body=None):
+    request = urllib.request.Request(
+        url,
+        data=json.dumps(body).encode() if body is not None else None,
+        headers={'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'},
+        method=method
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+class LoadClient:
+    """One socket; records when each update marker first reaches it."""
+
+    def __init__(self, url, token):
+        self.url = url
+        self.token = token
+        self.sio = socketio.AsyncClient(reconnection=False)
+        self.connected = asyncio.Event()
+        self.project_rooms = []
+        self.received = {}  # marker -> perf_counter timestamp
+
+        @self.sio.on('connected')
+        async def on_connected(data):
+            self.project_rooms = data.get('project_rooms', [])
+            self.connected.set()
+
+        @self.sio.on('task_updated')
+        async def on_task_updated(data):
+            marker = data.get('description')
+            if marker and marker not in self.received:
+                self.received[marker] = time.perf_counter()
+
+    async def connect(self, timeout):
+        await self.sio.connect(self.url, auth={'token': self.token}, transports=['websocket'])
+        await asyncio.wait_for(self.connected.wait(), timeout)
+
+    async def close(self):
+        await self.sio.disconnect()
+
+
+async def open_connections(clients, url, token, count, concurrency, timeout):
+    """Grow ``clients`` to ``count`` connections; returns the number that failed."""
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = 0
+
+    async def open_one():
+        nonlocal failures
+        client = LoadClient(url, token)
+        async with semaphore:
+            try:
+                await client.connect(timeout)
+                clients.append(client)
+            except Exception:
+                failures += 1
+
+    await asyncio.gather(*(open_one() for _ in range(count - len(clients))))
+    return failures
+
+
+async def measure_fanout(clients, url, token, task_id, updates, timeout):
+    """PUT ``updates`` task changes; returns delivery latencies (ms) and missed deliveries."""
+    latencies, missed = [], 0
+    for _ in range(updates):
+        marker = f"socket-load-test {uuid.uuid4()}"
+        sent = time.perf_counter()
+        await asyncio.to_thread(http_json, f"{url}/api/tasks/{task_id}", token, 'PUT', {'description': marker})
+
+        deadline = sent + timeout
+        while time.perf_counter() < deadline and not all(marker in c.received for c in clients):
+            await asyncio.sleep(0.005)
+
+        for client in clients:
+            if marker in client.received:
+                latencies.append((client.received.pop(marker) - sent) * 1000)
+            else:
+                missed += 1
+    return latencies, missed
+
+
+async def run(args):
+    token = args.token or login(args.url, args.email, args.password)
+
+    base_rss = server_rss_mb(args.server_pid)
+    clients = []
+    sizes = sorted(int(size) for size in args.sizes.split(','))
+
+    print(f"🔌 Socket.IO load test against {args.url}, {args.updates} updates per size\n")
+    print(f"  {'sockets':>8} {'failed':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'missed':>7} {'KB/conn':>8}")
+
+    try:
+        task_id = args.task_id
+        for size in sizes:
+            started = time.perf_counter()
+            failed = await open_connections(clients, args.url, token, size, args.concurrency, args.timeout)
+            connect_s = time.perf_counter() - started
+            if not clients:
+                sys.exit("❌ No connection succeeded")
+
+            if task_id is None:
+                project_id = args.project_id or int(clients[0].project_rooms[0].split('_')[1])
+                page = await asyncio.to_thread(http_json, f"{args.url}/api/tasks?project_id={project_id}&per_page=1", token)
+                if not page['data']['data']:
+                    sys.exit(f"❌ Project {project_id} has no tasks; pass --task-id")
+                task_id = page['data']['data'][0]['id']
+                print(f"  (updating task {task_id} in project {project_id})")
+
+            await asyncio.sleep(args.settle)
+            rss = server_rss_mb(args.server_pid)
+            per_conn = f"{(rss - base_rss) * 1024 / len(clients):8.1f}" if rss and base_rss else f"{'-':>8}"
+
+            latencies, missed = await measure_fanout(clients, args.url, token, task_id, args.updates, args.timeout)
+            if latencies:
+                print(f"  {len(clients):8} {failed:7} {percentile(latencies, 50):8.1f} {percentile(latencies, 95):8.1f} "
+                      f"{percentile(latencies, 99):8.1f} {max(latencies):8.1f} {missed:7} {per_conn}")
+            else:
+                print(f"  {len(clients):8} {failed:7} {'no deliveries':>35} {missed:7} {per_conn}")
+            print(f"           connected in {connect_s:.1f}s"
+                  + (f", mean {statistics.fmean(latencies):.1f} ms" if latencies else ""))
+    finally:
+        await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test Socket.IO connections and broadcast fan-out')
+    parser.add_argument('--url', default='http://localhost:5000', help='Base URL of a running server')
+    parser.add_argument('--email', default='user0@synthetic.example')
+    parser.add_argument('--password', default='benchmark123')
+    parser.add_argument('--token', help='Bearer token to use instead of logging in')
+    parser.add_argument('--sizes', default='10,100', help='Comma-separated connection counts to measure at')
+    parser.add_argument('--updates', type=int, default=10, help='Task updates per size')
+    parser.add_argument('--project-id', type=int, help='Project whose room to measure (default: the user\'s first)')
+    parser.add_argument('--task-id', type=int, help='Task to update (default: first task in the project)')
+    parser.add_argument('--concurrency', type=int, default=50, help='Connections opened in parallel')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Seconds to wait for a connect or delivery')
+    parser.add_argument('--settle', type=float, default=1.0, help='Seconds to wait after connecting before measuring')
+    parser.add_argument('--server-pid', type=int, help='Server process id, for memory per connection (Linux)')
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Connection Pool Saturation Test
+
+Starts more concurrent workers than the pool can serve, each holding a
+connection for a while, and reports how checkouts behave at saturation:
+wait percentiles, timeouts and throughput. Uses the same engine options as
+the app (build_engine_options), with command-line overrides.
+
+Run with:
+    python scripts/stress_db_pool.py --threads 50 --pool-size 5 --max-overflow 5 --pool-timeout 2
+    python scripts/stress_db_pool.py --threads 50 --pgbouncer
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.utils.database import build_engine_options
+from config import get_config
+
+
+def hold_statement(engine, seconds):
+    if engine.dialect.name == 'postgresql':
+        return text(f"SELECT pg_sleep({seconds})"), 0
+    # No server-side sleep elsewhere: hold the connection client-side instead
+    return text("SELECT 1"), seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stress the SQLAlchemy connection pool')
+    parser.add_argument('--env', default='development', help='Config environment')
+    parser.add_argument('--url', help='Database URL (defaults to the config one)')
+    parser.add_argument('--threads', type=int, default=50, help='Concurrent workers')
+    parser.add_argument('--iterations', type=int, default=5, help='Checkouts per worker')
+    parser.add_argument('--hold', type=float, default=0.2, help='Seconds each checkout holds its connection')
+    parser.add_argument('--pool-size', type=int)
+    parser.add_argument('--max-overflow', type=int)
+    parser.add_argument('--pool-timeout', type=int)
+    parser.add_argument('--pgbouncer', action='store_true', help='NullPool / PgBouncer mode')
+    args = parser.parse_args()
+
+    config_class = get_config(args.env)
+    config = {name: getattr(config_class, name) for name in dir(config_class) if name.isupper()}
+    if args.url:
+        config['SQLALCHEMY_DATABASE_URI'] = args.url
+    overrides = {'DB_POOL_SIZE': args.pool_size, 'DB_MAX_OVERFLOW': args.max_overflow, 'DB_POOL_TIMEOUT': args.pool_timeout}
+    config.update({key: value for key, value in overrides.items() if value is not None})
+    if args.pgbouncer:
+        config['DB_PGBOUNCER'] = True
+
+    options = build_engine_options(config)
+    engine = create_engine(config['SQLALCHEMY_DATABASE_URI'], **options)
+    statement, client_hold = hold_statement(engine, args.hold)
+
+    waits, lock = [], threading.Lock()
+    counts = {'ok': 0, 'timeouts': 0, 'errors': 0}
+
+    def worker():
+        for _ in range(args.iterations):
+            start = time.perf_counter()
+            try:
+                with engine.connect() as conn:
+                    waited = time.perf_counter() - start
+                    conn.execute(statement)
+                    time.sleep(client_hold)
+                with lock:
+                    waits.append(waited * 1000)
+                    counts['ok'] += 1
+            except PoolTimeoutError:
+                with lock:
+                    counts['timeouts'] += 1
+            except Exception as e:
+                with lock:
+                    counts['errors'] += 1
+                print(f"❌ {type(e).__name__}: {e}")
+
+    print(f"🔧 Pool: {type(engine.pool).__name__} {engine.pool.status()}")
+    print(f"🧵 {args.threads} threads x {args.iterations} checkouts, holding {args.hold}s each\n")
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(args.threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    print(f"✅ Completed: {counts['ok']}  ⏱️  Timeouts: {counts['timeouts']}  ❌ Errors: {counts['errors']}")
+    print(f"🚀 Throughput: {counts['ok'] / elapsed:.1f} checkouts/s over {elapsed:.1f}s")
+    if len(waits) >= 2:
+        cuts = statistics.quantiles(waits, n=100, method='inclusive')
+        print(f"⌛ Checkout wait ms: p50 {cuts[49]:.1f}  p95 {cuts[94]:.1f}  p99 {cuts[98]:.1f}  max {max(waits):.1f}")
+    print(f"🔧 Pool after run: {engine.pool.status()}")
+    engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
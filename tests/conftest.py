@@ -0,0 +1,56 @@
+"""
+Shared fixtures: an app on in-memory SQLite with a local cache, no Socket.IO
+"""
+import pytest
+from flask_jwt_extended import create_access_token
+
+from config.base import BaseConfig
+
+
+class TestConfig(BaseConfig):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_ENGINE_OPTIONS = {}
+    SOCKETIO_ENABLED = False
+    METRICS_ENABLED = False
+    QUERY_PROFILER_ENABLED = False
+    PASSWORD_HASH_WORKERS = 0
+    LOG_TO_STDOUT = False
+
+
+@pytest.fixture
+def app():
+    from app import create_app, db
+    from app.utils.cache_utils import cache
+
+    app = create_app(TestConfig)
+    # create_app points the cache at the Redis service; keep tests self-contained
+    cache.init_app(app, config={'CACHE_TYPE': 'SimpleCache'})
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    from app import db
+    from app.models.enums import UserRole
+    from app.models.user import User
+
+    def make(email='owner@example.com'):
+        user = User(name=email.split('@')[0], email=email, password_hash='unused', role=UserRole.DEVELOPER)
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make
+
+
+def auth_headers(user):
+    return {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
@@ -0,0 +1,59 @@
+"""
+ETags on polled reads, and the server-side caches behind them
+"""
+from app import db
+from app.models.project import Project
+from app.models.task import Task
+from tests.conftest import auth_headers
+
+
+def test_project_etag_and_body_change_together(client, make_user):
+    owner = make_user()
+    project = Project(name='Polled', owner_id=owner.id)
+    db.session.add(project)
+    db.session.commit()
+    project_id, owner_id = project.id, owner.id
+    headers = auth_headers(owner)
+
+    first = client.get(f'/api/projects/{project_id}', headers=headers)
+    assert first.status_code == 200
+    assert first.get_json()['data']['tasks_count'] == 0
+    assert client.get(f'/api/projects/{project_id}', headers={**headers, 'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    # A task changes the project's version but not the project row
+    db.session.add(Task(title='new', created_by_id=owner_id, project_id=project_id))
+    db.session.commit()
+
+    second = client.get(f'/api/projects/{project_id}', headers={**headers, 'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
+    assert second.get_json()['data']['tasks_count'] == 1
+
+
+def test_task_version_etag_round_trips_through_if_match(client, make_user):
+    owner = make_user()
+    project = Project(name='Edited', owner_id=owner.id)
+    db.session.add(project)
+    db.session.flush()
+    task = Task(title='draft', created_by_id=owner.id, project_id=project.id)
+    db.session.add(task)
+    db.session.commit()
+    task_id = task.id
+    headers = auth_headers(owner)
+
+    read = client.get(f'/api/tasks/{task_id}', headers=headers)
+    assert read.headers['ETag'] == f'"{read.get_json()["data"]["version"]}"'
+    sparse = client.get(f'/api/tasks/{task_id}?fields=title', headers=headers)
+    assert sparse.headers['ETag'] == read.headers['ETag']
+
+    updated = client.put(f'/api/tasks/{task_id}', json={'title': 'final'},
+                         headers={**headers, 'If-Match': read.headers['ETag']})
+    assert updated.status_code == 200
+    assert updated.headers['ETag'] == f'"{updated.get_json()["data"]["version"]}"' != read.headers['ETag']
+
+    # The version read before the update is stale; the compressed form of the current one is not
+    stale = client.put(f'/api/tasks/{task_id}', json={'title': 'lost'}, headers={**headers, 'If-Match': read.headers['ETag']})
+    assert stale.status_code == 409
+    current = updated.headers['ETag'].strip('"')
+    again = client.put(f'/api/tasks/{task_id}', json={'title': 'kept'}, headers={**headers, 'If-Match': f'"{current}-gzip"'})
+    assert again.status_code == 200
@@ -0,0 +1,53 @@
+"""
+/api/dashboard: one payload from parallel sections, cached until a tag changes
+"""
+from datetime import datetime, timedelta
+
+from app import db
+from app.models.enums import TaskStatus
+from app.models.project import Project
+from app.models.task import Task
+from app.utils.database import release_connection
+from tests.conftest import auth_headers
+
+
+def test_dashboard_sections_and_invalidation(client, make_user):
+    owner = make_user()
+    project = Project(name='Dash', owner_id=owner.id)
+    db.session.add(project)
+    db.session.flush()
+    db.session.add(Task(title='late', status=TaskStatus.TODO, project_id=project.id, created_by_id=owner.id,
+                        assigned_to_id=owner.id, due_date=datetime.utcnow() - timedelta(days=1)))
+    db.session.commit()
+    headers = auth_headers(owner)
+
+    data = client.get('/api/dashboard', headers=headers).get_json()['data']
+    assert data['overdue']['count'] == 1
+    assert data['my_tasks']['status_counts'] == {'TODO': 1}
+    assert [p['name'] for p in data['recent_projects']] == ['Dash']
+    assert data['permissions'][str(project.id)]['role'] == 'owner'
+
+    # Served from cache until a commit touches the user's tasks
+    assert client.get('/api/dashboard', headers=headers).get_json()['data']['generated_at'] == data['generated_at']
+    db.session.add(Task(title='new', status=TaskStatus.IN_PROGRESS, project_id=project.id,
+                        created_by_id=owner.id, assigned_to_id=owner.id))
+    db.session.commit()
+    fresh = client.get('/api/dashboard', headers=headers).get_json()['data']
+    assert fresh['my_tasks']['status_counts'] == {'TODO': 1, 'IN_PROGRESS': 1}
+
+
+def test_release_connection_leaves_the_session_usable(app, make_user):
+    owner = make_user()
+    assert owner.name == 'owner'  # loads in a new transaction
+
+    assert release_connection()
+    assert owner in db.session
+    assert owner.name == 'owner'
+
+    # Uncommitted work keeps its transaction, pending or flushed
+    db.session.add(Project(name='Pending', owner_id=owner.id))
+    assert not release_connection()
+    db.session.flush()
+    assert not release_connection()
+    db.session.commit()
+    assert db.session.query(Project).filter_by(name='Pending').count() == 1
@@ -0,0 +1,31 @@
+"""
+Enum metadata: static payloads behind a token check without a user lookup
+"""
+from flask_jwt_extended import create_access_token, create_refresh_token
+
+from tests.conftest import auth_headers
+
+
+def test_enums_require_an_access_token(client):
+    assert client.get('/api/enums').status_code == 401
+    assert client.get('/api/enums/task-statuses', headers={'Authorization': 'Bearer not-a-token'}).status_code == 422
+    refresh = create_refresh_token(identity='1')
+    assert client.get('/api/enums', headers={'Authorization': f'Bearer {refresh}'}).status_code == 422
+
+
+def test_enums_skip_the_user_lookup(client):
+    # No such user: the token is checked, the user is never loaded
+    headers = {'Authorization': f"Bearer {create_access_token(identity='999')}"}
+
+    response = client.get('/api/enums/task-statuses', headers=headers)
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+
+    revalidated = client.get('/api/enums/task-statuses', headers={**headers, 'If-None-Match': response.headers['ETag']})
+    assert revalidated.status_code == 304
+
+
+def test_enums_accept_a_real_user(client, make_user):
+    response = client.get('/api/enums', headers=auth_headers(make_user()))
+    assert response.status_code == 200
+    assert 'task_statuses' in response.get_json()['data']
@@ -0,0 +1,39 @@
+"""
+Hour rollups: the recompute_rollups maintenance command
+"""
+from click.testing import CliRunner
+
+import manage
+from app import db
+from app.models.project import Project
+from app.models.task import Task
+
+
+def test_recompute_rollups_command_rebuilds_totals(app, make_user, monkeypatch):
+    owner = make_user()
+    project = Project(name='Rollups', owner_id=owner.id)
+    db.session.add(project)
+    db.session.commit()
+    root = Task(title='root', actual_hours=1, created_by_id=owner.id, project_id=project.id)
+    db.session.add(root)
+    db.session.commit()
+    child = Task(title='child', actual_hours=2, parent_task_id=root.id, created_by_id=owner.id, project_id=project.id)
+    db.session.add(child)
+    db.session.commit()
+    grandchild = Task(title='grandchild', actual_hours=4, parent_task_id=child.id, created_by_id=owner.id)
+    db.session.add(grandchild)
+    db.session.commit()
+    ids = {'root': root.id, 'child': child.id, 'grandchild': grandchild.id}
+    versions = {task.id: task.version for task in (root, child, grandchild)}
+
+    # Run the command against the test database
+    monkeypatch.setattr(manage, 'get_minimal_app', lambda env='development', load_models=True: app)
+    result = CliRunner().invoke(manage.cli, ['recompute-rollups'])
+
+    assert 'Recomputed hour rollups for 3 tasks' in result.output, result.output
+    db.session.expire_all()
+    totals = dict(db.session.query(Task.id, Task.subtree_actual_hours).all())
+    assert totals == {ids['root']: 7, ids['child']: 6, ids['grandchild']: 4}
+    assert db.session.get(Project, project.id).actual_hours == 3
+    # A repair is not an edit: clients holding a version can still write
+    assert dict(db.session.query(Task.id, Task.version).all()) == versions
@@ -0,0 +1,37 @@
+"""
+/metrics: access control and pool instrumentation
+"""
+import pytest
+
+from app import create_app, db
+from app.utils.cache_utils import cache
+from tests.conftest import TestConfig
+
+
+@pytest.fixture
+def metrics_app():
+    class MetricsConfig(TestConfig):
+        METRICS_ENABLED = True
+        METRICS_TOKEN = 'scrape-secret'
+
+    app = create_app(MetricsConfig)
+    cache.init_app(app, config={'CACHE_TYPE': 'SimpleCache'})
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_metrics_are_limited_to_allowed_networks_or_the_token(metrics_app):
+    client = metrics_app.test_client()
+    outside = {'REMOTE_ADDR': '203.0.113.7'}
+
+    assert client.get('/metrics', environ_base=outside).status_code == 403
+    assert client.get('/metrics', environ_base=outside, headers={'Authorization': 'Bearer wrong'}).status_code == 403
+    assert client.get('/metrics', environ_base=outside, headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+
+    local = client.get('/metrics')  # the test client connects from 127.0.0.1
+    assert local.status_code == 200
+    assert b'db_pool_checkout_duration_seconds' in local.data
+    assert b'db_pool_connections_in_use' in local.data
@@ -0,0 +1,80 @@
+"""
+Overdue listings and the overdue/escalation scanner
+"""
+from datetime import datetime, timedelta
+
+from app import db
+from app.models.enums import TaskPriority, TaskStatus
+from app.models.notification import Notification
+from app.models.task import Task
+from app.services.analytics_service import AnalyticsService
+from app.services.overdue_service import OverdueService
+from tests.conftest import auth_headers
+
+
+def make_task(owner, days_overdue, priority=TaskPriority.MEDIUM, status=TaskStatus.TODO):
+    task = Task(title=f'{days_overdue} days late', status=status, priority=priority,
+                due_date=datetime.utcnow() - timedelta(days=days_overdue),
+                created_by_id=owner.id, assigned_to_id=owner.id)
+    db.session.add(task)
+    db.session.commit()
+    return task
+
+
+def test_overdue_listings_do_not_wait_for_the_scanner(client, make_user):
+    owner = make_user()
+    long_late = make_task(owner, 10)
+    recent = make_task(owner, 2)
+    make_task(owner, 5, status=TaskStatus.DONE)
+    make_task(owner, -1)
+
+    response = client.get('/api/tasks?overdue=true', headers=auth_headers(owner))
+
+    assert response.status_code == 200
+    assert {task['id'] for task in response.get_json()['data']['data']} == {long_late.id, recent.id}
+    assert {task['id'] for task in AnalyticsService.get_overdue_tasks()['data']} == {long_late.id, recent.id}
+
+
+def test_scan_notifies_once_per_due_date(app, make_user):
+    owner = make_user()
+    task = make_task(owner, 10, priority=TaskPriority.CRITICAL)
+
+    first = OverdueService.scan()
+    assert (first['flagged'], first['escalated'], first['notifications']) == (1, 1, 2)
+
+    second = OverdueService.scan()
+    assert (second['flagged'], second['escalated'], second['notifications']) == (0, 0, 0)
+
+    # A new due date re-arms the task
+    task.due_date = datetime.utcnow() - timedelta(hours=1)
+    db.session.commit()
+    third = OverdueService.scan()
+    assert (third['flagged'], third['escalated']) == (1, 0)
+    assert Notification.query.filter_by(task_id=task.id).count() == 3
+
+
+def test_scan_clears_completed_tasks(app, make_user):
+    owner = make_user()
+    task = make_task(owner, 3)
+    OverdueService.scan()
+
+    task.status = TaskStatus.DONE
+    db.session.commit()
+    result = OverdueService.scan()
+
+    assert result['cleared'] == 1
+    assert db.session.get(Task, task.id).overdue_since is None
+
+
+def test_overdue_analytics_are_paginated_and_compact(app, make_user):
+    owner = make_user()
+    ids = [make_task(owner, days).id for days in (5, 4, 3)]
+    db.session.expunge_all()
+
+    first = AnalyticsService.get_overdue_tasks(page=1, per_page=2)
+    second = AnalyticsService.get_overdue_tasks(page=2, per_page=2)
+
+    assert [task['id'] for task in first['data'] + second['data']] == ids
+    assert (first['total'], first['total_pages'], first['has_next'], second['has_next']) == (3, 2, True, False)
+    assert set(first['data'][0]) == {'id', 'title', 'status', 'priority', 'due_date', 'project_id', 'assigned_to', 'version'}
+    assert first['data'][0]['assigned_to']['name'] == 'owner'
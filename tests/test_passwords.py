@@ -0,0 +1,33 @@
+"""
+Password hashing: rehash detection and the hashing pool
+"""
+import time
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app.utils.passwords import PasswordHashBusy, _run, needs_rehash, shutdown_pool
+
+
+def test_short_method_names_match_their_expanded_hashes(app):
+    for method in ('scrypt', 'scrypt:32768:8:1', 'pbkdf2:sha256', 'pbkdf2:sha256:1000'):
+        app.config['PASSWORD_HASH_METHOD'] = method
+        assert not needs_rehash(generate_password_hash('secret', method)), method
+
+    app.config['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256'
+    assert needs_rehash(generate_password_hash('secret', 'pbkdf2:sha256:1000'))
+    assert needs_rehash(generate_password_hash('secret', 'scrypt'))
+
+
+def test_a_hung_hashing_worker_is_rejected_not_waited_on(app):
+    app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_TIMEOUT=30)
+    try:
+        # Start the pool first, so the timeout covers the job, not process start
+        assert _run(abs, -1) == 1
+        app.config['PASSWORD_HASH_TIMEOUT'] = 1
+        started = time.monotonic()
+        with pytest.raises(PasswordHashBusy):
+            _run(time.sleep, 3)
+        assert time.monotonic() - started < 2
+    finally:
+        shutdown_pool()
@@ -0,0 +1,74 @@
+"""
+/api/projects/<id>/board: columns, per-column paging and cursors
+"""
+from app import db
+from app.models.enums import TaskPriority, TaskStatus
+from app.models.project import Project
+from app.models.task import Task
+from tests.conftest import auth_headers
+
+
+def make_board(owner):
+    project = Project(name='Board', owner_id=owner.id)
+    db.session.add(project)
+    db.session.flush()
+    priorities = [TaskPriority.LOW, TaskPriority.CRITICAL, TaskPriority.MEDIUM, TaskPriority.HIGH, TaskPriority.CRITICAL]
+    for i, priority in enumerate(priorities):
+        db.session.add(Task(title=f'todo {i}', status=TaskStatus.TODO, priority=priority,
+                            project_id=project.id, created_by_id=owner.id))
+    db.session.add(Task(title='done', status=TaskStatus.DONE, priority=TaskPriority.LOW,
+                        project_id=project.id, created_by_id=owner.id))
+    db.session.commit()
+    return project
+
+
+def column(payload, status):
+    return next(c for c in payload['data']['columns'] if c['status'] == status)
+
+
+def test_board_lists_every_column(client, make_user):
+    owner = make_user()
+    project = make_board(owner)
+
+    response = client.get(f'/api/projects/{project.id}/board?limit=2', headers=auth_headers(owner))
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert [c['status'] for c in payload['data']['columns']] == [s.value for s in TaskStatus]
+    todo = column(payload, 'TODO')
+    assert todo['total'] == 5
+    assert [t['priority'] for t in todo['tasks']] == ['CRITICAL', 'CRITICAL']
+    assert todo['has_more'] and todo['next_cursor']
+    assert column(payload, 'DONE')['total'] == 1
+    assert column(payload, 'BLOCKED') == {'status': 'BLOCKED', 'total': 0, 'tasks': [], 'has_more': False, 'next_cursor': None}
+
+
+def test_board_pages_a_column_with_cursor(client, make_user):
+    owner = make_user()
+    project = make_board(owner)
+    headers = auth_headers(owner)
+
+    first = client.get(f'/api/projects/{project.id}/board?status=todo&limit=2', headers=headers).get_json()
+    assert [c['status'] for c in first['data']['columns']] == ['TODO']
+
+    seen = [t['id'] for t in column(first, 'TODO')['tasks']]
+    cursor = column(first, 'TODO')['next_cursor']
+    while cursor:
+        page = client.get(f'/api/projects/{project.id}/board?status=todo&limit=2&cursor={cursor}', headers=headers)
+        assert page.status_code == 200
+        todo = column(page.get_json(), 'TODO')
+        seen += [t['id'] for t in todo['tasks']]
+        cursor = todo['next_cursor']
+
+    priorities = [db.session.get(Task, task_id).priority.value for task_id in seen]
+    assert len(seen) == len(set(seen)) == 5
+    assert priorities == ['CRITICAL', 'CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
+
+
+def test_board_rejects_cursor_without_status(client, make_user):
+    owner = make_user()
+    project = make_board(owner)
+
+    response = client.get(f'/api/projects/{project.id}/board?cursor=abc', headers=auth_headers(owner))
+
+    assert response.status_code == 400
@@ -0,0 +1,81 @@
+"""
+Incremental sync: change log tokens and late-committing writers
+"""
+import pytest
+
+from app import create_app, db
+from app.models.change_log import ChangeLog
+from app.models.enums import UserRole
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+from app.services.sync_service import SyncService
+from app.utils.cache_utils import cache
+from tests.conftest import TestConfig, auth_headers
+
+
+def test_committed_changes_are_synced_at_once(client, make_user):
+    owner = make_user()
+    project = Project(name='Synced', owner_id=owner.id)
+    db.session.add(project)
+    db.session.commit()
+    headers = auth_headers(owner)
+    token = client.get('/api/sync', headers=headers).get_json()['data']['next_token']
+
+    task = Task(title='fresh', created_by_id=owner.id, project_id=project.id)
+    db.session.add(task)
+    db.session.flush()
+    # Rows get their ids when the transaction commits, not when it flushes
+    assert db.session.query(ChangeLog).filter(ChangeLog.entity_type == 'task').count() == 0
+    db.session.commit()
+    task_id = task.id
+
+    data = client.get(f'/api/sync?since={token}', headers=headers).get_json()['data']
+    assert [synced['id'] for synced in data['changes']['tasks']] == [task_id]
+    assert data['next_token'] > token
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    # A file database, so the writer and the reader use separate connections
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'sync.db'}"
+
+    app = create_app(FileConfig)
+    cache.init_app(app, config={'CACHE_TYPE': 'SimpleCache'})
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_a_late_committing_writer_is_not_skipped(file_app):
+    owner = User(name='owner', email='owner@example.com', password_hash='unused', role=UserRole.DEVELOPER)
+    db.session.add(owner)
+    db.session.commit()
+    project = Project(name='Synced', owner_id=owner.id)
+    db.session.add(project)
+    db.session.commit()
+    owner_id, project_id = owner.id, project.id
+
+    # The writer flushes, then keeps its transaction open
+    late = Task(title='late', created_by_id=owner_id, project_id=project_id)
+    db.session.add(late)
+    db.session.flush()
+
+    # Meanwhile a reader takes a token
+    with file_app.app_context():
+        result, status = SyncService.get_changes(owner_id)
+        assert status == 200
+        token = result['next_token']
+        db.session.remove()
+
+    db.session.commit()
+    late_id = late.id
+
+    with file_app.app_context():
+        result, status = SyncService.get_changes(owner_id, since=token)
+        assert status == 200
+        assert late_id in [task['id'] for task in result['changes'].get('tasks', [])]
+        db.session.remove()
@@ -0,0 +1,49 @@
+"""
+Task hierarchies: recursive CTE loads with per-caller eager loading
+"""
+from sqlalchemy import inspect
+
+from app import db
+from app.models.task import TASK_DICT_RELATIONSHIPS, Task
+from tests.conftest import auth_headers
+
+
+def make_chain(owner, length):
+    parent_id, ids = None, []
+    for level in range(length):
+        task = Task(title=f'level {level}', created_by_id=owner.id, assigned_to_id=owner.id, parent_task_id=parent_id)
+        db.session.add(task)
+        db.session.commit()
+        parent_id = task.id
+        ids.append(task.id)
+    return ids
+
+
+def test_tree_rows_load_only_the_assignee(app, make_user):
+    ids = make_chain(make_user(), 3)
+    db.session.expunge_all()
+
+    rows = Task.get_subtree(ids[0])
+    assert [(task.id, depth) for task, depth in rows] == [(ids[0], 0), (ids[1], 1), (ids[2], 2)]
+    for task, depth in rows:
+        unloaded = inspect(task).unloaded
+        assert 'assignee' not in unloaded
+        assert {'comments', 'attachments', 'time_logs', 'creator'} <= unloaded
+
+    db.session.expunge_all()
+    for task, depth in Task.get_subtree(ids[0], load=TASK_DICT_RELATIONSHIPS):
+        assert not set(TASK_DICT_RELATIONSHIPS) & inspect(task).unloaded
+
+
+def test_hierarchy_endpoint(client, make_user):
+    owner = make_user()
+    ids = make_chain(owner, 3)
+
+    response = client.get(f'/api/tasks/{ids[1]}/hierarchy', headers=auth_headers(owner))
+
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert [ancestor['id'] for ancestor in data['ancestors']] == [ids[0]]
+    assert data['tree']['id'] == ids[1]
+    assert [child['id'] for child in data['tree']['subtasks']] == [ids[2]]
+    assert data['tree']['assigned_to']['name'] == 'owner'
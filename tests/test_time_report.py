@@ -0,0 +1,33 @@
+"""
+/api/tasks/time/report: hours aggregated in SQL
+"""
+from datetime import date
+
+from app import db
+from app.models.project import Project
+from app.models.task import Task
+from app.models.time_log import TimeLog
+from tests.conftest import auth_headers
+
+
+def test_week_report_groups_by_iso_week(client, make_user):
+    owner = make_user()
+    project = Project(name='Timesheet', owner_id=owner.id)
+    db.session.add(project)
+    db.session.flush()
+    task = Task(title='logged', created_by_id=owner.id, project_id=project.id)
+    db.session.add(task)
+    db.session.flush()
+    # Monday to Sunday of one week, then the next Monday
+    for work_date, hours in ((date(2026, 10, 12), 2), (date(2026, 10, 18), 3), (date(2026, 10, 19), 1.5)):
+        db.session.add(TimeLog(task_id=task.id, user_id=owner.id, hours=hours, work_date=work_date))
+    db.session.commit()
+
+    response = client.get('/api/tasks/time/report?group_by=week', headers=auth_headers(owner))
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    assert data['total_hours'] == 6.5
+    assert [(group['key'], group['total_hours'], group['entries']) for group in data['groups']] == [
+        ('2026-10-19', 1.5, 1),
+        ('2026-10-12', 5, 2)
+    ]
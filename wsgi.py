@@ -24,14 +24,22 @@ from config import get_config
 config_class = get_config(env)
 app = create_app(config_class)
 
-# Verify setup
-with app.app_context():
-    try:
+# Optional DB check at import (STARTUP_DB_CHECK). Off by default: it delays
+# every cold start, and under gunicorn --preload the connection it opens would
+# be inherited by every forked worker.
+if app.config.get('STARTUP_DB_CHECK'):
+    with app.app_context():
+        from app import db
         from app.utils.database import test_connection
-        test_connection()
-        print(f"✅ WSGI: Application ready in {env} mode")
-    except Exception as e:
-        print(f"❌ WSGI: Setup error: {e}")
+        if test_connection():
+            app.logger.info(f"✅ WSGI: Database reachable in {env} mode")
+        else:
+            app.logger.error(f"❌ WSGI: Database check failed in {env} mode")
+        # Don't hand pooled connections to forked workers
+        for engine in db.engines.values():
+            engine.dispose()
+
+app.logger.info(f"✅ WSGI: Application ready in {env} mode")
 
 if __name__ == "__main__":
     # For testing WSGI directly